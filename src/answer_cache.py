@@ -0,0 +1,121 @@
+"""Shared answer cache for the Interact chat.
+
+Analysts often open a conversation with nearly the same question. The
+first answer to each question is stored in ``ANSWER_CACHE_PATH`` (JSONL,
+shared by every session and server process) together with the version
+of the context it was answered from. A later opening question is served
+from the cache when:
+
+- the context version (``version`` of the context bundle, see
+  src/context_bundle.py) is the same: new reports or reasoning change
+  it, which invalidates every older answer, and
+- its terms (accent-folded, stop-worded, stemmed; see src/compress.py)
+  have TF-IDF cosine similarity of at least ``ANSWER_CACHE_THRESHOLD``
+  with a cached question.
+
+Follow-up questions depend on the conversation, so they are never
+looked up or stored.
+
+Usage::
+
+    from src import answer_cache, context_bundle
+    version = context_bundle.load()["version"]
+    hit = answer_cache.lookup(question, version)
+    answer_cache.store(question, answer, version)
+"""
+
+import json, math, os
+from collections import Counter
+from datetime import datetime, timezone
+
+from src import storage
+from src.compress import STEM, STOPWORDS
+from src.config import ANSWER_CACHE_PATH, ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_MAX_ENTRIES
+from src.relevance import TOKEN_RE, fold
+
+# Words that say "this is a question" rather than what it is about
+QUESTION_WORDS = set("""
+what how why when where which whats hows does do did can could should would tell me explain give
+describe any there now currently regarding concerning que como porque cuando donde cual
+""".split())
+MIN_TERMS = 2   # shorter questions are too ambiguous to match
+
+
+def normalize(question):
+    """Distinct topical terms of ``question``."""
+    return {w[:STEM] for w in TOKEN_RE.findall(fold(question))
+            if w not in STOPWORDS and w not in QUESTION_WORDS and len(w) > 1}
+
+
+# -----------------------------------------------------
+# 1️⃣ STORE (re-read only when the file changes)
+# -----------------------------------------------------
+_cache = {}
+
+def entries(path=ANSWER_CACHE_PATH):
+    if not os.path.exists(path):
+        return []
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if _cache.get("key") != key:
+        loaded = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    loaded.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        _cache.update(key=key, entries=loaded)
+    return _cache["entries"]
+
+
+def store(question, answer, version, task="chat", path=ANSWER_CACHE_PATH):
+    """Cache ``answer``; answers for other context versions are dropped on the way."""
+    terms = normalize(question)
+    if len(terms) < MIN_TERMS or not (answer or "").strip():
+        return None
+    entry = {"ts": datetime.now(timezone.utc).isoformat(timespec="seconds"), "version": version, "task": task,
+             "question": question, "terms": sorted(terms), "answer": answer}
+    # Appends and rewrites take the same lock and decide on a fresh read,
+    # so an append never lands in a file that a rewrite is replacing.
+    with storage.file_lock(path):
+        existing = entries(path)
+        if len(existing) < ANSWER_CACHE_MAX_ENTRIES and all(e.get("version") == version for e in existing):
+            storage.append_jsonl(path, [entry])
+            return entry
+        keep = [e for e in existing if e.get("version") == version][-(ANSWER_CACHE_MAX_ENTRIES - 1):]
+        storage.atomic_write_text(path, "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in keep + [entry]))
+    return entry
+
+
+# -----------------------------------------------------
+# 2️⃣ LOOKUP
+# -----------------------------------------------------
+def lookup(question, version, task="chat", path=ANSWER_CACHE_PATH, threshold=ANSWER_CACHE_THRESHOLD):
+    """The most similar cached answer for this context version (with its ``score``), or ``None``."""
+    terms = normalize(question)
+    if len(terms) < MIN_TERMS:
+        return None
+    candidates = [e for e in entries(path) if e.get("version") == version and e.get("task") == task]
+    if not candidates:
+        return None
+
+    # Binary TF-IDF over the cached questions: terms every question
+    # shares ("venezuela") weigh less than the ones that tell them apart.
+    n = len(candidates)
+    df = Counter(t for e in candidates for t in e["terms"])
+    idf = lambda t: math.log((1 + n) / (1 + df[t])) + 1
+
+    def cosine(a, b):
+        dot = sum(idf(t) ** 2 for t in a & b)
+        norm = math.sqrt(sum(idf(t) ** 2 for t in a) * sum(idf(t) ** 2 for t in b))
+        return dot / norm if norm else 0.0
+
+    best, best_score = None, 0.0
+    for e in reversed(candidates):   # newest wins ties
+        score = cosine(terms, set(e["terms"]))
+        if score > best_score:
+            best, best_score = e, score
+    if best is None or best_score < threshold:
+        return None
+    return {**best, "score": round(best_score, 3)}
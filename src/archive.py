@@ -0,0 +1,271 @@
+"""Compacted raw-article archive with retention tiers.
+
+The pipelines write one file per fetch under ``data/raw``
+(``news_<date>.json``, ``news_week_<label>.json``, older
+``news_month_*``/``news_week_<date>`` dumps). Compaction merges files
+older than ``RAW_COMPACT_AFTER_DAYS`` into one gzipped JSONL segment per
+month (``data/raw/archive/news_<YYYY-MM>.jsonl.gz``), de-duplicated by
+article id, and records in ``index.json`` which articles each original
+file held. Segments whose month ended more than ``RAW_FULL_TEXT_DAYS``
+ago keep only ``RAW_PROJECTED_FIELDS`` (no full text, images, ...).
+
+Readers go through :func:`load`, :func:`exists`, :func:`stems`,
+:func:`days` and :func:`iter_files`, which see loose files and compacted
+ones alike, so the number of files in ``data/raw`` stays bounded.
+
+Usage::
+
+    python -m src.archive compact [--dry-run]   # merge old files, apply tiers
+    python -m src.archive stats
+    python -m src.archive show news_2025-11-01
+"""
+
+import argparse, fnmatch, glob, gzip, json, os, re
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+
+from src import facts, storage
+from src.config import RAW_COMPACT_AFTER_DAYS, RAW_FULL_TEXT_DAYS, RAW_PROJECTED_FIELDS
+
+TEXT_FIELDS = ("full_text", "content", "description")
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+DAILY_RE = re.compile(r"^news_(\d{4}-\d{2}-\d{2})$")
+SEGMENT_CACHE_SIZE = 3
+
+
+def fullness(article):
+    """How much text a copy carries (then how many fields): the fuller copy of an article is kept."""
+    return sum(len(str(article.get(f) or "")) for f in TEXT_FIELDS), len(article)
+
+
+def archive_dir(raw_dir="data/raw"):
+    return os.path.join(raw_dir, "archive")
+
+
+def index_path(raw_dir="data/raw"):
+    return os.path.join(archive_dir(raw_dir), "index.json")
+
+
+def _empty_index():
+    return {"segments": {}, "files": {}}
+
+
+# -----------------------------------------------------
+# 1️⃣ INDEX AND SEGMENTS (cached by mtime)
+# -----------------------------------------------------
+_index_cache = {}
+_segment_cache = OrderedDict()
+
+
+def load_index(raw_dir="data/raw"):
+    path = index_path(raw_dir)
+    if not os.path.exists(path):
+        return _empty_index()
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if _index_cache.get("key") != key:
+        with open(path, "r", encoding="utf-8") as f:
+            _index_cache.update(key=key, index=json.load(f))
+    return _index_cache["index"]
+
+
+def segment_path(month, raw_dir="data/raw"):
+    return os.path.join(archive_dir(raw_dir), f"news_{month}.jsonl.gz")
+
+
+def read_segment(month, raw_dir="data/raw"):
+    """``{article id: article}`` for one month (the last few segments stay in memory)."""
+    path = segment_path(month, raw_dir)
+    if not os.path.exists(path):
+        return {}
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key in _segment_cache:
+        _segment_cache.move_to_end(key)
+        return _segment_cache[key]
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        articles = dict(json.loads(line) for line in f if line.strip())
+    _segment_cache[key] = articles
+    while len(_segment_cache) > SEGMENT_CACHE_SIZE:
+        _segment_cache.popitem(last=False)
+    return articles
+
+
+def write_segment(month, articles, raw_dir="data/raw"):
+    lines = "".join(json.dumps([aid, a], ensure_ascii=False) + "\n" for aid, a in articles.items())
+    return storage.atomic_write_bytes(segment_path(month, raw_dir), gzip.compress(lines.encode("utf-8"), mtime=0))
+
+
+# -----------------------------------------------------
+# 2️⃣ LOOKUP API (loose files first, then the archive)
+# -----------------------------------------------------
+def load(stem, raw_dir="data/raw"):
+    """The articles of raw file ``stem`` (e.g. ``news_2025-11-01``), or ``None``."""
+    try:
+        with open(os.path.join(raw_dir, f"{stem}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass  # compacted (possibly while we looked)
+    refs = load_index(raw_dir)["files"].get(stem)
+    if refs is None:
+        return None
+    articles = []
+    for month, aid in refs:
+        a = read_segment(month, raw_dir).get(aid)
+        if a is not None:
+            articles.append(dict(a))
+    return articles
+
+
+def exists(stem, raw_dir="data/raw"):
+    return os.path.exists(os.path.join(raw_dir, f"{stem}.json")) or stem in load_index(raw_dir)["files"]
+
+
+def stems(raw_dir="data/raw", pattern="news_*"):
+    """Every raw file stem matching ``pattern``, loose or compacted, sorted."""
+    loose = {os.path.basename(p)[:-len(".json")] for p in glob.glob(os.path.join(raw_dir, f"{pattern}.json"))}
+    packed = {s for s in load_index(raw_dir)["files"] if fnmatch.fnmatchcase(s, pattern)}
+    return sorted(loose | packed)
+
+
+def days(raw_dir="data/raw"):
+    """Dates with a daily raw file, sorted."""
+    return [date.fromisoformat(m.group(1)) for m in map(DAILY_RE.match, stems(raw_dir)) if m]
+
+
+def iter_files(raw_dir="data/raw"):
+    """``(stem, articles)`` for every raw file, in name order; unreadable files are skipped."""
+    for stem in stems(raw_dir):
+        try:
+            data = load(stem, raw_dir)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if isinstance(data, list):
+            yield stem, data
+
+
+# -----------------------------------------------------
+# 3️⃣ COMPACTION AND RETENTION
+# -----------------------------------------------------
+def last_day(stem):
+    """The latest date named in ``stem`` (a week dump covers up to its end date)."""
+    found = DATE_RE.findall(stem)
+    return date.fromisoformat(found[-1]) if found else None
+
+
+def article_month(article, fallback):
+    published = str(article.get("publishedAt") or article.get("pubDate") or "")
+    return published[:7] if re.match(r"\d{4}-\d{2}", published) else fallback
+
+
+def month_end(month):
+    year, mon = map(int, month.split("-"))
+    return date(year + mon // 12, mon % 12 + 1, 1) - timedelta(days=1)
+
+
+def project(article):
+    return {k: article[k] for k in RAW_PROJECTED_FIELDS if k in article}
+
+
+def compact(raw_dir="data/raw", today=None, keep_days=RAW_COMPACT_AFTER_DAYS, full_days=RAW_FULL_TEXT_DAYS,
+            dry_run=False):
+    """Merge loose files older than ``keep_days`` into monthly segments and apply retention tiers.
+
+    Segments are written first, then the index, then the loose files are
+    removed, so every article stays readable throughout. Returns a summary.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    cutoff, full_until = today - timedelta(days=keep_days), today - timedelta(days=full_days)
+    with storage.file_lock(index_path(raw_dir)):
+        index = json.loads(json.dumps(load_index(raw_dir)))   # private copy
+        loose = []
+        for path in sorted(glob.glob(os.path.join(raw_dir, "news_*.json"))):
+            stem = os.path.basename(path)[:-len(".json")]
+            if last_day(stem) is not None and last_day(stem) < cutoff:
+                loose.append((stem, path))
+
+        touched, segments = set(), {}
+        def segment(month):
+            if month not in segments:
+                segments[month] = dict(read_segment(month, raw_dir))
+            return segments[month]
+
+        for stem, path in loose:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            fallback = last_day(stem).isoformat()[:7]
+            refs = []
+            for a in data if isinstance(data, list) else []:
+                if not isinstance(a, dict):
+                    continue
+                month, aid = article_month(a, fallback), facts.article_id(a)
+                seg = segment(month)
+                if aid not in seg or fullness(seg[aid]) < fullness(a):
+                    seg[aid] = a   # the fullest copy wins; tiers re-project below
+                refs.append([month, aid])
+                touched.add(month)
+            index["files"][stem] = refs
+
+        # Retention: months past the full-text window keep projected fields only
+        for month, meta in index["segments"].items():
+            if meta.get("tier") == "full" and month_end(month) < full_until:
+                touched.add(month)
+
+        referenced = {}
+        for refs in index["files"].values():
+            for month, aid in refs:
+                referenced.setdefault(month, set()).add(aid)
+        summary = {"files": [s for s, _ in loose], "segments": {}, "dry_run": dry_run}
+        for month in sorted(touched):
+            tier = "projected" if month_end(month) < full_until else "full"
+            seg = {aid: (project(a) if tier == "projected" else a)
+                   for aid, a in segment(month).items() if aid in referenced.get(month, ())}
+            summary["segments"][month] = {"articles": len(seg), "tier": tier}
+            if not dry_run:
+                write_segment(month, seg, raw_dir)
+                index["segments"][month] = {"articles": len(seg), "tier": tier,
+                                            "bytes": os.path.getsize(segment_path(month, raw_dir))}
+        if dry_run:
+            return summary
+        storage.atomic_write_json(index_path(raw_dir), index, indent=None)
+        for _, path in loose:
+            os.remove(path)
+    if loose or touched:
+        print(f"🗜️ Compacted {len(loose)} raw files into {len(touched)} monthly segments → {archive_dir(raw_dir)}")
+    return summary
+
+
+def stats(raw_dir="data/raw"):
+    index = load_index(raw_dir)
+    loose = glob.glob(os.path.join(raw_dir, "news_*.json"))
+    return {
+        "loose_files": len(loose),
+        "loose_bytes": sum(os.path.getsize(p) for p in loose),
+        "compacted_files": len(index["files"]),
+        "segments": len(index["segments"]),
+        "segment_bytes": sum(m["bytes"] for m in index["segments"].values()),
+        "articles": sum(m["articles"] for m in index["segments"].values()),
+        "projected_segments": sorted(m for m, s in index["segments"].items() if s["tier"] == "projected"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Raw-article archive.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    c = sub.add_parser("compact", help="merge old raw files into monthly segments")
+    c.add_argument("--keep-days", type=int, default=RAW_COMPACT_AFTER_DAYS)
+    c.add_argument("--full-days", type=int, default=RAW_FULL_TEXT_DAYS)
+    c.add_argument("--dry-run", action="store_true")
+    sub.add_parser("stats", help="files, segments and sizes")
+    s = sub.add_parser("show", help="print the articles of one raw file")
+    s.add_argument("stem")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        print(json.dumps(compact(keep_days=args.keep_days, full_days=args.full_days, dry_run=args.dry_run), indent=2))
+    elif args.command == "stats":
+        print(json.dumps(stats(), indent=2))
+    else:
+        articles = load(args.stem)
+        if articles is None:
+            raise SystemExit(f"❌ No raw file {args.stem}.")
+        for a in articles:
+            print(f"{a.get('publishedAt', '')[:16]}  {a.get('title')}")
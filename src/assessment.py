@@ -0,0 +1,349 @@
+"""Scenario assessment: full or incremental, plus a daily pulse.
+
+Every assessment records, per scenario, which articles it has already
+considered (``SCENARIO_STATE_PATH``). In incremental mode each new
+article is mapped locally to the scenario(s) it bears on, and the model
+re-assesses only the scenarios with new evidence (or whose definition
+changed). The others are carried forward from their last assessment,
+with its plausibility. Daily pulses keep their own seen-sets (the
+``"pulse"`` section of the state), so articles a pulse has already
+looked at are still new evidence for the weekly run.
+Every entry appended to ``scenarios_log.jsonl`` carries provenance:
+
+- ``assessment``: ``"reassessed"`` or ``"carried_forward"``
+- ``mode``: ``"full"``, ``"incremental"`` or ``"pulse"``
+- ``evidence_count`` / ``threads``: how many new articles, and which
+  threads, are behind it
+- ``carried_from``: when the carried assessment was made
+
+Article → scenario mapping uses each scenario's title, narrative and
+optional bilingual ``signals`` list: an article goes to the scenario(s)
+sharing the most scenario-specific terms with it, if at least
+``EVIDENCE_MIN_HITS``.
+
+Usage::
+
+    python -m src.assessment pulse   # re-assess scenarios against the latest daily articles
+"""
+
+import argparse, hashlib, json, os
+
+from src import budget, compress, context_bundle, facts, llm, storage, threads
+from src.config import (
+    SCENARIO_STATE_PATH, SCENARIO_LOG_PATH, EVIDENCE_MIN_HITS, local_date,
+)
+
+REASONING_FIELDS = ("id", "title", "plausibility", "reasoning", "updated_confidence")
+
+
+# -----------------------------------------------------
+# 1️⃣ REASONING CALL
+# -----------------------------------------------------
+def strip_code_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```") and text.endswith("```"):
+        text = text[3:-3].strip()
+        if text.lower().startswith("json"):
+            text = text[4:].strip()
+    return text
+
+def parse_reasoning(raw_output):
+    """Parse the structured-reasoning JSON array; raise ``ValueError`` if malformed."""
+    structured_reasoning = json.loads(strip_code_fences(raw_output or ""))
+    if not isinstance(structured_reasoning, list):
+        raise llm.LLMValidationError("reasoning output is not a JSON array")
+    for e in structured_reasoning:
+        if not isinstance(e, dict):
+            raise llm.LLMValidationError(f"reasoning entry is not an object: {e!r:.80}")
+        missing = [k for k in REASONING_FIELDS if k not in e]
+        if missing:
+            raise llm.LLMValidationError(f"reasoning entry missing {missing}")
+    return structured_reasoning
+
+
+def scenario_block(scenarios):
+    return "\n".join([
+        f"### {s['id']} – {s['title']}\n{s['narrative']}\n"
+        for s in scenarios
+    ])
+
+
+def reasoning_messages(scenarios, context, news_ctx, period="this week"):
+    reasoning_prompt = f"""
+You are a geopolitical analyst assessing developments in Venezuela.
+
+Your task:
+Evaluate how the plausibility of each scenario changed {period}, based on factual developments.
+The news feed is grouped into storylines: NEW ones started in this period, CONTINUING ones were already running.
+Weigh what changed within each storyline in this period rather than its background.
+
+Return ONLY a valid JSON array (no markdown or explanations).
+Each element must have the following fields and structure — populate each field based on your own assessment, not the example values:
+
+[
+  {{
+    "id": "SCENARIO_ID",
+    "title": "SCENARIO_TITLE",
+    "plausibility": "up" | "down" | "steady",
+    "reasoning": "2–3 factual sentences explaining why plausibility changed, referencing evidence from {period}.",
+    "updated_confidence": FLOAT between 0 and 1
+  }}
+]
+
+---
+Context:
+{context}
+
+---
+Scenarios:
+{scenario_block(scenarios)}
+
+---
+News Feed (by storyline):
+{news_ctx}
+"""
+    return [
+        {
+            "role": "system",
+            "content": "Output only a valid JSON array following the structure above. Populate all fields based on reasoning; do not repeat example values or explanations."
+        },
+        {"role": "user", "content": reasoning_prompt},
+    ]
+
+
+def reason(scenarios, context, news_ctx, period="this week"):
+    """Ask the model how each of ``scenarios`` changed over ``period``.
+
+    ``news_ctx`` is the feed text, or ``news_ctx(context, articles)``
+    building it at a budget step (see :func:`src.budget.plan`).
+    """
+    ids = {s["id"] for s in scenarios}
+
+    def validate(text):
+        entries = parse_reasoning(text)
+        missing = ids - {e["id"] for e in entries}
+        if missing:
+            raise llm.LLMValidationError(f"reasoning missing scenarios {sorted(missing)}")
+        return entries
+
+    feed = news_ctx if callable(news_ctx) else (lambda scale, share: budget.shrink(news_ctx, scale))
+    print(f"🤖 Calling OpenAI for structured reasoning ({len(scenarios)} scenario(s))...")
+    raw_output = llm.complete_within_budget(
+        "weekly_reasoning",
+        lambda scale, share: reasoning_messages(scenarios, budget.shrink(context, scale), feed(scale, share), period),
+        temperature=0.3,
+        validate=validate,
+    )
+    entries = parse_reasoning(raw_output)
+    return [e for e in entries if e["id"] in ids]
+
+
+# -----------------------------------------------------
+# 2️⃣ EVIDENCE MAPPING
+# -----------------------------------------------------
+def scenario_profiles(scenarios):
+    """Scenario-specific terms: title + narrative + signals, minus terms shared by all."""
+    sets = {
+        s["id"]: compress.terms(" ".join([s["title"], s.get("narrative", ""), " ".join(s.get("signals", []))]))
+        for s in scenarios
+    }
+    common = set.intersection(*sets.values()) if len(sets) > 1 else set()
+    return {sid: ts - common for sid, ts in sets.items()}
+
+
+def map_evidence(articles, profiles, min_hits=EVIDENCE_MIN_HITS):
+    """Return ``{scenario_id: [article, ...]}``; each article goes to its best match(es)."""
+    mapped = {sid: [] for sid in profiles}
+    for a in articles:
+        ts = compress.terms(" ".join([a.get("title") or "", a.get("description") or ""]))
+        hits = {sid: len(ts & p) for sid, p in profiles.items()}
+        best = max(hits.values(), default=0)
+        if best < min_hits:
+            continue
+        for sid, h in hits.items():
+            if h == best:
+                mapped[sid].append(a)
+    return mapped
+
+
+def fingerprint(scenario):
+    text = json.dumps([scenario["title"], scenario.get("narrative", ""), scenario.get("signals", [])], ensure_ascii=False)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+# -----------------------------------------------------
+# 3️⃣ STATE AND LOG
+# -----------------------------------------------------
+def track(mode):
+    """State section for ``mode``: weekly runs use ``"scenarios"``, pulses ``"pulse"``."""
+    return "pulse" if mode == "pulse" else "scenarios"
+
+
+def latest_logged(log_path=SCENARIO_LOG_PATH):
+    """Most recent log entry per state section and scenario id (seed for carrying forward)."""
+    latest = {"scenarios": {}, "pulse": {}}
+    if os.path.exists(log_path):
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    e = json.loads(line)
+                    latest[track(e.get("mode"))][e["id"]] = e
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+    return latest
+
+
+def load_state(path=SCENARIO_STATE_PATH, log_path=SCENARIO_LOG_PATH):
+    state = {"scenarios": {}, "pulse": {}}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            state.update(json.load(f))
+    else:
+        for section, latest in latest_logged(log_path).items():
+            for sid, e in latest.items():
+                state[section][sid] = {"evidence": [], "fingerprint": None, "last": e}
+    return state
+
+
+def save_state(state, path=SCENARIO_STATE_PATH):
+    storage.atomic_write_json(path, state)
+
+
+def log_entries(entries, log_path=SCENARIO_LOG_PATH, **fields):
+    for e in entries:
+        e.update({k: v for k, v in fields.items() if v is not None})
+    # One locked append: a weekly run and a pulse may log at the same time.
+    storage.append_jsonl(log_path, entries)
+    print(f"🗂️ Logged structured reasoning → {log_path}")
+
+
+# -----------------------------------------------------
+# 4️⃣ ASSESS
+# -----------------------------------------------------
+def assess(curated, scenarios, context, build_ctx, mode="incremental", period="this week",
+           state_path=SCENARIO_STATE_PATH, log_path=SCENARIO_LOG_PATH):
+    """Assess ``scenarios`` against ``curated``; return one entry per scenario.
+
+    ``build_ctx(items)`` renders articles as prompt text. In ``"full"``
+    mode every scenario is re-assessed on all articles; in incremental
+    mode only scenarios with new evidence are, on their own evidence.
+    ``"pulse"`` works like incremental against the pulses' own state.
+    The caller logs the entries and then calls :func:`commit_state`.
+    """
+    state = load_state(state_path, log_path)[track(mode)]
+    mapped = map_evidence(curated, scenario_profiles(scenarios))
+
+    changed, new_evidence = [], {}
+    for s in scenarios:
+        prev = state.get(s["id"], {})
+        seen = set(prev.get("evidence", []))
+        new_evidence[s["id"]] = [a for a in mapped[s["id"]] if facts.article_id(a) not in seen]
+        stale = prev.get("fingerprint") not in (None, fingerprint(s))
+        if mode == "full" or new_evidence[s["id"]] or stale or not prev.get("last"):
+            changed.append(s)
+
+    by_id = {}
+    if changed:
+        if mode == "full":
+            evidence = curated
+        else:
+            evidence, seen_ids = [], set()
+            for s in changed:
+                for a in mapped[s["id"]]:
+                    if facts.article_id(a) not in seen_ids:
+                        seen_ids.add(facts.article_id(a))
+                        evidence.append(a)
+        print(f"🔁 Re-assessing {len(changed)} of {len(scenarios)} scenario(s) on {len(evidence)} article(s) ({mode}).")
+        def feed(scale, share):
+            return budget.shrink(build_ctx(budget.keep(evidence, share)), scale)
+
+        by_id = {e["id"]: e for e in reason(changed, context, feed, period)}
+    else:
+        print("⏭️ No new evidence for any scenario; carrying all assessments forward.")
+
+    index, _ = threads.load_index()
+    entries = []
+    for s in scenarios:
+        prev = state.get(s["id"], {})
+        ids = [facts.article_id(a) for a in new_evidence[s["id"]]]
+        if s["id"] in by_id:
+            e = dict(by_id[s["id"]], assessment="reassessed")
+        else:
+            last = prev.get("last") or {}
+            when = (last.get("pulse_date") or last.get("week_end") or last.get("report_generated_on")
+                    or last.get("date") or "the last assessment")
+            e = {
+                "id": s["id"],
+                "title": s["title"],
+                "plausibility": last.get("plausibility", "steady"),
+                "reasoning": f"No new evidence since {when}; carried forward. Previous assessment: {last.get('reasoning', 'n/a')}",
+                "updated_confidence": last.get("updated_confidence", s.get("confidence")),
+                "assessment": "carried_forward",
+                "carried_from": when,
+            }
+        e["mode"] = mode
+        e["evidence_count"] = len(ids)
+        e["threads"] = sorted({index["articles"][i] for i in ids if i in index["articles"]})
+        entries.append(e)
+    return entries, {"mapped": mapped, "scenarios": scenarios, "track": track(mode)}
+
+
+def commit_state(entries, pending, path=SCENARIO_STATE_PATH, log_path=SCENARIO_LOG_PATH):
+    """Record the evidence behind ``entries`` once they have been logged.
+
+    The state is re-read under its lock and this run's evidence merged
+    into it, so a weekly run and a pulse committing around the same time
+    keep each other's evidence.
+    """
+    mapped = pending["mapped"]
+    with storage.file_lock(path):
+        state = load_state(path, log_path)
+        for s, e in zip(pending["scenarios"], entries):
+            sc = state[pending["track"]].setdefault(s["id"], {"evidence": [], "fingerprint": None, "last": None})
+            if e["assessment"] == "reassessed":
+                sc["evidence"] = sorted(set(sc["evidence"]) | {facts.article_id(a) for a in mapped[s["id"]]})
+                sc["fingerprint"] = fingerprint(s)
+                sc["last"] = e
+        save_state(state, path)
+
+
+# -----------------------------------------------------
+# 5️⃣ DAILY PULSE
+# -----------------------------------------------------
+def run_pulse(curated=None, day=None, context=None, scenarios=None):
+    """Incrementally re-assess scenarios against the latest daily articles."""
+    from src import daily_pipeline, weekly_watch
+
+    if curated is None:
+        # The partition for ``day`` if given, else the newest one.
+        curated = storage.load_curated("daily", str(day) if day else None)
+        if curated is None:
+            print("⚠️ No curated daily articles yet; skipping scenario pulse.")
+            return []
+    if not curated:
+        return []
+    day = str(day or max(threads.article_day(a, local_date()) for a in curated))
+    context = weekly_watch.load_context() if context is None else context
+    scenarios = weekly_watch.load_scenarios() if scenarios is None else scenarios
+
+    records, assignments, index = threads.prepare(curated, day)
+
+    def build_ctx(items):
+        return threads.thread_context(items, assignments, index, day, records, daily_pipeline.article_piece, cap_chars=6000)
+
+    with budget.run(f"pulse {day}"):
+        entries, pending = assess(curated, scenarios, context, build_ctx, mode="pulse", period=f"on {day}")
+    log_entries(entries, mode="pulse", pulse_date=day, report_generated_on=str(local_date()))
+    commit_state(entries, pending)
+    context_bundle.publish()
+    for e in entries:
+        print(f"{e['id']} ({e['plausibility']}, {e['assessment']}): {e['reasoning'][:160]}")
+    return entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scenario assessment.")
+    parser.add_argument("command", choices=["pulse"])
+    parser.add_argument("--date", help="label for the pulse (default: newest article date)")
+    args = parser.parse_args()
+    run_pulse(day=args.date)
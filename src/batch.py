@@ -0,0 +1,346 @@
+"""Batch submission for large daily-brief backfills and re-generations.
+
+Regenerating months of briefs (say after a change to the ``summarize``
+prompt) used to mean one blocking chat completion per date at
+interactive prices. Batch mode instead:
+
+1. builds the ``daily_summary`` prompt for every pending date from the
+   recorded ``data/raw/news_{date}.json`` (no GNews calls; uncached
+   fact records are still extracted on the way), each sized by the
+   budget governor like an interactive call (src/budget.py);
+2. checks the whole batch, at ``BATCH_DISCOUNT`` prices, against the
+   day budget, then writes it to one JSONL file (``custom_id`` =
+   ``daily-{date}``), uploads it and creates a batch on the
+   ``/v1/batches`` endpoint;
+3. polls until the batch finishes, then fans the answers out to
+   ``outputs/daily/venezuela_{date}.md`` (plus the rendered page and
+   search entry), validated like the interactive path. Each answer is
+logged to the routing log with its discounted cost, so it counts
+towards the day budget.
+
+Each submission has a manifest under ``BATCH_DIR``. Dates with a batch
+in flight are never submitted again, and fan-out is idempotent: it
+records every date it writes, so ``resume`` can be re-run at any point.
+Answers that error or fail validation are regenerated one by one through
+``llm.complete`` (with tier escalation) unless ``--no-fallback`` is given.
+
+Usage::
+
+    python -m src.batch daily --since 2025-11-01 --until 2025-11-30               # missing briefs only
+    python -m src.batch daily --since 2025-11-01 --until 2025-11-30 --regenerate  # after a prompt change
+    python -m src.batch resume        # poll unfinished batches and write their results
+    python -m src.batch status
+
+``python -m src.replay serve`` provides a local batch endpoint to try it
+against (set ``OPENAI_BASE_URL`` as it prints).
+"""
+
+import argparse, glob, json, os, time
+from datetime import date, datetime, timedelta, timezone
+
+from src import archive, budget, daily_pipeline, llm, search, storage, threads
+from src.config import BATCH_DIR, BATCH_POLL_S, BATCH_COMPLETION_WINDOW, BATCH_DISCOUNT, MODEL_TIERS
+
+TASK = "daily_summary"
+ENDPOINT = "/v1/chat/completions"
+TERMINAL = {"completed", "failed", "expired", "cancelled"}
+
+
+# -----------------------------------------------------
+# 1️⃣ MANIFESTS
+# -----------------------------------------------------
+def manifest_path(name, batch_dir=BATCH_DIR):
+    return os.path.join(batch_dir, f"{name}.json")
+
+
+def save_manifest(manifest, batch_dir=BATCH_DIR):
+    storage.atomic_write_json(manifest_path(manifest["name"], batch_dir), manifest)
+
+
+def load_manifests(batch_dir=BATCH_DIR):
+    """All manifests, oldest first."""
+    manifests = []
+    for path in sorted(glob.glob(os.path.join(batch_dir, "*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            manifests.append(json.load(f))
+    return manifests
+
+
+def batch_client():
+    """The shared OpenAI SDK client (batch mode has no stub equivalent)."""
+    client = getattr(llm.get_provider(), "client", None)
+    if client is None:
+        raise RuntimeError("Batch mode needs the OpenAI provider (LLM_PROVIDER=openai).")
+    return client
+
+
+# -----------------------------------------------------
+# 2️⃣ BUILD REQUESTS
+# -----------------------------------------------------
+def pending_dates(since, until, regenerate=False, raw_dir="data/raw", daily_dir="outputs/daily", batch_dir=BATCH_DIR):
+    """Dates in ``[since, until]`` with recorded articles and no brief yet (any brief if ``regenerate``).
+
+    Dates already in an unfinished batch are left out.
+    """
+    in_flight = {d for m in load_manifests(batch_dir) if m["status"] != "applied" for d in m["dates"]}
+    dates, day = [], since
+    while day <= until:
+        has_raw = archive.exists(f"news_{day}", raw_dir)
+        has_brief = os.path.exists(f"{daily_dir}/venezuela_{day}.md")
+        if has_raw and (regenerate or not has_brief) and day.isoformat() not in in_flight:
+            dates.append(day)
+        day += timedelta(days=1)
+    return dates
+
+
+def build_requests(dates, raw_dir="data/raw"):
+    """One batch line per date with relevant articles, in date order (threads advance day by day).
+
+    Each prompt goes through the same budget plan as the interactive
+    brief (shrink context, drop articles, cheaper tier); dates that fit
+    no plan are left out.
+    """
+    requests = []
+    for day in sorted(dates):
+        curated = daily_pipeline.rank_articles(archive.load(f"news_{day}", raw_dir))
+        if not curated:
+            print(f"⚠️ No curated Venezuela articles for {day}, skipping.")
+            continue
+        search.add_articles(curated)
+        prepared = threads.prepare(curated, day.isoformat())
+        try:
+            messages, tier = budget.plan(TASK, lambda context, articles: daily_pipeline.summary_messages(
+                budget.keep(curated, articles), day.isoformat(), prepared, int(6000 * context)))
+        except budget.BudgetExceededError as e:
+            print(f"💸 {day}: {e}; skipping.")
+            continue
+        requests.append({
+            "custom_id": f"daily-{day}",
+            "method": "POST",
+            "url": ENDPOINT,
+            "body": {
+                "model": MODEL_TIERS[tier],
+                "messages": messages,
+                "temperature": daily_pipeline.SUMMARY_TEMPERATURE,
+            },
+        })
+    return requests
+
+
+# -----------------------------------------------------
+# 3️⃣ SUBMIT / POLL
+# -----------------------------------------------------
+def batch_cost(model, usage):
+    """USD for one batch answer: the interactive price times ``BATCH_DISCOUNT``."""
+    return budget.cost(model, usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0) * BATCH_DISCOUNT
+
+
+def preflight(requests):
+    """Raise :class:`src.budget.BudgetExceededError` if the batch would break the day budget; return its estimate."""
+    usd = sum(budget.estimate(r["body"]["model"], r["body"]["messages"])["usd"] for r in requests) * BATCH_DISCOUNT
+    spent = budget.day_spent()
+    if spent + usd > budget.BUDGET_DAY_USD:
+        reason = f"day at ${spent:.2f} of ${budget.BUDGET_DAY_USD:.2f}"
+        budget.log({"event": "refused", "task": TASK, "requests": len(requests), "est_usd": round(usd, 5),
+                    "reasons": [reason]})
+        raise budget.BudgetExceededError(f"batch of {len(requests)} {TASK} request(s) (~${usd:.2f}): {reason}")
+    budget.log({"event": "ok", "task": TASK, "requests": len(requests), "est_usd": round(usd, 5), "batch": True})
+    return usd
+
+
+def submit(requests, client, kind="daily", batch_dir=BATCH_DIR):
+    """Write ``requests`` as JSONL, upload it and create the batch; return its manifest.
+
+    The batch is checked against the day budget first (:func:`preflight`).
+    """
+    preflight(requests)
+    name = f"{kind}_{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}"
+    input_path = os.path.join(batch_dir, f"{name}.input.jsonl")
+    storage.atomic_write_text(input_path, "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in requests))
+
+    with open(input_path, "rb") as f:
+        upload = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=upload.id, endpoint=ENDPOINT, completion_window=BATCH_COMPLETION_WINDOW,
+        metadata={"name": name},
+    )
+    manifest = {
+        "name": name,
+        "kind": kind,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "batch_id": batch.id,
+        "input": input_path,
+        "dates": [r["custom_id"].split("-", 1)[1] for r in requests],
+        "status": "submitted",
+        "applied": [],
+        "fallback": [],
+    }
+    save_manifest(manifest, batch_dir)
+    print(f"📤 Submitted {len(requests)} request(s) as batch {batch.id} ({name})")
+    return manifest
+
+
+def wait(manifest, client, poll_s=BATCH_POLL_S, timeout_s=None, batch_dir=BATCH_DIR):
+    """Poll until the batch is finished; return it, or ``None`` if ``timeout_s`` passes first."""
+    start = time.monotonic()
+    while True:
+        batch = client.batches.retrieve(manifest["batch_id"])
+        counts = batch.request_counts
+        done = f" ({counts.completed}/{counts.total} done, {counts.failed} failed)" if counts else ""
+        print(f"⏳ {manifest['name']}: {batch.status}{done}")
+        if batch.status in TERMINAL:
+            manifest["status"] = batch.status
+            save_manifest(manifest, batch_dir)
+            return batch
+        if timeout_s is not None and time.monotonic() - start >= timeout_s:
+            return None
+        time.sleep(poll_s)
+
+
+def download(manifest, batch, client, batch_dir=BATCH_DIR):
+    """Save the batch's output and error files next to the manifest (once)."""
+    for field in ("output_file_id", "error_file_id"):
+        file_id = getattr(batch, field, None)
+        path = os.path.join(batch_dir, f"{manifest['name']}.{field.split('_')[0]}.jsonl")
+        if file_id and not os.path.exists(path):
+            storage.atomic_write_text(path, client.files.content(file_id).text)
+
+
+def read_results(manifest, batch_dir=BATCH_DIR):
+    """``{custom_id: (text, usage, model)}`` for the successful lines of the saved output file."""
+    path = os.path.join(batch_dir, f"{manifest['name']}.output.jsonl")
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            response = row.get("response") or {}
+            if row.get("error") or response.get("status_code") != 200:
+                continue
+            body = response.get("body") or {}
+            choices = body.get("choices") or [{}]
+            results[row["custom_id"]] = ((choices[0].get("message") or {}).get("content") or "", body.get("usage") or {},
+                                         body.get("model"))
+    return results
+
+
+# -----------------------------------------------------
+# 4️⃣ FAN OUT
+# -----------------------------------------------------
+def fan_out(manifest, results, daily_dir="outputs/daily", batch_dir=BATCH_DIR):
+    """Write each valid answer to its brief; return the dates that still need one.
+
+    Dates already applied are skipped, so this is safe to repeat.
+    """
+    applied, missing = set(manifest["applied"]), []
+    for day in manifest["dates"]:
+        if day in applied:
+            continue
+        text, usage, model = results.get(f"daily-{day}", (None, {}, None))
+        try:
+            if text is None:
+                raise llm.LLMValidationError("no answer in the batch output")
+            daily_pipeline.validate_daily_summary(text)
+        except ValueError as e:
+            print(f"⚠️ {day}: {e}")
+            missing.append(day)
+            continue
+        daily_pipeline.save_report(day, text, daily_dir)
+        # Same fields as llm.complete, so budget.day_spent counts the batch spend
+        model = model or MODEL_TIERS[llm.tier_for(TASK)]
+        tier = next((t for t, m in MODEL_TIERS.items() if m == model), llm.tier_for(TASK))
+        llm.log_decision({
+            "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"), "task": TASK,
+            "tier": tier, "model": model, "outcome": "ok", "reason": f"batch {manifest['batch_id']}",
+            "cost_usd": round(batch_cost(model, usage), 6),
+            "prompt_tokens": usage.get("prompt_tokens"), "completion_tokens": usage.get("completion_tokens"),
+        })
+        applied.add(day)
+        manifest["applied"] = sorted(applied)
+        save_manifest(manifest, batch_dir)
+    return missing
+
+
+def fallback(manifest, dates, daily_dir="outputs/daily", batch_dir=BATCH_DIR):
+    """Regenerate ``dates`` one call at a time from the messages that were submitted."""
+    with open(manifest["input"], "r", encoding="utf-8") as f:
+        requests = {r["custom_id"]: r for r in map(json.loads, f)}
+    for day in dates:
+        print(f"🔁 {day}: regenerating interactively")
+        body = requests[f"daily-{day}"]["body"]
+        text = llm.complete(TASK, body["messages"], temperature=body["temperature"],
+                            validate=daily_pipeline.validate_daily_summary)
+        daily_pipeline.save_report(day, text, daily_dir)
+        manifest["applied"] = sorted(set(manifest["applied"]) | {day})
+        manifest["fallback"] = sorted(set(manifest["fallback"]) | {day})
+        save_manifest(manifest, batch_dir)
+
+
+def finish(manifest, client, poll_s=BATCH_POLL_S, timeout_s=None, use_fallback=True,
+           daily_dir="outputs/daily", batch_dir=BATCH_DIR):
+    """Wait for a submitted batch and write its briefs; return the manifest."""
+    batch = wait(manifest, client, poll_s, timeout_s, batch_dir)
+    if batch is None:
+        print(f"🕒 {manifest['name']} is still running; `python -m src.batch resume` picks it up later.")
+        return manifest
+    download(manifest, batch, client, batch_dir)
+    missing = fan_out(manifest, read_results(manifest, batch_dir), daily_dir, batch_dir)
+    if missing and use_fallback:
+        fallback(manifest, missing, daily_dir, batch_dir)
+    elif missing:
+        print(f"⚠️ {len(missing)} date(s) without a brief: {', '.join(missing)}")
+    manifest["status"] = "applied"
+    save_manifest(manifest, batch_dir)
+    print(f"✅ {manifest['name']}: {len(manifest['applied'])}/{len(manifest['dates'])} brief(s) written "
+          f"({len(manifest['fallback'])} interactively)")
+    return manifest
+
+
+def run_daily_batch(since, until, regenerate=False, client=None, poll_s=BATCH_POLL_S, timeout_s=None,
+                    use_fallback=True, raw_dir="data/raw", daily_dir="outputs/daily", batch_dir=BATCH_DIR):
+    """Submit every pending daily brief in ``[since, until]`` as one batch and write the results."""
+    dates = pending_dates(since, until, regenerate, raw_dir, daily_dir, batch_dir)
+    if not dates:
+        print("✅ No daily briefs to (re)generate in that range.")
+        return None
+    requests = build_requests(dates, raw_dir)
+    if not requests:
+        return None
+    client = client or batch_client()
+    return finish(submit(requests, client, "daily", batch_dir), client, poll_s, timeout_s, use_fallback,
+                  daily_dir, batch_dir)
+
+
+def resume(client=None, poll_s=BATCH_POLL_S, timeout_s=None, use_fallback=True, batch_dir=BATCH_DIR):
+    """Finish every batch whose results have not been written yet."""
+    unfinished = [m for m in load_manifests(batch_dir) if m["status"] != "applied"]
+    if not unfinished:
+        print("✅ No unfinished batches.")
+    client = client or (batch_client() if unfinished else None)
+    return [finish(m, client, poll_s, timeout_s, use_fallback, batch_dir=batch_dir) for m in unfinished]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch regeneration of daily briefs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    daily = sub.add_parser("daily", help="submit pending daily briefs as one batch")
+    daily.add_argument("--since", type=date.fromisoformat, required=True)
+    daily.add_argument("--until", type=date.fromisoformat, required=True)
+    daily.add_argument("--regenerate", action="store_true", help="include dates that already have a brief")
+    for p in (daily, sub.add_parser("resume", help="finish submitted batches")):
+        p.add_argument("--poll", type=float, default=BATCH_POLL_S, help="seconds between status checks")
+        p.add_argument("--timeout", type=float, help="stop waiting after this many seconds (resume later)")
+        p.add_argument("--no-fallback", action="store_true", help="leave failed dates instead of calling interactively")
+    sub.add_parser("status", help="list batch manifests")
+    args = parser.parse_args()
+
+    if args.command == "daily":
+        run_daily_batch(args.since, args.until, args.regenerate, poll_s=args.poll, timeout_s=args.timeout,
+                        use_fallback=not args.no_fallback)
+    elif args.command == "resume":
+        resume(poll_s=args.poll, timeout_s=args.timeout, use_fallback=not args.no_fallback)
+    else:
+        for m in load_manifests():
+            print(f"{m['name']}  {m['status']:<10} {len(m['applied'])}/{len(m['dates'])} applied  "
+                  f"{m['dates'][0] if m['dates'] else ''} → {m['dates'][-1] if m['dates'] else ''}  ({m['batch_id']})")
@@ -0,0 +1,190 @@
+"""Pre-flight token estimates and per-call / per-run / per-day budgets.
+
+Every model call is sized locally (src/tokens.py) before it is sent and
+checked against three limits:
+
+- ``BUDGET_CALL_TOKENS``: prompt plus reserved completion, per task;
+- ``BUDGET_RUN_USD``: everything spent inside one :func:`run` (a daily
+  brief, a weekly report, a pulse, a dashboard job);
+- ``BUDGET_DAY_USD``: everything in today's routing log (UTC), so the
+  scheduler and every dashboard session share it.
+
+Callers that can trim their prompt pass a builder ``build(context,
+articles)`` to :func:`plan`, which tries ``BUDGET_STEPS`` in order:
+shrink the context, drop the lower-ranked articles, then switch to the
+cheaper tier. Calls that still do not fit raise
+:class:`BudgetExceededError`. Every decision goes to ``BUDGET_LOG``.
+"""
+
+import contextlib, contextvars, json, math, os, threading
+from datetime import datetime, timezone
+
+from src.config import (
+    MODEL_PRICES, BUDGET_CALL_TOKENS, BUDGET_RUN_USD, BUDGET_DAY_USD, BUDGET_STEPS, BUDGET_LOG,
+    LLM_ROUTING_LOG, LLM_DEFAULT_COMPLETION_TOKENS, MODEL_TIERS, TASK_TIERS, TIER_ORDER,
+)
+from src import storage
+from src.tokens import count_message_tokens
+
+
+class BudgetExceededError(RuntimeError):
+    """A call does not fit its token, run or day budget, even fully degraded."""
+
+
+# -----------------------------------------------------
+# 1️⃣ ESTIMATES
+# -----------------------------------------------------
+def cost(model, prompt_tokens, completion_tokens):
+    """USD for a call; unknown models are priced like the most expensive one."""
+    price_in, price_out = MODEL_PRICES.get(model) or max(MODEL_PRICES.values())
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+def estimate(model, messages, max_tokens=None):
+    prompt = count_message_tokens(messages)
+    completion = max_tokens or LLM_DEFAULT_COMPLETION_TOKENS
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "tokens": prompt + completion,
+            "usd": cost(model, prompt, completion)}
+
+
+def call_cap(task):
+    return BUDGET_CALL_TOKENS.get(task, BUDGET_CALL_TOKENS["default"])
+
+
+def shrink(text, scale):
+    """The first ``scale`` share of ``text``, cut at a line break."""
+    if scale >= 1 or not text:
+        return text
+    cut = text[: int(len(text) * scale)]
+    return cut.rsplit("\n", 1)[0] if "\n" in cut else cut
+
+
+def keep(items, share):
+    """The first (highest-ranked) ``share`` of ``items``, at least one."""
+    if share >= 1:
+        return items
+    return items[: max(1, math.ceil(len(items) * share))]
+
+
+# -----------------------------------------------------
+# 2️⃣ SPEND: per run and per day
+# -----------------------------------------------------
+_run = contextvars.ContextVar("budget_run", default=None)
+
+
+@contextlib.contextmanager
+def run(name, cap_usd=BUDGET_RUN_USD):
+    """Account every call made inside the block (same thread) to one run."""
+    state = {"name": name, "cap_usd": cap_usd, "spent_usd": 0.0, "calls": 0}
+    token = _run.set(state)
+    try:
+        yield state
+    finally:
+        _run.reset(token)
+        if state["calls"]:
+            log({"event": "run", "run": name, "calls": state["calls"], "spent_usd": round(state["spent_usd"], 5)})
+
+
+def record(model, usage):
+    """Add a finished call to the current run; return its cost."""
+    usd = cost(model, usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0)
+    state = _run.get()
+    if state is not None:
+        state["spent_usd"] += usd
+        state["calls"] += 1
+    return usd
+
+
+_day = {"path": None, "date": None, "offset": 0, "usd": 0.0}
+_day_lock = threading.Lock()
+
+def day_spent(log_path=LLM_ROUTING_LOG, today=None):
+    """USD in today's (UTC) routing-log entries from every process; the log is read incrementally."""
+    today = today or datetime.now(timezone.utc).date().isoformat()
+    with _day_lock:
+        size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+        if (_day["path"], _day["date"]) != (os.path.abspath(log_path), today) or size < _day["offset"]:
+            _day.update(path=os.path.abspath(log_path), date=today, offset=0, usd=0.0)
+        if size > _day["offset"]:
+            with open(log_path, "rb") as f:
+                f.seek(_day["offset"])
+                chunk = f.read(size - _day["offset"])
+            complete = chunk[: chunk.rfind(b"\n") + 1]
+            _day["offset"] += len(complete)
+            for line in complete.splitlines():
+                try:
+                    e = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if str(e.get("ts", "")).startswith(today):
+                    usd = e.get("cost_usd")
+                    if usd is None:
+                        usd = cost(e.get("model"), e.get("prompt_tokens") or 0, e.get("completion_tokens") or 0)
+                    _day["usd"] += usd
+        return _day["usd"]
+
+
+# -----------------------------------------------------
+# 3️⃣ CHECKS AND PLANS
+# -----------------------------------------------------
+def log(entry, path=BUDGET_LOG):
+    storage.append_jsonl(path, [{"ts": datetime.now(timezone.utc).isoformat(timespec="seconds"), **entry}])
+
+
+def violations(task, model, messages, max_tokens=None):
+    """``(estimate, reasons)``; no reasons means the call fits every budget."""
+    est = estimate(model, messages, max_tokens)
+    reasons = []
+    if est["tokens"] > call_cap(task):
+        reasons.append(f"{est['tokens']} tokens > {call_cap(task)} per call")
+    state = _run.get()
+    if state is not None and state["spent_usd"] + est["usd"] > state["cap_usd"]:
+        reasons.append(f"run '{state['name']}' at ${state['spent_usd']:.3f} of ${state['cap_usd']:.2f}")
+    spent = day_spent()
+    if spent + est["usd"] > BUDGET_DAY_USD:
+        reasons.append(f"day at ${spent:.2f} of ${BUDGET_DAY_USD:.2f}")
+    return est, reasons
+
+
+def preflight(task, model, messages, max_tokens=None):
+    """Raise :class:`BudgetExceededError` if the call does not fit; return its estimate."""
+    est, reasons = violations(task, model, messages, max_tokens)
+    if reasons:
+        log({"event": "refused", "task": task, "model": model, "tokens": est["tokens"],
+             "est_usd": round(est["usd"], 5), "reasons": reasons})
+        raise BudgetExceededError(f"{task} on {model}: " + "; ".join(reasons))
+    return est
+
+
+def cheaper(tier):
+    return TIER_ORDER[max(TIER_ORDER.index(tier) - 1, 0)]
+
+
+def plan(task, build, max_tokens=None, start=None):
+    """Return ``(messages, tier)`` for the first step of ``BUDGET_STEPS`` that fits.
+
+    ``build(context, articles)`` returns the messages with the context
+    scaled to ``context`` and only the first ``articles`` share of the
+    (ranked) articles kept; builders without articles ignore it.
+    ``start`` names the step to begin with (a run short of time skips
+    the fuller ones, see src/deadline.py).
+    """
+    base = TASK_TIERS.get(task, TIER_ORDER[-1])
+    labels = [step["label"] for step in BUDGET_STEPS]
+    first = labels.index(start) if start else 0
+    tried = []
+    for step in BUDGET_STEPS[first:]:
+        tier = cheaper(base) if step["downgrade"] else base
+        if step["downgrade"] and tier == base and tried:
+            continue   # already on the lowest tier: the same call as the step before
+        messages = build(step["context"], step["articles"])
+        est, reasons = violations(task, MODEL_TIERS[tier], messages, max_tokens)
+        if not reasons:
+            log({"event": "ok" if not tried and not first else "degraded", "task": task, "step": step["label"],
+                 "tier": tier, "tokens": est["tokens"], "est_usd": round(est["usd"], 5), "skipped": tried})
+            if tried:
+                print(f"💸 {task}: over budget ({tried[-1]['reasons'][0]}); using '{step['label']}'.")
+            return messages, tier
+        tried.append({"step": step["label"], "reasons": reasons})
+    log({"event": "refused", "task": task, "skipped": tried})
+    raise BudgetExceededError(f"{task}: no plan fits the budget ({'; '.join(tried[-1]['reasons'])})")
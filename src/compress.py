@@ -0,0 +1,267 @@
+"""Local extractive compression of article text before prompt packing.
+
+GNews gives each article a ``description`` and a ~260-character
+``content`` excerpt ending in ``... [N chars]``. Both often restate the
+title, and pasting them verbatim filled the 6000/10000-character
+context caps after a handful of articles.
+
+This module keeps only the most informative sentences of each article:
+
+- sentences are split on terminal punctuation (``¿``/``¡`` aware), the
+  GNews truncation marker is stripped and the cut-off last fragment
+  dropped;
+- tokens are accent-folded, stop-worded (English + Spanish) and cut to
+  a 6-character stem so "sanctions"/"sanciones" overlap;
+- sentences that mostly repeat the title, or whose terms are already
+  covered by the title plus the sentences kept so far, are skipped;
+- the rest are ranked with TextRank: per-article overlap matrices are
+  padded into one ``(articles, S, S)`` array and the power iteration
+  runs for the whole batch at once.
+
+Articles enriched with the publisher's ``full_text`` (src/enrich.py)
+are compressed from it instead of the excerpt, with the larger
+``COMPRESS_FULLTEXT_*`` limits.
+
+Prompts show an article's fact record (src/facts.py) when it has one,
+so this compression only reaches the articles whose extraction failed
+or has not run yet (``article_piece`` in the pipelines).
+
+No API calls are made. ``python -m src.compress bench`` reports
+throughput and size reduction on the raw archive.
+"""
+
+import argparse, re, time
+
+import numpy as np
+
+from src import archive
+from src.config import COMPRESS_MAX_SENTENCES, COMPRESS_MAX_CHARS, COMPRESS_FULLTEXT_SENTENCES, COMPRESS_FULLTEXT_CHARS
+from src.relevance import GNEWS_TRUNCATION, TOKEN_RE, fold
+
+MAX_SENTENCES_IN = 12       # sentences considered per article
+MAX_SENTENCES_IN_FULLTEXT = 40
+MIN_TOKENS = 3              # shorter sentences are treated as fragments
+TITLE_OVERLAP = 0.6         # share of a sentence's terms found in the title
+DUPLICATE_OVERLAP = 0.75    # share of terms already covered by the title + kept sentences
+DAMPING, ITERATIONS = 0.85, 30
+STEM = 6
+
+SENTENCE_END = re.compile(
+    r"(?<=[.!?…])[\"'”’»)]*\s+(?=[\"'“‘«(¿¡]?[A-ZÁÉÍÓÚÑ0-9])"
+    r"|(?<=[a-záéíóúñ][.!?])(?=[A-ZÁÉÍÓÚÑ][a-záéíóúñ])"   # "coast.The" in scraped text
+    r"|\n+"
+)
+ABBREVIATION = re.compile(r"(\b[A-Z]\.)+$|\b(Mr|Mrs|Ms|Dr|Sr|Sra|Gen|Gov|Sen|Rep|Lt|Col|St)\.$|\bEE\.(\s?UU\.)?$")
+PLACEHOLDERS = re.compile(r"^(only available in paid plans|\[removed\])$", re.IGNORECASE)
+STOPWORDS = set("""
+a an and are as at be been but by for from has have he her his in is it its of on or our
+said says that the their them they this to was were will with would who which after also
+about over more than into new not one two us we you she than up out
+el la los las un una unos unas y o de del al en que por para con se su sus es son fue
+ha han lo le les como mas pero sin sobre entre este esta estos estas ese esa dijo segun
+ya muy tambien cuando donde desde hasta
+""".split())
+
+
+# -----------------------------------------------------
+# 1️⃣ SENTENCES AND TERMS
+# -----------------------------------------------------
+def split_sentences(text):
+    """Split text into sentences, dropping a GNews-truncated last fragment."""
+    text = (text or "").strip()
+    truncated = bool(GNEWS_TRUNCATION.search(text))
+    text = GNEWS_TRUNCATION.sub("", text)
+    sentences = []
+    for s in SENTENCE_END.split(text):
+        s = (s or "").strip()
+        if not s:
+            continue
+        if sentences and ABBREVIATION.search(sentences[-1]):   # "the U.S. Federal ..."
+            sentences[-1] += " " + s
+        else:
+            sentences.append(s)
+    sentences = [s for s in sentences if not PLACEHOLDERS.match(s)]
+    if truncated and sentences and not sentences[-1].endswith((".", "!", "?", "…", '"', "”")):
+        sentences.pop()
+    return sentences
+
+
+def terms(text):
+    """Accent-folded, stop-worded, crudely stemmed terms (English and Spanish)."""
+    return {w[:STEM] for w in TOKEN_RE.findall(fold(text)) if w not in STOPWORDS and len(w) > 1}
+
+
+def article_sentences(article):
+    """Candidate sentences: description first, then the full text or content, de-duplicated."""
+    seen, out = set(), []
+    full = bool(article.get("full_text"))
+    for field in ("description", "full_text" if full else "content"):
+        for s in split_sentences(article.get(field)):
+            key = fold(s)
+            if key not in seen:
+                seen.add(key)
+                out.append(s)
+    return out[:MAX_SENTENCES_IN_FULLTEXT if full else MAX_SENTENCES_IN]
+
+
+def _containment(a, b):
+    """Share of ``a``'s terms that also appear in ``b``."""
+    return len(a & b) / len(a) if a else 1.0
+
+
+# -----------------------------------------------------
+# 2️⃣ TEXTRANK (batched power iteration)
+# -----------------------------------------------------
+def similarity(term_sets):
+    """TextRank sentence similarity: overlap / (log|Si| + log|Sj|)."""
+    vocab = {t: i for i, t in enumerate(set().union(*term_sets))} if term_sets else {}
+    m = np.zeros((len(term_sets), max(len(vocab), 1)), np.float32)
+    for i, ts in enumerate(term_sets):
+        m[i, [vocab[t] for t in ts]] = 1.0
+    overlap = m @ m.T
+    logs = np.log1p(m.sum(axis=1))
+    sim = overlap / np.maximum(logs[:, None] + logs[None, :], 1e-6)
+    np.fill_diagonal(sim, 0.0)
+    return sim
+
+
+def textrank_batch(matrices):
+    """Return TextRank scores for a list of square similarity matrices."""
+    if not matrices:
+        return []
+    size = max(len(m) for m in matrices)
+    w = np.zeros((len(matrices), size, size), np.float32)
+    mask = np.zeros((len(matrices), size), np.float32)
+    for i, m in enumerate(matrices):
+        n = len(m)
+        w[i, :n, :n] = m
+        mask[i, :n] = 1.0
+    row_sums = w.sum(axis=2, keepdims=True)
+    p = np.divide(w, row_sums, out=np.zeros_like(w), where=row_sums > 0)
+    n = np.maximum(mask.sum(axis=1, keepdims=True), 1.0)
+    r = mask / n
+    for _ in range(ITERATIONS):
+        r = ((1 - DAMPING) / n + DAMPING * np.einsum("ai,aij->aj", r, p)) * mask
+    return [r[i, :len(m)] for i, m in enumerate(matrices)]
+
+
+# -----------------------------------------------------
+# 3️⃣ COMPRESS
+# -----------------------------------------------------
+def _select(sentences, term_sets, scores, title_terms, max_sentences, max_chars):
+    # Earlier sentences win ties (news leads carry the key facts)
+    order = sorted(range(len(sentences)), key=lambda i: (-round(float(scores[i]), 6), i))
+    kept, used, covered = [], 0, set(title_terms)
+    for i in order:
+        ts = term_sets[i]
+        if len(ts) < MIN_TOKENS or _containment(ts, title_terms) >= TITLE_OVERLAP:
+            continue
+        if _containment(ts, covered) >= DUPLICATE_OVERLAP:
+            continue
+        if kept and used + len(sentences[i]) > max_chars:
+            continue
+        kept.append(i)
+        used += len(sentences[i])
+        covered |= ts
+        if len(kept) >= max_sentences:
+            break
+    if not kept:
+        # Only short fragments: keep the first one that adds to the title
+        kept = [i for i, ts in enumerate(term_sets) if ts and _containment(ts, title_terms) < TITLE_OVERLAP][:1]
+    text = " ".join(sentences[i] for i in sorted(kept))
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(" ", 1)[0] + " …"
+    return text
+
+
+def compress_articles(articles, max_sentences=COMPRESS_MAX_SENTENCES, max_chars=COMPRESS_MAX_CHARS):
+    """Return the compressed body text of every article, in order.
+
+    Articles with ``full_text`` get at least the ``COMPRESS_FULLTEXT_*``
+    limits: fewer, richer articles then fill the same prompt budget.
+    """
+    prepared = []
+    for a in articles:
+        sentences = article_sentences(a)
+        limits = (max_sentences, max_chars)
+        if a.get("full_text"):
+            limits = (max(max_sentences, COMPRESS_FULLTEXT_SENTENCES), max(max_chars, COMPRESS_FULLTEXT_CHARS))
+        prepared.append((sentences, [terms(s) for s in sentences], terms(a.get("title")), limits))
+    scores = textrank_batch([similarity(ts) for _, ts, _, _ in prepared])
+    return [
+        _select(sentences, ts, sc, title_terms, *limits)
+        for (sentences, ts, title_terms, limits), sc in zip(prepared, scores)
+    ]
+
+
+def compress_article(article, **kwargs):
+    return compress_articles([article], **kwargs)[0]
+
+
+# -----------------------------------------------------
+# 4️⃣ BENCHMARK
+# -----------------------------------------------------
+def _raw_body(a):
+    return f"{a.get('description') or ''}\n{a.get('content') or ''}"
+
+
+def _fit_count(bodies, titles, cap_chars):
+    used = 0
+    for i, (b, t) in enumerate(zip(bodies, titles)):
+        used += len(t) + len(b) + 4
+        if used > cap_chars:
+            return i
+    return len(bodies)
+
+
+def benchmark(articles, n=5000, batch_size=500):
+    """Time :func:`compress_articles` on ``n`` articles (the sample is repeated)."""
+    sample = (articles * (n // max(len(articles), 1) + 1))[:n]
+    t0 = time.perf_counter()
+    bodies = []
+    for i in range(0, len(sample), batch_size):
+        bodies.extend(compress_articles(sample[i:i + batch_size]))
+    elapsed = time.perf_counter() - t0
+
+    unique = articles[: min(len(articles), 200)]
+    raw_bodies = [_raw_body(a) for a in unique]
+    small_bodies = compress_articles(unique)
+    titles = [a.get("title") or "" for a in unique]
+    return {
+        "articles": len(sample),
+        "seconds": round(elapsed, 3),
+        "articles_per_s": round(len(sample) / elapsed) if elapsed else None,
+        "raw_chars": sum(map(len, raw_bodies)),
+        "compressed_chars": sum(map(len, small_bodies)),
+        "fit_in_6000_raw": _fit_count(raw_bodies, titles, 6000),
+        "fit_in_6000_compressed": _fit_count(small_bodies, titles, 6000),
+    }
+
+
+def load_raw_articles(raw_dir="data/raw"):
+    articles = []
+    for _, data in archive.iter_files(raw_dir):
+        articles.extend(a for a in data if isinstance(a, dict))
+    return articles
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extractive article compression.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench", help="measure throughput on the raw archive")
+    bench.add_argument("--n", type=int, default=5000)
+    show = sub.add_parser("show", help="print raw vs compressed text for a few articles")
+    show.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    articles = load_raw_articles()
+    if not articles:
+        raise SystemExit("❌ No raw articles under data/raw.")
+    if args.command == "bench":
+        stats = benchmark(articles, n=args.n)
+        print(f"⚡ {stats['articles']} articles in {stats['seconds']}s → {stats['articles_per_s']} articles/s")
+        print(f"📉 {stats['raw_chars']} → {stats['compressed_chars']} chars on {min(len(articles), 200)} articles")
+        print(f"📦 Articles fitting in 6000 chars: {stats['fit_in_6000_raw']} raw → {stats['fit_in_6000_compressed']} compressed")
+    else:
+        for a in articles[: args.limit]:
+            print(f"\n📰 {a.get('title')}\n--- raw ---\n{_raw_body(a)}\n--- compressed ---\n{compress_article(a)}")
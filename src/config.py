@@ -1,13 +1,30 @@
 import os
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Local clock for every pipeline (daily windows, weekly ranges, the app and
+# the scheduler); DST is handled by the zone, so nothing needs adjusting.
+LOCAL_TZ_NAME = os.getenv("LOCAL_TZ_NAME", "America/New_York")
+LOCAL_ZONE = ZoneInfo(LOCAL_TZ_NAME)
+
+
+def local_now():
+    """Current local time; call at the start of each run, never at import."""
+    return datetime.now(LOCAL_ZONE)
+
+
+def local_date():
+    return local_now().date()
 
-LOCAL_TZ_OFFSET = -4  # adjust to your actual offset if needed
-local_today = (datetime.now(timezone.utc) + timedelta(hours=LOCAL_TZ_OFFSET)).date()
-TODAY = local_today.isoformat()
 
 GNEWS_API_KEY = os.getenv("GNEWS_API_KEY")
 OPENAI_API_KEY   = os.getenv("OPENAI_API_KEY")
 
+# API endpoints; `python -m src.replay` points both at local stand-ins
+GNEWS_BASE_URL = os.getenv("GNEWS_BASE_URL", "https://gnews.io/api/v4")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")      # None → OpenAI's default
+GNEWS_REQUEST_INTERVAL_S = float(os.getenv("GNEWS_REQUEST_INTERVAL_S", "1.2"))   # pause between GNews calls
+
 # Query knobs (tweak freely)
 QUERY = '(Venezuela OR Caracas OR PDVSA OR "Nicolás Maduro" OR "Machado")'
 LANGS = ['en','es']          # bilingual to start
@@ -15,4 +32,178 @@ SINCE_DAYS = 1               # last N days per run
 PAGE_SIZE = 50               # cap per page to respect free tier
 MAX_PAGES = 2                # keep costs predictable
 
-TODAY = local_today.isoformat()
+# Service mode (src/scheduler.py)
+DAILY_RUN_AT = "06:00"              # local time the daily brief is generated
+WEEKLY_RUN_AT = ("MON", "07:00")    # local weekday + time for the Weekly Watch
+INTRADAY_EVERY_MINUTES = 0          # 0 disables the intraday refresh job
+STATUS_PORT = int(os.getenv("STATUS_PORT", "8765"))
+
+# Streamlit background LLM jobs (src/jobs.py)
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "16"))   # process-wide worker threads
+LLM_JOBS_PER_USER = 2                               # concurrent jobs per analyst session
+
+# Interact chat memory (src/memory.py)
+CHAT_WINDOW_TOKENS = 1500        # budget for verbatim recent turns
+CHAT_SYNOPSIS_MAX_TOKENS = 300   # cap for the running summary of older turns
+
+# Learned relevance filter (src/relevance.py); used by clean_rank once trained
+RELEVANCE_MODEL_PATH = "data/models/relevance.npz"
+RELEVANCE_THRESHOLD = 0.5
+
+# LLM routing (src/llm.py): each call type runs on a tier and escalates
+# to the next tier up only when its output fails validation.
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")   # "stub" for offline runs
+MODEL_TIERS = {"small": "gpt-4o-mini", "large": "gpt-4o"}
+TIER_ORDER = ["small", "large"]
+TASK_TIERS = {
+    "daily_summary": "large",
+    "weekly_reasoning": "large",
+    "weekly_narrative": "large",
+    "chat": "large",
+    "chat_lookup": "small",
+    "chat_synopsis": "small",
+    "draft": "large",
+    "draft_edits": "small",
+    "fact_extraction": "small",
+}
+LLM_ROUTING_LOG = "data/logs/llm_routing.jsonl"
+
+# LLM gateway (src/llm.py): shared client, concurrency and quota limits.
+# Per-model requests/tokens per minute; set them to the account's limits.
+LLM_RATE_LIMITS = {
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200_000},
+    "gpt-4o": {"rpm": 500, "tpm": 30_000},
+}
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))   # in-flight calls per process
+LLM_TIMEOUT_S = 60           # per request
+LLM_MAX_RETRIES = 4          # on 429 / 5xx / connection errors
+LLM_BACKOFF_BASE_S = 1.0     # first retry delay, doubled each attempt (with jitter)
+LLM_DEFAULT_COMPLETION_TOKENS = 800   # reserved per call when max_tokens is not given
+
+# Per-article fact records (src/facts.py)
+FACTS_CACHE_PATH = "data/cache/article_facts.jsonl"
+FACT_BATCH_SIZE = 8   # articles per extraction call
+
+# Extractive pre-compression of article text (src/compress.py)
+COMPRESS_MAX_SENTENCES = 3   # sentences kept per article
+COMPRESS_MAX_CHARS = 450     # soft cap on the kept text per article
+
+# Story threads across days (src/threads.py)
+THREADS_DIR = "data/threads"
+THREAD_SIMILARITY = 0.18     # cosine needed to join an existing thread
+THREAD_ACTIVE_DAYS = 21      # threads idle longer than this are closed
+
+# Scenario assessment (src/assessment.py)
+SCENARIO_ASSESSMENT_MODE = "incremental"   # "full" re-assesses every scenario each week
+SCENARIO_STATE_PATH = "data/assessment/state.json"
+SCENARIO_LOG_PATH = "data/logs/scenarios_log.jsonl"
+EVIDENCE_MIN_HITS = 2                      # scenario-specific terms an article must share
+SCENARIO_PULSE_AFTER_DAILY = True          # run a scenario pulse after each daily brief
+
+# Scenario confidence time series (src/timeseries.py)
+SCENARIO_SERIES_PATH = "data/series/scenarios.npz"
+
+# Full-text search over reports and curated articles (src/search.py)
+SEARCH_DB_PATH = "data/index/search.db"
+
+# Batch mode for bulk daily-brief regeneration (src/batch.py)
+BATCH_DIR = "data/batch"
+BATCH_POLL_S = 60                   # seconds between batch status checks
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_DISCOUNT = 0.5                # batch price as a share of the interactive price
+
+# Token/cost budget governor (src/budget.py)
+MODEL_PRICES = {                    # USD per 1M tokens: (input, output)
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+BUDGET_CALL_TOKENS = {              # prompt + reserved completion per call
+    "default": 16_000,
+    "daily_summary": 6_000,
+    "weekly_reasoning": 12_000,
+    "chat": 10_000,
+    "draft": 12_000,
+}
+BUDGET_RUN_USD = 0.50               # one report, pulse or dashboard job
+BUDGET_DAY_USD = float(os.getenv("BUDGET_DAY_USD", "10"))   # all processes, UTC day
+# Degradation steps tried in order until a prompt fits: shrink the
+# context, then drop low-ranked articles, then switch to the cheaper tier.
+BUDGET_STEPS = [
+    {"label": "full", "context": 1.0, "articles": 1.0, "downgrade": False},
+    {"label": "shrink context", "context": 0.6, "articles": 1.0, "downgrade": False},
+    {"label": "drop articles", "context": 0.6, "articles": 0.5, "downgrade": False},
+    {"label": "cheaper tier", "context": 0.6, "articles": 0.5, "downgrade": True},
+]
+BUDGET_LOG = "data/logs/budget.jsonl"
+
+# Atomic artifact writes and curated partitions (src/storage.py)
+CURATED_DIR = "data/curated"        # <kind>/<date or week label>.json per run
+CURATED_LEGACY = {                  # shared files written before partitioning
+    "daily": "venezuela_latest.json",
+    "weekly": "venezuela_weekly.json",
+}
+
+# Raw-article compaction and retention (src/archive.py)
+RAW_COMPACT_AFTER_DAYS = 14         # raw files older than this move into monthly segments
+RAW_FULL_TEXT_DAYS = 180            # after this, segments keep only the projected fields
+RAW_PROJECTED_FIELDS = ("id", "title", "description", "url", "publishedAt", "lang", "source")
+RAW_COMPACT_AFTER_DAILY = True      # compact after each scheduled daily run
+
+# Shared answer cache for the Interact chat (src/answer_cache.py)
+ANSWER_CACHE_PATH = "data/cache/answers.jsonl"
+ANSWER_CACHE_THRESHOLD = 0.8        # TF-IDF cosine between normalized questions
+ANSWER_CACHE_MAX_ENTRIES = 500
+
+# Pre-assembled analysis context for the dashboard (src/context_bundle.py)
+CONTEXT_BUNDLE_PATH = "data/cache/context_bundle.json"
+
+# Opt-in profiling of pipeline runs and dashboard jobs (src/profiling.py)
+PROFILE_ENABLED = os.getenv("PROFILE", "0") not in ("", "0")   # or --profile on the CLIs
+PROFILE_MEMORY = os.getenv("PROFILE", "") != "cpu"   # PROFILE=cpu skips tracemalloc (several times cheaper)
+PROFILE_DIR = "data/logs/profiles"
+PROFILE_TOP_N = 25                  # functions / allocation sites kept per stage
+PROFILE_TRACE_FRAMES = 1            # tracemalloc frames per allocation
+
+# Run deadline and degraded plans for the daily brief (src/deadline.py)
+DAILY_DEADLINE = os.getenv("DAILY_DEADLINE", "07:00")   # local time the brief should be out; "" = none
+DEADLINE_STAGE_SECONDS = {          # typical stage durations; time left is shared in proportion
+    "fetch": 15,
+    "rank": 2,
+    "enrich": 8,
+    "summarize": 30,
+    "save": 3,
+}
+DEADLINE_MIN_TIMEOUT_S = 5          # shortest timeout given to a request near the deadline
+# Degraded plans per stage, mildest first. A stage takes the last plan
+# whose "below" is above the run's pressure (time left / typical time of
+# the stages still ahead); "budget_step" names a BUDGET_STEPS label.
+DEADLINE_PLANS = {
+    "fetch": [
+        {"label": "fewer pages", "below": 0.75, "max_langs": 1},
+        {"label": "cached raw data", "below": 0.4, "max_langs": 1, "prefer_cache": True},
+    ],
+    "enrich": [
+        {"label": "cached full text only", "below": 0.75, "cached_only": True},
+    ],
+    "summarize": [
+        {"label": "smaller context", "below": 0.75, "budget_step": "shrink context"},
+        {"label": "fewer articles", "below": 0.5, "budget_step": "drop articles"},
+        {"label": "faster tier", "below": 0.3, "budget_step": "cheaper tier"},
+    ],
+}
+DEADLINE_LOG = "data/logs/deadline.jsonl"
+
+# Full-text enrichment of top-ranked articles (src/enrich.py)
+ENRICH_ENABLED = os.getenv("ENRICH_FULLTEXT", "0") not in ("", "0")
+ENRICH_BASE_URL = os.getenv("ENRICH_BASE_URL")   # stand-in publisher (`python -m src.replay serve`)
+ENRICH_TOP_N = 6                    # best-ranked curated articles enriched per report
+ENRICH_CACHE_PATH = "data/cache/fulltext.jsonl"   # one entry per URL, shared by every run
+ENRICH_WORKERS = 8                  # concurrent fetches = HTTP connection pool size
+ENRICH_PER_DOMAIN = 2               # concurrent fetches per publisher
+ENRICH_DOMAIN_INTERVAL_S = 1.0      # gap between request starts to one publisher
+ENRICH_TIMEOUT_S = 15
+ENRICH_MAX_CHARS = 12_000           # full text kept per article
+ENRICH_RETRY_FAILED_H = 24          # failed or blocked URLs are retried after this
+ENRICH_USER_AGENT = "VenezuelaWatch/1.0 (daily news digest)"
+COMPRESS_FULLTEXT_SENTENCES = 6     # compression limits for enriched articles (src/compress.py)
+COMPRESS_FULLTEXT_CHARS = 1100
@@ -0,0 +1,178 @@
+"""Pre-assembled analysis context for the dashboard.
+
+The Interact and Draft tabs send the same background to the model: the
+country context, the scenario summaries, the latest Weekly Watch and
+recent scenario reasoning. Instead of every UI worker reading and
+re-parsing those sources, the pipelines publish them once per run as
+one JSON bundle at ``CONTEXT_BUNDLE_PATH``::
+
+    {"version", "built", "tokens", "text",
+     "sections": [{"name", "title", "text", "tokens"}],
+     "sources": {path: mtime}}
+
+``version`` is a hash of the text; it keys caches built on the context
+(src/answer_cache.py). :func:`load` is read-only: it reads the published
+bundle once per change and, when a recorded source is newer, keeps
+serving it with a warning until the next pipeline run (or
+``python -m src.context_bundle``) republishes. Before anything has been
+published it assembles the bundle in memory.
+
+Usage::
+
+    python -m src.context_bundle   # (re)publish the bundle now
+"""
+
+import glob, hashlib, json, os
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from src import storage
+from src.config import CONTEXT_BUNDLE_PATH, SCENARIO_LOG_PATH
+from src.tokens import count_tokens
+
+CONTEXT_PATH = "data/context/venezuela_context.md"
+SCENARIOS_PATH = "data/context/venezuela_scenarios.json"
+WEEKLY_GLOB = "outputs/weekly/venezuela_week_*.md"
+SEPARATOR = "\n\n---\n\n"
+
+
+# -----------------------------------------------------
+# 1️⃣ SECTIONS
+# -----------------------------------------------------
+def load_recent_reasoning(log_path=SCENARIO_LOG_PATH, n_per_scenario=3):
+    if not os.path.exists(log_path):
+        return "No reasoning logs available yet."
+
+    scenario_notes = defaultdict(list)
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                if entry.get("assessment") == "carried_forward":
+                    continue  # repeats an earlier assessment
+                scenario_notes[entry["id"]].append(entry)
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+
+    # keep only last n entries per scenario
+    summary_texts = []
+    for sid, entries in scenario_notes.items():
+        # support both old "date" and new "report_generated_on" fields
+        def get_sort_date(e):
+            return e.get("date") or e.get("report_generated_on") or ""
+
+        entries = sorted(entries, key=get_sort_date, reverse=True)[:n_per_scenario]
+        for e in entries:
+            display_date = e.get("date") or e.get("report_generated_on") or "n/a"
+            summary_texts.append(
+                f"**{e['title']} ({display_date})** — {e['reasoning']} "
+                f"(→ plausibility: {e['plausibility']}, confidence: {e['updated_confidence']})"
+            )
+
+    return "\n\n".join(summary_texts)
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def build(context_path=CONTEXT_PATH, scenarios_path=SCENARIOS_PATH, weekly_glob=WEEKLY_GLOB,
+          log_path=SCENARIO_LOG_PATH):
+    """Assemble the bundle from its sources (nothing is written)."""
+    sections, sources = [], {}
+
+    def add(name, title, text, path=None):
+        body = f"{title}\n{text}" if title else text
+        sections.append({"name": name, "title": title, "text": body, "tokens": count_tokens(body)})
+        if path and os.path.exists(path):
+            sources[path] = os.path.getmtime(path)
+
+    # 1. Background context
+    if os.path.exists(context_path):
+        add("context", "", _read(context_path), context_path)
+
+    # 2. Scenarios (short summaries)
+    if os.path.exists(scenarios_path):
+        scenarios = json.loads(_read(scenarios_path))
+        text = "\n\n".join([f"**{s['title']}**: {s['narrative']}" for s in scenarios])
+        add("scenarios", "### Current Scenarios", text, scenarios_path)
+
+    # 3. Latest weekly report (the directory's mtime changes when a newer one lands)
+    weekly_files = sorted(glob.glob(weekly_glob))
+    if weekly_files:
+        add("weekly", "### Latest Weekly Report", _read(weekly_files[-1]), weekly_files[-1])
+    weekly_dir = os.path.dirname(weekly_glob)
+    if os.path.isdir(weekly_dir):
+        sources[weekly_dir] = os.path.getmtime(weekly_dir)
+
+    # 4. Recent reasoning logs
+    add("reasoning", "### Recent Analytical Reasoning", load_recent_reasoning(log_path), log_path)
+
+    text = SEPARATOR.join(s["text"] for s in sections)
+    return {
+        "version": hashlib.sha1(text.encode("utf-8")).hexdigest()[:16],
+        "built": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tokens": sum(s["tokens"] for s in sections),
+        "text": text,
+        "sections": sections,
+        "sources": sources,
+    }
+
+
+# -----------------------------------------------------
+# 2️⃣ PUBLISH / LOAD
+# -----------------------------------------------------
+def publish(path=CONTEXT_BUNDLE_PATH, **sources):
+    """Build and atomically write the bundle; called at the end of each pipeline run."""
+    bundle = build(**sources)
+    storage.atomic_write_json(path, bundle, indent=None)
+    print(f"📦 Context bundle {bundle['version']} ({bundle['tokens']} tokens) → {path}")
+    return bundle
+
+
+_cache = {}
+
+def stale_sources(bundle):
+    """Sources the bundle was built from that changed since (or disappeared)."""
+    changed = []
+    for src, mtime in bundle.get("sources", {}).items():
+        try:
+            if os.path.getmtime(src) > mtime:
+                changed.append(src)
+        except OSError:
+            changed.append(src)
+    return changed
+
+
+def stale(bundle):
+    return bool(stale_sources(bundle))
+
+
+def load(path=CONTEXT_BUNDLE_PATH):
+    """The published bundle, read once per change; never writes (UI workers call this).
+
+    A stale bundle is still served, with a warning; before the first
+    publish the bundle is assembled in memory.
+    """
+    key = (os.path.abspath(path), os.path.getmtime(path)) if os.path.exists(path) else None
+    if _cache.get("key") != key or "bundle" not in _cache:
+        if key is None:
+            bundle = build()
+            print(f"⚠️ No context bundle at {path} yet; using one assembled in memory.")
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                bundle = json.load(f)
+        _cache.update(key=key, bundle=bundle, warned=False)
+    changed = stale_sources(_cache["bundle"])
+    if changed and not _cache["warned"]:
+        print(f"⚠️ Context bundle {_cache['bundle']['version']} is stale ({', '.join(changed)} changed); "
+              "serving it until the next pipeline run republishes.")
+        _cache["warned"] = True
+    return _cache["bundle"]
+
+
+if __name__ == "__main__":
+    bundle = publish()
+    for s in bundle["sections"]:
+        print(f"  {s['name']:<10} {s['tokens']:>6} tokens")
@@ -1,16 +1,20 @@
 import os, json, time, requests
-from openai import OpenAI
-from src.config import GNEWS_API_KEY, OPENAI_API_KEY, QUERY, LANGS
+from src.config import GNEWS_API_KEY, GNEWS_BASE_URL, GNEWS_REQUEST_INTERVAL_S, QUERY, LANGS, ENRICH_ENABLED, LOCAL_ZONE, local_now
+from src import (
+    archive, budget, compress, context_bundle, deadline, enrich, llm, profiling, relevance, render, search,
+    storage, threads,
+)
 from datetime import datetime, timedelta, timezone
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Reused across fetches so long-running callers (src/scheduler.py) keep
+# their HTTP connections warm between runs.
+SESSION = requests.Session()
 
 # -----------------------------------------------------
 # 🌍 LOCAL TIME SETTINGS
 # -----------------------------------------------------
-# New York: -5 in winter (EST), -4 in summer (EDT)
-LOCAL_OFFSET_HOURS = -5  # adjust seasonally if needed
-LOCAL_TZ = timezone(timedelta(hours=LOCAL_OFFSET_HOURS))
+# LOCAL_TZ_NAME in src/config.py (default America/New_York, DST-aware)
+LOCAL_TZ = LOCAL_ZONE
 
 # -----------------------------------------------------
 # Helper: calculate which date should be reported today
@@ -52,13 +56,27 @@ def time_window_for_date(report_date):
 # -----------------------------------------------------
 # 1️⃣ FETCH: get articles for the last completed 24h window
 # -----------------------------------------------------
-def fetch_articles(report_date=None):
-    print("⏳ Fetching daily news (via GNews)...")
-    BASE = "https://gnews.io/api/v4/search"
-    results = []
+def fetch_articles(report_date=None, max_langs=None, prefer_cache=False):
+    """Fetch the day's articles; return ``(articles, "YYYY-MM-DD")``.
 
+    Runs short of time (src/deadline.py) may query only the first
+    ``max_langs`` languages, or with ``prefer_cache`` reuse raw articles
+    already on disk (e.g. from the intraday refresh) without fetching.
+    """
     # Determine which date to generate a report for (default: today's window)
     report_date = report_date or determine_report_date()
+    stem = f"news_{report_date}"
+
+    if prefer_cache:
+        cached = archive.load(stem)
+        if cached:
+            print(f"♻️ Using {len(cached)} cached articles for {report_date} (not fetched).")
+            return cached, report_date.isoformat()
+        deadline.degrade("no cached raw data", reason="fetched instead")
+
+    print("⏳ Fetching daily news (via GNews)...")
+    BASE = f"{GNEWS_BASE_URL}/search"
+    results, failed = [], []
 
     # Use the full 24h local calendar day window
     start_local, end_local = time_window_for_date(report_date)
@@ -71,12 +89,12 @@ def fetch_articles(report_date=None):
     to_date = end_time.isoformat().replace("+00:00", "Z")
 
     # Log for visibility when backfilling multiple days
-    now_local = datetime.now(timezone.utc).astimezone(LOCAL_TZ)
+    now_local = local_now()
     print(f"📆 Local now: {now_local}")
     print(f"🗓️ Report date: {report_date}")
     print(f"🕒 Time window (UTC): {from_date} → {to_date}")
 
-    for lang in LANGS:
+    for lang in LANGS[:max_langs] if max_langs else LANGS:
         params = {
             "apikey": GNEWS_API_KEY,
             "q": QUERY,
@@ -86,7 +104,13 @@ def fetch_articles(report_date=None):
             "max": 10,  # Free-tier limit
         }
 
-        r = requests.get(BASE, params=params, timeout=30)
+        try:
+            r = SESSION.get(BASE, params=params, timeout=deadline.timeout(30))
+        except requests.RequestException as e:
+            print(f"⚠️ {lang} fetch failed: {type(e).__name__}")
+            deadline.degrade(f"{lang} fetch failed", reason=type(e).__name__)
+            failed.append(lang)
+            continue
         if r.status_code >= 400:
             print(f"⚠️ Error {r.status_code}: {r.text}")
             continue
@@ -97,12 +121,16 @@ def fetch_articles(report_date=None):
             a["lang"] = lang
         results.extend(articles)
 
-        time.sleep(1.2)  # respect rate limit
+        time.sleep(GNEWS_REQUEST_INTERVAL_S)  # respect rate limit
 
-    os.makedirs("data/raw", exist_ok=True)
-    raw_path = f"data/raw/news_{report_date}.json"
-    with open(raw_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    if failed and not results:
+        cached = archive.load(stem)
+        if cached:
+            deadline.degrade("cached raw data", articles=len(cached), reason="every fetch failed")
+            return cached, report_date.isoformat()
+
+    raw_path = f"data/raw/{stem}.json"
+    storage.atomic_write_json(raw_path, results)
     print(f"🔎 Total articles fetched: {len(results)}")
     print(f"✅ Fetched articles saved → {raw_path}")
 
@@ -115,29 +143,30 @@ def fetch_articles(report_date=None):
 # -----------------------------------------------------
 KEYWORDS = ["venezuela", "caracas", "maduro", "pdvsa", "chevron", "opposition", "sanction"]
 
-def clean_rank(raw):
+def rank_articles(raw, keywords=KEYWORDS):
+    """Relevant articles, best first (learned model if trained, else ``keywords``)."""
+    # Prefer the learned relevance model once one has been trained
+    # (python -m src.relevance train); otherwise use the keyword rules.
+    model = relevance.load_model()
+    if model is not None:
+        return relevance.filter_rank(raw, model)
     curated = []
     for r in raw:
-        title = r.get("title") or ""
-        desc = r.get("description") or ""
-        content = r.get("content") or ""
-        text = (title + " " + desc + " " + content).lower()
-
-        if "venezuela" not in text:
+        score = relevance.rule_score(r, keywords)
+        if score is None:
             continue
-        if not any(k in text for k in KEYWORDS):
-            continue
-        if len(desc) < 40:
-            continue
-
-        r["_score"] = sum(text.count(k) for k in KEYWORDS)
+        r["_score"] = score
         curated.append(r)
-
     curated.sort(key=lambda x: x["_score"], reverse=True)
-    os.makedirs("data/curated", exist_ok=True)
-    path = "data/curated/venezuela_latest.json"
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(curated, f, ensure_ascii=False, indent=2)
+    return curated
+
+def clean_rank(raw, report_date=None):
+    curated = rank_articles(raw)
+
+    # One partition per report date, so an intraday refresh and a
+    # backfill running at the same time do not overwrite each other.
+    day = str(report_date or determine_report_date())
+    path = storage.save_curated("daily", day, curated)
     print(f"✅ Curated {len(curated)} relevant articles → {path}")
     return curated
 
@@ -145,40 +174,86 @@ def clean_rank(raw):
 # -----------------------------------------------------
 # 3️⃣ SUMMARIZE: generate the daily brief
 # -----------------------------------------------------
-def build_context(items, cap_chars=6000):
-    chunks, used = [], 0
-    for it in items:
-        title = it.get("title","")
-        src   = it.get("url") or ""
-        desc  = it.get("description") or ""
-        content = it.get("content") or ""
-        piece = f"- {title} [{src}]\n{desc}\n{content}\n"
-        if used + len(piece) > cap_chars:
-            break
-        chunks.append(piece)
-        used += len(piece)
-    return "\n".join(chunks)
-
-def summarize(curated):
-    ctx = build_context(curated)
+def article_piece(it, body=None):
+    # Extractive compression keeps the informative sentences and drops
+    # the ones that repeat the title (no API call).
+    title = it.get("title","")
+    src   = it.get("url") or ""
+    body  = compress.compress_article(it) if body is None else body
+    return f"- {title} [{src}]\n{body}\n"
+
+SUMMARY_SYSTEM = "You summarize daily news factually and concisely."
+SUMMARY_TEMPERATURE = 0.3
+
+def summary_messages(curated, day, prepared, cap_chars=6000):
+    """Chat messages for the daily brief (also submitted in batches by src/batch.py).
+
+    ``prepared`` is ``threads.prepare(curated, day)``, computed once per
+    run; building the messages writes nothing, so budget plans can call
+    this repeatedly.
+    """
+    records, assignments, index = prepared
+    ctx = threads.thread_context(curated, assignments, index, day, records, article_piece, cap_chars=cap_chars)
     prompt = f"""
 Summarize only verified factual developments about Venezuela from the following articles.
 Avoid speculation, background, or analysis.
+Articles are grouped into storylines. For NEW storylines, state briefly what happened.
+For CONTINUING storylines, report only what is new today; do not re-explain their background.
 Write a concise 180–220 word daily update.
 Then list 3-5 bullet points under **Key Developments Today**.
 
 Articles:
 {ctx}
 """
-    resp = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role":"system","content":"You summarize daily news factually and concisely."},
-            {"role":"user","content":prompt}
-        ],
-        temperature=0.3,
+    return [
+        {"role":"system","content":SUMMARY_SYSTEM},
+        {"role":"user","content":prompt}
+    ]
+
+def summarize(curated, report_date=None, budget_step=None):
+    # One cached fact record per article (extracted once, reused by the
+    # weekly job; articles without one fall back to raw text), and the
+    # day's articles grouped into persistent story threads so ongoing
+    # storylines are reported as deltas rather than re-explained.
+    day = str(report_date or determine_report_date())
+    prepared = threads.prepare(curated, day)
+    # Over budget, the governor shrinks the 6000-char context and then
+    # keeps only the top-ranked articles (curated is sorted by score).
+    # A run short of time starts at a later step (``budget_step``).
+    return llm.complete_within_budget(
+        "daily_summary",
+        lambda context, articles: summary_messages(budget.keep(curated, articles), day, prepared, int(6000 * context)),
+        start=budget_step,
+        temperature=SUMMARY_TEMPERATURE,
+        validate=validate_daily_summary,
     )
-    return resp.choices[0].message.content
+
+
+def validate_daily_summary(text):
+    """Reject briefs missing the Key Developments section or its 3-5 bullets."""
+    if "key developments today" not in text.lower():
+        raise llm.LLMValidationError("missing 'Key Developments Today' section")
+    tail = text.lower().split("key developments today", 1)[1]
+    bullets = [l for l in tail.splitlines() if l.strip().startswith(("-", "*", "•")) or l.strip()[:2].rstrip(".").isdigit()]
+    if len(bullets) < 3:
+        raise llm.LLMValidationError(f"expected 3-5 key development bullets, got {len(bullets)}")
+
+
+def save_report(report_date, summary, daily_dir="outputs/daily", meta=None):
+    """Write the brief, its pre-rendered page and its search entry; return the path.
+
+    ``meta`` (e.g. the deadline trade-offs, src/deadline.py) goes to a
+    ``.meta.json`` sidecar next to the brief.
+    """
+    out_path = f"{daily_dir}/venezuela_{report_date}.md"
+    storage.atomic_write_text(out_path, summary)
+    if meta is not None:
+        storage.atomic_write_json(deadline.meta_path(out_path), meta)
+
+    print(f"\n✅ Daily summary saved → {out_path}")
+    render.write_html(out_path, summary)
+    search.add_reports([out_path])
+    return out_path
 
 
 # -----------------------------------------------------
@@ -210,14 +285,28 @@ def latest_report_date(daily_dir="outputs/daily"):
 # -----------------------------------------------------
 # 4️⃣ MAIN PIPELINE
 # -----------------------------------------------------
-if __name__ == "__main__":
+STAGES = ["fetch", "rank", "enrich", "summarize", "save"]
+
+@profiling.profiled("daily", whole=False)
+def run_daily(last_saved=None, expected_report=None, due=None):
+    """Generate every missing daily report up to the expected date.
+
+    ``last_saved`` lets long-running callers skip the directory scan when
+    they already know the latest report. With ``due`` (an aware datetime
+    or seconds from now) the run degrades its stages as needed to finish
+    by then and records every trade-off in the reports' metadata
+    (src/deadline.py). Returns the list of dates written; stops early
+    when a day has no usable articles.
+    """
+
     os.makedirs("outputs/daily", exist_ok=True)
 
     # 1) Identify the most recent saved report (if any)
-    last_saved = latest_report_date()
+    if last_saved is None:
+        last_saved = latest_report_date()
 
     # 2) Determine which report date we are expected to generate today
-    expected_report = determine_report_date()
+    expected_report = expected_report or determine_report_date()
 
     # 3) If there is a gap, backfill each missing date in order
     if last_saved is None:
@@ -225,29 +314,68 @@ if __name__ == "__main__":
     else:
         next_date = last_saved + timedelta(days=1)
 
-    # 4) Iterate from the first missing date through the expected date
+    # 4) Iterate from the first missing date through the expected date;
+    #    every remaining day is on the deadline's critical path.
+    generated = []
     current = next_date
-    while current <= expected_report:
-        print(f"\n🚀 Generating report for {current}...")
-        articles, report_date = fetch_articles(report_date=current)
-
-        if not articles:
-            print(f"⚠️ No articles found for {report_date}, aborting.")
-            raise SystemExit(0)
-
-        curated = clean_rank(articles)
-        if not curated:
-            print(f"⚠️ No curated Venezuela articles for {report_date}, aborting.")
-            raise SystemExit(0)
+    days = max((expected_report - next_date).days + 1, 0)
+    stages = [s for s in STAGES if s != "enrich" or ENRICH_ENABLED]
+    with deadline.run("daily", due, plan=stages * days):
+        while current <= expected_report:
+            print(f"\n🚀 Generating report for {current}...")
+            with profiling.stage("fetch", current), deadline.stage("fetch", current) as plan:
+                articles, report_date = fetch_articles(current, plan.get("max_langs"), plan.get("prefer_cache", False))
+
+            if not articles:
+                print(f"⚠️ No articles found for {report_date}, aborting.")
+                break
+
+            with profiling.stage("rank", current), deadline.stage("rank", current):
+                curated = clean_rank(articles, report_date)
+            if not curated:
+                print(f"⚠️ No curated Venezuela articles for {report_date}, aborting.")
+                break
+
+            if ENRICH_ENABLED:
+                # Full text for the top-ranked articles (src/enrich.py)
+                with profiling.stage("enrich", current), deadline.stage("enrich", current) as plan:
+                    enrich.enrich(curated, cached_only=plan.get("cached_only", False))
+
+            with profiling.stage("summarize", current), deadline.stage("summarize", current, task="daily_summary") as plan:
+                with budget.run(f"daily {report_date}"):
+                    summary = summarize(curated, report_date, plan.get("budget_step"))
+            with profiling.stage("save", current), deadline.stage("save", current):
+                meta = deadline.report(current)
+                if meta is not None:
+                    meta.update(articles=len(articles), curated=len(curated))
+                save_report(report_date, summary, meta=meta)
+                search.add_articles(curated)
+            print("\n--- Preview ---\n")
+            print(summary[:800])
+
+            generated.append(current)
+            current += timedelta(days=1)
+
+    if generated:
+        context_bundle.publish()
+    return generated
 
-        summary = summarize(curated)
 
-        out_path = f"outputs/daily/venezuela_{report_date}.md"
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(summary)
-
-        print(f"\n✅ Daily summary saved → {out_path}")
-        print("\n--- Preview ---\n")
-        print(summary[:800])
-
-        current += timedelta(days=1)
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate missing daily briefs.")
+    parser.add_argument("--since", type=lambda s: datetime.fromisoformat(s).date(),
+                        help="first report date to (re)generate, e.g. for a backfill")
+    parser.add_argument("--until", type=lambda s: datetime.fromisoformat(s).date(),
+                        help="last report date (default: yesterday)")
+    parser.add_argument("--profile", action="store_true", help="save CPU/memory profiles per stage (src/profiling.py)")
+    parser.add_argument("--deadline", metavar="HH:MM", help="local time to finish by; stages degrade to make it")
+    parser.add_argument("--time-budget", type=float, metavar="SECONDS", help="like --deadline, in seconds from now")
+    args = parser.parse_args()
+    if args.profile:
+        profiling.enable()
+    run_daily(
+        last_saved=args.since - timedelta(days=1) if args.since else None,
+        expected_report=args.until,
+        due=args.time_budget if args.time_budget is not None else deadline.due_today(args.deadline),
+    )
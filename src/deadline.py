@@ -0,0 +1,217 @@
+"""Run-level deadlines with per-stage time budgets and degraded plans.
+
+The daily brief is due by ``DAILY_DEADLINE`` (local time). A run opened
+with :func:`run` knows its deadline and its critical path: the stages
+still ahead of it, in order, each with a typical duration from
+``DEADLINE_STAGE_SECONDS``. When a :func:`stage` starts, the run's
+pressure is the time left divided by the typical time of the stages
+still ahead (this one included). Below 1 the run is behind, and the
+stage takes the last of its ``DEADLINE_PLANS`` whose ``below`` threshold
+is above the pressure: fewer GNews requests, cached raw data, a smaller
+prompt, the cheaper tier. Plans that would change nothing for the
+stage's model task (the cheaper tier of a task already on the lowest
+one) are passed over, so no trade-off is recorded that was not made.
+Each stage also gets its share of the time left as a budget;
+:func:`timeout` caps HTTP and model requests by it, and model retries
+and escalations that would overrun it are skipped (src/llm.py).
+
+Every plan other than the full one, and every shortcut a stage takes
+(:func:`degrade`), is recorded. :func:`report` returns them for the
+report's metadata sidecar (``venezuela_<date>.meta.json``) and each run
+is summarized in ``DEADLINE_LOG``. Outside a run every hook is a no-op.
+
+Usage::
+
+    python -m src.daily_pipeline --deadline 07:00   # or --time-budget 600
+"""
+
+import contextlib, contextvars, json, math, os, time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from src import budget, storage
+from src.config import (
+    DEADLINE_STAGE_SECONDS, DEADLINE_PLANS, DEADLINE_MIN_TIMEOUT_S, DEADLINE_LOG, LOCAL_TZ_NAME,
+    BUDGET_STEPS, TASK_TIERS, TIER_ORDER,
+)
+
+FULL_PLAN = {"label": "full"}
+_run = contextvars.ContextVar("deadline_run", default=None)
+
+
+def due_today(hhmm, now=None, zone=LOCAL_TZ_NAME):
+    """Today's ``hhmm`` (local) as an aware datetime; ``None`` if unset or already past."""
+    if not hhmm:
+        return None
+    local = (now or datetime.now(timezone.utc)).astimezone(ZoneInfo(zone))
+    hour, minute = map(int, hhmm.split(":"))
+    due = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if due <= local:
+        print(f"⚠️ Deadline {hhmm} has already passed; running the full plan.")
+        return None
+    return due
+
+
+def meta_path(report_path):
+    """Metadata sidecar of a report (``venezuela_<date>.md`` → ``venezuela_<date>.meta.json``)."""
+    return os.path.splitext(report_path)[0] + ".meta.json"
+
+
+def load_meta(report_path):
+    try:
+        with open(meta_path(report_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+# -----------------------------------------------------
+# 1️⃣ RUNS AND STAGES
+# -----------------------------------------------------
+def typical(stages):
+    return sum(DEADLINE_STAGE_SECONDS.get(s, 0) for s in stages)
+
+
+@contextlib.contextmanager
+def run(name, due=None, plan=(), clock=time.monotonic):
+    """Time the block against ``due`` (an aware datetime, or seconds from now).
+
+    ``plan`` lists the stages the run expects to go through, in order.
+    Yields the run state, or ``None`` (every hook a no-op) without ``due``.
+    """
+    if due is None or _run.get() is not None:
+        yield _run.get()
+        return
+    if isinstance(due, datetime):
+        seconds = (due - datetime.now(timezone.utc)).total_seconds()
+    else:
+        seconds, due = due, datetime.now(timezone.utc) + timedelta(seconds=due)
+    state = {"name": name, "due": due.isoformat(timespec="seconds"), "end": clock() + seconds, "clock": clock,
+             "ahead": list(plan), "stages": [], "current": None}
+    print(f"⏳ {name}: due {state['due']} ({seconds:.0f}s for {typical(plan)}s of typical work)")
+    token = _run.set(state)
+    try:
+        yield state
+    finally:
+        _run.reset(token)
+        late = clock() - state["end"]
+        log({"event": "run", "run": name, "due": state["due"], "on_time": late <= 0, "late_s": round(max(late, 0), 3),
+             "degraded": sum(1 for s in state["stages"] if s["degradations"]),
+             "stages": [{k: s[k] for k in ("stage", "key", "plan", "budget_s", "used_s")} for s in state["stages"]]})
+
+
+def active():
+    return _run.get() is not None
+
+
+def left():
+    """Seconds until the run's deadline (infinite outside a run)."""
+    state = _run.get()
+    return math.inf if state is None else state["end"] - state["clock"]()
+
+
+def stage_left():
+    """Seconds left in the current stage's budget (the run's, between stages)."""
+    state = _run.get()
+    if state is None:
+        return math.inf
+    if state["current"] is None:
+        return left()
+    return state["current"]["_end"] - state["clock"]()
+
+
+def timeout(default):
+    """``default`` capped by the stage budget, but never below ``DEADLINE_MIN_TIMEOUT_S``."""
+    return min(default, max(stage_left(), DEADLINE_MIN_TIMEOUT_S))
+
+
+def changes(plan, task):
+    """False if ``plan`` would leave ``task``'s call as it is (a cheaper tier below the lowest)."""
+    step = next((s for s in BUDGET_STEPS if s["label"] == plan.get("budget_step")), None)
+    if task is None or step is None or not step["downgrade"]:
+        return True
+    base = TASK_TIERS.get(task, TIER_ORDER[-1])
+    return budget.cheaper(base) != base
+
+
+def choose(name, pressure, task=None):
+    chosen = FULL_PLAN
+    for plan in DEADLINE_PLANS.get(name, []):
+        if pressure < plan["below"] and changes(plan, task):
+            chosen = plan
+    return chosen
+
+
+@contextlib.contextmanager
+def stage(name, key=None, task=None):
+    """Run stage ``name`` of the current run; yields the plan to follow (``{"label": "full"}`` on time).
+
+    ``task`` is the model task the stage calls, if any (see :func:`changes`).
+    """
+    state = _run.get()
+    if state is None:
+        yield dict(FULL_PLAN)
+        return
+    if name in state["ahead"]:
+        state["ahead"].remove(name)
+    now = state["clock"]()
+    time_left, expected = state["end"] - now, typical([name] + state["ahead"])
+    pressure = time_left / expected if expected else math.inf
+    share = DEADLINE_STAGE_SECONDS.get(name, 0) / expected if expected else 1.0
+    allowance = max(time_left, 0) * share
+    plan = choose(name, pressure, task)
+    entry = {"stage": name, "key": None if key is None else str(key), "plan": plan["label"],
+             "pressure": round(pressure, 3) if pressure != math.inf else None, "budget_s": round(allowance, 3),
+             "used_s": None, "degradations": [], "_end": now + allowance}
+    state["stages"].append(entry)
+    outer, state["current"] = state["current"], entry
+    if plan is not FULL_PLAN:
+        degrade(plan["label"], reason=f"{max(time_left, 0):.0f}s left for {expected}s of typical work")
+    try:
+        yield dict(plan)
+    finally:
+        entry["used_s"] = round(state["clock"]() - now, 3)
+        state["current"] = outer
+
+
+def degrade(what, **detail):
+    """Record a quality trade-off taken by the current stage."""
+    state = _run.get()
+    if state is None or state["current"] is None:
+        return
+    entry = state["current"]
+    entry["degradations"].append({"what": what, **detail})
+    print(f"⏳ {entry['stage']}: {what}" + (f" ({detail['reason']})" if "reason" in detail else ""))
+
+
+# -----------------------------------------------------
+# 2️⃣ REPORTING
+# -----------------------------------------------------
+def status():
+    """Time left, the stages still ahead and the slack over their typical time."""
+    state = _run.get()
+    if state is None:
+        return None
+    time_left = state["end"] - state["clock"]()
+    return {"due": state["due"], "left_s": round(time_left, 3), "ahead": list(state["ahead"]),
+            "slack_s": round(time_left - typical(state["ahead"]), 3)}
+
+
+def report(key):
+    """Deadline metadata for one report (stages and trade-offs with this ``key``), or ``None`` outside a run."""
+    state = _run.get()
+    if state is None:
+        return None
+    key = str(key)
+    stages = [s for s in state["stages"] if s["key"] == key]
+    return {
+        **status(),
+        "on_time": state["end"] >= state["clock"](),
+        "degraded": any(s["degradations"] for s in stages),
+        "stages": [{k: s[k] for k in ("stage", "plan", "pressure", "budget_s", "used_s")} for s in stages],
+        "degradations": [{"stage": s["stage"], **d} for s in stages for d in s["degradations"]],
+    }
+
+
+def log(entry, path=DEADLINE_LOG):
+    storage.append_jsonl(path, [{"ts": datetime.now(timezone.utc).isoformat(timespec="seconds"), **entry}])
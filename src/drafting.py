@@ -0,0 +1,187 @@
+"""Targeted, edit-based refinement of Draft tab documents.
+
+Instead of asking the model to rewrite a whole background note for a
+one-line tweak, the draft is split into numbered blocks (headings,
+paragraphs, bullets, numbered items). The model returns a short JSON
+list of edits against those numbers, which is applied locally and shown
+as a diff. The model can answer ``{"mode": "rewrite"}`` when the
+instructions call for sweeping changes; callers then fall back to the
+full-rewrite prompt.
+"""
+
+import difflib, json, re
+from collections import defaultdict
+
+BLOCK_START = re.compile(r"^\s*(#{1,6}\s|[-*•]\s|\d+[.)]\s)")
+HEADING = re.compile(r"^\s*#{1,6}\s")
+LIST_ITEM = re.compile(r"^\s*([-*•]\s|\d+[.)]\s)")
+
+# Presets for side-by-side variants: same context, different sampling
+# temperature and instruction emphasis.
+DRAFT_VARIANTS = [
+    {"label": "Balanced", "temperature": 0.5, "emphasis": ""},
+    {"label": "Concise", "temperature": 0.4,
+     "emphasis": "Prioritise brevity: the shortest version that still covers the essential facts."},
+    {"label": "Risk-focused", "temperature": 0.6,
+     "emphasis": "Give particular weight to risks, uncertainties and implications for the United Nations."},
+    {"label": "Alternative framing", "temperature": 0.9,
+     "emphasis": "Try a noticeably different structure and framing from a standard note, within the same style."},
+]
+
+EDIT_INSTRUCTIONS = """
+Return ONLY a JSON object, no markdown fences.
+
+For targeted changes, return:
+{"mode": "edits", "edits": [
+  {"op": "replace", "target": BLOCK_NUMBER, "text": "new markdown for that block"},
+  {"op": "insert_after", "target": BLOCK_NUMBER_OR_0, "text": "markdown for the new block(s)"},
+  {"op": "delete", "target": BLOCK_NUMBER}
+]}
+Block numbers refer to the [n] markers in the current draft; do not include the markers in "text".
+Use "insert_after" with target 0 to insert at the very beginning. Only list blocks that change.
+
+If the instructions require restructuring most of the draft, return {"mode": "rewrite"} instead.
+"""
+
+
+# -----------------------------------------------------
+# 1️⃣ SPLIT / NUMBER / JOIN
+# -----------------------------------------------------
+def split_blocks(text):
+    """Split markdown into blocks: headings, bullets, numbered items, paragraphs."""
+    blocks, current = [], []
+
+    def flush():
+        if current:
+            blocks.append("\n".join(current))
+            current.clear()
+
+    for line in (text or "").splitlines():
+        if not line.strip():
+            flush()
+            continue
+        if BLOCK_START.match(line):
+            flush()
+        current.append(line)
+        if HEADING.match(line):
+            flush()
+    flush()
+    return blocks
+
+
+def number_blocks(blocks):
+    return "\n\n".join(f"[{i}] {b}" for i, b in enumerate(blocks, 1))
+
+
+def join_blocks(blocks):
+    """Re-assemble blocks, keeping consecutive list items in one tight list."""
+    out = ""
+    for i, block in enumerate(blocks):
+        if i == 0:
+            out = block
+            continue
+        tight = LIST_ITEM.match(block) and LIST_ITEM.match(blocks[i - 1].splitlines()[-1])
+        out += ("\n" if tight else "\n\n") + block
+    return out
+
+
+# -----------------------------------------------------
+# 2️⃣ PARSE / APPLY EDITS
+# -----------------------------------------------------
+def parse_edit_response(raw):
+    """Parse the model's JSON answer; return ``("rewrite", None)`` or ``("edits", [...])``.
+
+    Raises ``ValueError`` when the answer is not usable.
+    """
+    text = (raw or "").strip()
+    if text.startswith("```") and text.endswith("```"):
+        text = text[3:-3].strip()
+        if text.lower().startswith("json"):
+            text = text[4:].strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Edit response is not JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError("Edit response must be a JSON object")
+    if data.get("mode") == "rewrite":
+        return "rewrite", None
+    edits = data.get("edits")
+    if not isinstance(edits, list) or not edits:
+        raise ValueError("Edit response has no edits")
+    return "edits", edits
+
+
+def apply_edits(blocks, edits):
+    """Apply replace / insert_after / delete edits against 1-based block numbers."""
+    n = len(blocks)
+    replaced, deleted, inserts = {}, set(), defaultdict(list)
+    for e in edits:
+        op, target = e.get("op"), e.get("target")
+        lowest = 0 if op == "insert_after" else 1
+        if not isinstance(target, int) or not lowest <= target <= n:
+            raise ValueError(f"Invalid edit target: {target!r}")
+        if op == "delete":
+            deleted.add(target)
+            continue
+        text = (e.get("text") or "").strip()
+        if not text:
+            raise ValueError(f"Edit {op} on block {target} has no text")
+        if op == "replace":
+            replaced[target] = text
+        elif op == "insert_after":
+            inserts[target].append(text)
+        else:
+            raise ValueError(f"Unknown edit op: {op!r}")
+
+    out = list(inserts[0])
+    for i, block in enumerate(blocks, 1):
+        if i not in deleted:
+            out.append(replaced.get(i, block))
+        out.extend(inserts[i])
+    return out
+
+
+def draft_diff(old, new):
+    """Unified line diff between two drafts, for display."""
+    return "\n".join(
+        difflib.unified_diff(old.splitlines(), new.splitlines(), "before", "after", lineterm="", n=1)
+    )
+
+
+# -----------------------------------------------------
+# 3️⃣ PROMPTS
+# -----------------------------------------------------
+def variant_messages(messages, variant):
+    """Return a copy of a drafting prompt with the variant's emphasis appended."""
+    out = [dict(m) for m in messages]
+    if variant.get("emphasis"):
+        out[-1]["content"] += f"\n\nEmphasis for this version: {variant['emphasis']}\n"
+    return out
+
+
+def edit_messages(system_msg, style_label, draft, instructions, topic, context_text=""):
+    """Build the targeted-edit prompt.
+
+    Context goes into the system prefix so it is shared (and cacheable)
+    across successive refinements of the same draft.
+    """
+    system = system_msg
+    if context_text:
+        system += f"\n\nContext to ground any new content:\n{context_text}"
+    user_prompt = f"""
+You are refining an existing {style_label} with targeted edits.
+
+Meeting information:
+{topic}
+
+Current draft (blocks are numbered):
+{number_blocks(split_blocks(draft))}
+
+User instructions for revision:
+{instructions}
+{EDIT_INSTRUCTIONS}"""
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user_prompt},
+    ]
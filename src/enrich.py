@@ -0,0 +1,333 @@
+"""Full-text enrichment of the best-ranked articles.
+
+GNews ``content`` is a ~260-character excerpt ending in ``... [N chars]``,
+so prompts are built from stubs and the model leans on descriptions.
+This optional stage (``ENRICH_FULLTEXT=1``) fetches the publisher pages
+of the ``ENRICH_TOP_N`` best-ranked curated articles only, extracts
+their main text and attaches it as ``full_text``. Compression
+(src/compress.py) then gives those articles a larger share of the
+prompt, so the same characters hold fewer but richer articles, and fact
+extraction (src/facts.py) reads the full text too.
+
+- Fetches run on ``ENRICH_WORKERS`` threads sharing one session whose
+  connection pool has as many slots.
+- Per publisher, at most ``ENRICH_PER_DOMAIN`` requests are in flight,
+  request starts are ``ENRICH_DOMAIN_INTERVAL_S`` apart and
+  ``robots.txt`` is honoured.
+- The main text is the paragraphs of the page's ``<article>`` (else
+  ``<main>``, else the whole page) outside navigation, scripts and
+  boilerplate blocks; only the standard library's HTML parser is used.
+- Results, failures included, are cached by URL in
+  ``ENRICH_CACHE_PATH``, so each URL is fetched once for the daily and
+  weekly runs and the dashboard search; failed or blocked URLs are
+  retried after ``ENRICH_RETRY_FAILED_H`` hours.
+
+``ENRICH_BASE_URL`` sends every request to a stand-in instead
+(``python -m src.replay serve`` starts one that serves the recorded
+articles as pages).
+
+Usage::
+
+    ENRICH_FULLTEXT=1 python -m src.daily_pipeline
+    python -m src.enrich fetch <url>   # print the main text of one page
+    python -m src.enrich stats
+"""
+
+import argparse, contextlib, json, os, re, threading, time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src import deadline, storage
+from src.config import (
+    ENRICH_BASE_URL, ENRICH_TOP_N, ENRICH_CACHE_PATH, ENRICH_WORKERS, ENRICH_PER_DOMAIN, ENRICH_DOMAIN_INTERVAL_S,
+    ENRICH_TIMEOUT_S, ENRICH_MAX_CHARS, ENRICH_RETRY_FAILED_H, ENRICH_USER_AGENT,
+)
+
+MIN_PARAGRAPH_CHARS = 40    # shorter blocks are captions, bylines, buttons
+MIN_TEXT_CHARS = 500        # less than this is no better than the GNews excerpt
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form",
+             "figure", "figcaption", "button", "iframe"}
+BOILERPLATE = re.compile(r"related|recommend|newsletter|subscribe|share|social|comment|promo|advert|cookie|"
+                         r"paywall|sidebar|breadcrumb|author-bio|more-stories", re.IGNORECASE)
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+TEXT_TAGS = {"p", "blockquote"}
+
+
+# -----------------------------------------------------
+# 1️⃣ MAIN TEXT
+# -----------------------------------------------------
+class _MainText(HTMLParser):
+    """Collect paragraphs with the containers they sit in."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []          # [tag, skipped]
+        self.skipping = 0
+        self.buffer = None
+        self.paragraphs = []     # (text, in_article, in_main)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        if tag in TEXT_TAGS:
+            self._flush()
+            self.buffer = []
+        marker = " ".join(v or "" for k, v in attrs if k in ("class", "id", "role"))
+        hidden = any(k == "hidden" or (k == "aria-hidden" and v == "true") for k, v in attrs)
+        skipped = tag in SKIP_TAGS or hidden or bool(marker and BOILERPLATE.search(marker))
+        self.stack.append([tag, skipped])
+        self.skipping += skipped
+
+    def handle_endtag(self, tag):
+        if tag in TEXT_TAGS:
+            self._flush()
+        if not any(t == tag for t, _ in self.stack):
+            return   # stray end tag
+        while self.stack:
+            t, skipped = self.stack.pop()
+            self.skipping -= skipped
+            if t == tag:
+                break
+
+    def handle_data(self, data):
+        if self.buffer is not None and not self.skipping:
+            self.buffer.append(data)
+
+    def _flush(self):
+        if self.buffer is None:
+            return
+        text = re.sub(r"\s+", " ", "".join(self.buffer)).strip()
+        self.buffer = None
+        if len(text) >= MIN_PARAGRAPH_CHARS:
+            tags = {t for t, _ in self.stack}
+            self.paragraphs.append((text, "article" in tags, "main" in tags))
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def extract_main_text(html):
+    """Paragraphs of the article body, separated by blank lines ("" if none are found)."""
+    parser = _MainText()
+    parser.feed(html or "")
+    parser.close()
+    for keep in (lambda p: p[1], lambda p: p[2], lambda p: True):
+        chosen = [p[0] for p in parser.paragraphs if keep(p)]
+        if sum(map(len, chosen)) >= MIN_TEXT_CHARS:
+            break
+    return "\n\n".join(dict.fromkeys(chosen))   # drop repeated blocks, keep order
+
+
+# -----------------------------------------------------
+# 2️⃣ POLITE FETCHING
+# -----------------------------------------------------
+class Politeness:
+    """Per-domain cap on requests in flight and spacing between request starts."""
+
+    def __init__(self, per_domain=ENRICH_PER_DOMAIN, interval=ENRICH_DOMAIN_INTERVAL_S, clock=time.monotonic,
+                 sleep=time.sleep):
+        self.per_domain, self.interval = per_domain, interval
+        self.clock, self.sleep = clock, sleep
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next = {}
+
+    @contextlib.contextmanager
+    def slot(self, domain):
+        with self._lock:
+            slots = self._slots.setdefault(domain, threading.BoundedSemaphore(self.per_domain))
+        with slots:
+            with self._lock:
+                now = self.clock()
+                start = max(now, self._next.get(domain, now))
+                self._next[domain] = start + self.interval
+            if start > now:
+                self.sleep(start - now)
+            yield
+
+
+def make_session(pool_size=ENRICH_WORKERS):
+    """A session whose connection pool blocks instead of growing past ``pool_size`` per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = ENRICH_USER_AGENT
+    return session
+
+
+SESSION = make_session()
+POLITENESS = Politeness()
+
+
+def request_url(url, base_url=None):
+    """Where to send the request for ``url``: the stand-in at ``base_url`` (default ``ENRICH_BASE_URL``), if any."""
+    base_url = ENRICH_BASE_URL if base_url is None else base_url
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    return f"{base_url.rstrip('/')}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+_robots = {}
+_robots_locks = {}
+_robots_lock = threading.Lock()
+
+def allowed(url, session, timeout, base_url=None):
+    """``robots.txt`` check, one fetch per site and process; unreachable rules allow everything."""
+    parts = urlsplit(url)
+    robots_url = request_url(f"{parts.scheme}://{parts.netloc}/robots.txt", base_url)
+    with _robots_lock:
+        site_lock = _robots_locks.setdefault(robots_url, threading.Lock())
+    with site_lock:
+        return _robots_rules(robots_url, session, timeout).can_fetch(ENRICH_USER_AGENT, url)
+
+
+def _robots_rules(robots_url, session, timeout):
+    rules = _robots.get(robots_url)
+    if rules is None:
+        rules = RobotFileParser()
+        try:
+            r = session.get(robots_url, timeout=timeout)
+            if r.status_code in (401, 403):
+                rules.disallow_all = True
+            elif r.status_code >= 400:
+                rules.allow_all = True
+            else:
+                rules.parse(r.text.splitlines())
+        except requests.RequestException:
+            rules.allow_all = True
+        _robots[robots_url] = rules
+    return rules
+
+
+def fetch_one(url, session=None, politeness=None, timeout=ENRICH_TIMEOUT_S, base_url=None):
+    """Fetch one page and extract its main text; returns the cache entry (``status`` ok/short/blocked/failed)."""
+    session, politeness = session or SESSION, politeness or POLITENESS
+    entry = {"url": url, "ts": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    try:
+        with politeness.slot(urlsplit(url).netloc.lower()):
+            if not allowed(url, session, timeout, base_url):
+                return {**entry, "status": "blocked"}
+            r = session.get(request_url(url, base_url), timeout=timeout)
+        if r.status_code >= 400:
+            return {**entry, "status": "failed", "error": f"HTTP {r.status_code}"}
+        if "html" not in r.headers.get("Content-Type", "text/html"):
+            return {**entry, "status": "failed", "error": r.headers.get("Content-Type")}
+        text = extract_main_text(r.text)[:ENRICH_MAX_CHARS]
+    except requests.RequestException as e:
+        return {**entry, "status": "failed", "error": type(e).__name__}
+    if len(text) < MIN_TEXT_CHARS:
+        return {**entry, "status": "short", "chars": len(text)}
+    return {**entry, "status": "ok", "chars": len(text), "text": text}
+
+
+# -----------------------------------------------------
+# 3️⃣ URL CACHE (re-read only when the file changes)
+# -----------------------------------------------------
+_cache = {}
+
+def load_cache(path=ENRICH_CACHE_PATH):
+    """``{url: entry}``; the latest entry per URL wins."""
+    if not os.path.exists(path):
+        return {}
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if _cache.get("key") != key:
+        entries = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    e = json.loads(line)
+                    entries[e["url"]] = e
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        _cache.update(key=key, entries=entries)
+    return _cache["entries"]
+
+
+def settled(entry, now=None):
+    """True if ``entry`` needs no new fetch (text found, or a recent failure)."""
+    if entry.get("status") in ("ok", "short"):
+        return True
+    now = now or datetime.now(timezone.utc)
+    try:
+        return now - datetime.fromisoformat(entry["ts"]) < timedelta(hours=ENRICH_RETRY_FAILED_H)
+    except (KeyError, ValueError):
+        return False
+
+
+def cached_text(url, path=ENRICH_CACHE_PATH):
+    """The stored full text of ``url``, or ``None``."""
+    entry = load_cache(path).get(url)
+    return entry["text"] if entry and entry.get("status") == "ok" else None
+
+
+# -----------------------------------------------------
+# 4️⃣ ENRICH
+# -----------------------------------------------------
+def enrich(articles, top_n=ENRICH_TOP_N, cached_only=False, path=ENRICH_CACHE_PATH, workers=ENRICH_WORKERS,
+           session=None, politeness=None):
+    """Attach ``full_text`` to the first ``top_n`` of ``articles`` (ranked best first); return counts.
+
+    With ``cached_only`` (a run short of time, src/deadline.py) only
+    texts already in the cache are attached.
+    """
+    top = [a for a in articles[:top_n] if a.get("url")]
+    cache = load_cache(path)
+    todo = list(dict.fromkeys(a["url"] for a in top if a["url"] not in cache or not settled(cache[a["url"]])))
+    if cached_only and todo:
+        deadline.degrade("cached full text only", not_fetched=len(todo))
+        todo = []
+
+    if todo:
+        timeout = deadline.timeout(ENRICH_TIMEOUT_S)
+        with ThreadPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            results = list(pool.map(lambda url: fetch_one(url, session, politeness, timeout), todo))
+        storage.append_jsonl(path, results)
+        cache = {**cache, **{e["url"]: e for e in results}}
+
+    counts = Counter()
+    for a in top:
+        entry = cache.get(a["url"]) or {}
+        counts[entry.get("status", "missing")] += 1
+        if entry.get("status") == "ok":
+            a["full_text"] = entry["text"]
+    stats = {"articles": len(top), "fetched": len(todo), **counts}
+    print(f"📖 Full text for {counts['ok']} of {len(top)} top articles ({len(todo)} fetched, "
+          f"{len(top) - len(todo)} from cache)")
+    return stats
+
+
+def stats(path=ENRICH_CACHE_PATH):
+    entries = load_cache(path).values()
+    ok = [e["chars"] for e in entries if e.get("status") == "ok"]
+    return {
+        "urls": len(entries),
+        "status": dict(Counter(e.get("status") for e in entries)),
+        "avg_chars": round(sum(ok) / len(ok)) if ok else 0,
+        "domains": len({urlsplit(e["url"]).netloc for e in entries}),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-text enrichment of top-ranked articles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    f = sub.add_parser("fetch", help="fetch one page (bypassing the cache) and print its main text")
+    f.add_argument("url")
+    sub.add_parser("stats", help="cached URLs by status")
+    args = parser.parse_args()
+
+    if args.command == "fetch":
+        entry = fetch_one(args.url)
+        print(entry.get("text") or json.dumps(entry, indent=2))
+    else:
+        print(json.dumps(stats(), indent=2))
@@ -0,0 +1,178 @@
+"""Per-article structured fact records, extracted once and cached.
+
+The same curated article is read by the daily brief, the weekly
+reasoning and narrative, and indirectly by every chat turn. Rather than
+paste its description and truncated content into each prompt, a cheap
+model call turns it once into a compact record::
+
+    {"id", "url", "title", "source", "published", "lang",
+     "actors": [...], "event_type", "location", "date", "key_claim"}
+
+Records are appended to ``FACTS_CACHE_PATH`` keyed by article id and
+reused by every later run. Prompts show one :func:`format_record` line
+per article inside its story thread (``thread_context`` in
+src/threads.py); only articles without a record fall back to their
+extractively compressed text (src/compress.py).
+"""
+
+import hashlib, json, os
+
+from src import budget, llm, storage
+from src.config import FACTS_CACHE_PATH, FACT_BATCH_SIZE
+
+RECORD_FIELDS = ("actors", "event_type", "location", "date", "key_claim")
+FULLTEXT_CHARS = 2000   # lead of an enriched article's full text (src/enrich.py) sent for extraction
+
+EXTRACTION_SYSTEM = (
+    "You extract structured facts from news articles about Venezuela. "
+    "Only use what the article states. Output only JSON."
+)
+
+
+def article_id(article):
+    """Stable id: GNews ``id`` when present, else a hash of the URL."""
+    if article.get("id"):
+        return str(article["id"])
+    url = article.get("url") or article.get("link") or article.get("title") or ""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:32]
+
+
+# -----------------------------------------------------
+# 1️⃣ CACHE
+# -----------------------------------------------------
+_cache = {}
+
+def load_cache(path=FACTS_CACHE_PATH):
+    """Return ``{article_id: record}``; re-read only when the file changes."""
+    if not os.path.exists(path):
+        return {}
+    key = (os.path.abspath(path), os.path.getmtime(path), os.path.getsize(path))
+    if _cache.get("key") != key:
+        records = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    records[rec["id"]] = rec
+                except (json.JSONDecodeError, KeyError):
+                    continue
+        _cache.update(key=key, records=records)
+    return _cache["records"]
+
+
+def save_records(records, path=FACTS_CACHE_PATH):
+    storage.append_jsonl(path, records)
+
+
+# -----------------------------------------------------
+# 2️⃣ EXTRACTION
+# -----------------------------------------------------
+def extraction_prompt(batch):
+    parts = []
+    for i, a in enumerate(batch, 1):
+        parts.append(
+            f"[{i}] Title: {a.get('title') or ''}\n"
+            f"Published: {a.get('publishedAt') or ''}\n"
+            f"Description: {a.get('description') or ''}\n"
+            f"Content: {(a.get('full_text') or '')[:FULLTEXT_CHARS] or a.get('content') or ''}"
+        )
+    return f"""
+For each numbered article, return one record. Return a JSON object:
+{{"records": [
+  {{"article": NUMBER,
+    "actors": ["main people, governments or organisations involved"],
+    "event_type": "short label, e.g. military deployment, sanctions, election, statement, arrest",
+    "location": "where it happened",
+    "date": "YYYY-MM-DD of the event if stated, else of publication",
+    "key_claim": "one factual sentence (max 30 words) stating what happened"}}
+]}}
+
+Articles:
+{chr(10).join(parts)}
+"""
+
+
+def parse_records(raw, n):
+    """Parse an extraction answer for ``n`` articles; raise ``ValueError`` if incomplete."""
+    data = json.loads(raw or "")
+    records = data.get("records") if isinstance(data, dict) else None
+    if not isinstance(records, list):
+        raise llm.LLMValidationError("extraction output has no records list")
+    by_num = {}
+    for rec in records:
+        if not isinstance(rec, dict):
+            continue
+        num = rec.get("article")
+        if isinstance(num, int) and 1 <= num <= n and all(k in rec for k in RECORD_FIELDS):
+            by_num[num] = rec
+    if len(by_num) < n:
+        raise llm.LLMValidationError(f"extraction returned {len(by_num)} of {n} records")
+    return by_num
+
+
+def extract_batch(batch):
+    """Extract records for up to ``FACT_BATCH_SIZE`` articles in one call."""
+    raw = llm.complete(
+        "fact_extraction",
+        [
+            {"role": "system", "content": EXTRACTION_SYSTEM},
+            {"role": "user", "content": extraction_prompt(batch)},
+        ],
+        temperature=0.0,
+        validate=lambda text: parse_records(text, len(batch)),
+        response_format={"type": "json_object"},
+    )
+    by_num = parse_records(raw, len(batch))
+    out = []
+    for i, a in enumerate(batch, 1):
+        rec = by_num[i]
+        out.append({
+            "id": article_id(a),
+            "url": a.get("url") or a.get("link") or "",
+            "title": a.get("title") or "",
+            "source": (a.get("source") or {}).get("name") if isinstance(a.get("source"), dict) else a.get("source_name"),
+            "published": a.get("publishedAt") or a.get("pubDate"),
+            "lang": a.get("lang"),
+            **{k: rec[k] for k in RECORD_FIELDS},
+        })
+    return out
+
+
+def facts_for(articles, batch_size=FACT_BATCH_SIZE):
+    """Return ``{article_id: record}`` for ``articles``, extracting only uncached ones.
+
+    Batches that fail extraction, are over budget or whose call fails
+    after the gateway's retries are skipped (their articles fall back to
+    raw text in the prompt) and retried next run.
+    """
+    cache = load_cache()
+    missing, seen = [], set()
+    for a in articles:
+        aid = article_id(a)
+        if aid not in cache and aid not in seen:
+            missing.append(a)
+            seen.add(aid)
+
+    if missing:
+        print(f"🧾 Extracting facts for {len(missing)} new article(s) ({len(articles) - len(missing)} cached)...")
+    new_records = []
+    for i in range(0, len(missing), batch_size):
+        try:
+            new_records.extend(extract_batch(missing[i:i + batch_size]))
+        except (ValueError, budget.BudgetExceededError, llm.LLMError) as e:
+            print(f"⚠️ Fact extraction failed for a batch ({e}); using raw text for those articles.")
+    save_records(new_records)
+
+    records = dict(cache)
+    records.update({r["id"]: r for r in new_records})
+    return {article_id(a): records[article_id(a)] for a in articles if article_id(a) in records}
+
+
+# -----------------------------------------------------
+# 3️⃣ PROMPT CONTEXT
+# -----------------------------------------------------
+def format_record(rec):
+    actors = rec.get("actors") or []
+    actors = actors if isinstance(actors, str) else ", ".join(map(str, actors))
+    source = f" ({rec['source']})" if rec.get("source") else ""
+    return f"- [{rec.get('date') or '?'}] {rec.get('event_type') or 'event'} · {rec.get('location') or '?'} · {actors}: {rec.get('key_claim') or rec.get('title')}{source}"
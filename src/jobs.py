@@ -0,0 +1,155 @@
+"""Process-wide background job queue for slow LLM calls.
+
+The Streamlit script submits chat replies and drafts here instead of
+blocking on them. Each submission returns a :class:`JobHandle` that the
+session keeps in ``st.session_state`` and polls from a fragment, so the
+rest of the page stays interactive while GPT-4o works.
+
+Jobs are plain callables receiving the handle as first argument; long
+running ones should check ``job.cancel_requested`` and may publish
+intermediate text through ``job.partial`` for streaming display.
+"""
+
+import threading, time, uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import LLM_WORKERS, LLM_JOBS_PER_USER
+
+QUEUED, RUNNING, DONE, ERROR, CANCELLED = "queued", "running", "done", "error", "cancelled"
+FINISHED = (DONE, ERROR, CANCELLED)
+KEEP_FINISHED_SECONDS = 30 * 60
+
+
+class JobLimitError(RuntimeError):
+    """Raised when a user already has the maximum number of active jobs."""
+
+
+class JobHandle:
+    """State of one queued LLM job, safe to read from the UI thread."""
+
+    def __init__(self, owner, kind, meta=None, group=None):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.kind = kind
+        self.meta = meta or {}
+        self.group = group or self.id
+        self.status = QUEUED
+        self.partial = ""
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.created_at
+
+
+class JobQueue:
+    """Thread pool plus per-owner bookkeeping and cancellation."""
+
+    def __init__(self, max_workers=LLM_WORKERS, per_user_limit=LLM_JOBS_PER_USER):
+        self.per_user_limit = per_user_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def active(self, owner):
+        with self._lock:
+            return [j for j in self._jobs.values() if j.owner == owner and not j.finished]
+
+    def _active_groups(self, owner):
+        return {j.group for j in self._jobs.values() if j.owner == owner and not j.finished}
+
+    def submit(self, owner, kind, fn, *args, meta=None, group=None, **kwargs):
+        """Queue ``fn(job, *args, **kwargs)`` and return its handle.
+
+        Jobs sharing a ``group`` key (e.g. the variants of one draft
+        request) count once towards the per-user limit.
+        """
+        job = JobHandle(owner, kind, meta, group)
+        with self._lock:
+            self._prune()
+            groups = self._active_groups(owner)
+            if job.group not in groups and len(groups) >= self.per_user_limit:
+                raise JobLimitError(
+                    f"You already have {len(groups)} request(s) running; wait for one to finish or cancel it."
+                )
+            self._jobs[job.id] = job
+            # Set under the lock so cancel()/listings never see a queued job without its future
+            job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job):
+        """Request cancellation; queued jobs never start, running ones stop at their next check."""
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            self._finish(job, CANCELLED)
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        try:
+            result = fn(job, *args, **kwargs)
+        except Exception as exc:
+            job.error = f"{type(exc).__name__}: {exc}"
+            self._finish(job, ERROR)
+            return
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+        else:
+            job.result = result
+            self._finish(job, DONE)
+
+    @staticmethod
+    def _finish(job, status):
+        job.finished_at = time.time()
+        job.status = status
+
+    def _prune(self):
+        cutoff = time.time() - KEEP_FINISHED_SECONDS
+        for job_id in [k for k, j in self._jobs.items() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+def stream_chat_completion(job, client, meta=None, **kwargs):
+    """Run a streaming chat completion, publishing text to ``job.partial``.
+
+    Stops early (returning what arrived so far) once cancellation is
+    requested. ``meta``, if given, receives the last chunk's
+    ``finish_reason`` and the ``usage`` chunk when the stream sends one.
+    """
+    stream = client.chat.completions.create(stream=True, **kwargs)
+    parts = []
+    for chunk in stream:
+        if job.cancel_requested:
+            break
+        usage = getattr(chunk, "usage", None)
+        if meta is not None and usage is not None:
+            meta["usage"] = {"prompt_tokens": getattr(usage, "prompt_tokens", None),
+                             "completion_tokens": getattr(usage, "completion_tokens", None)}
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        if meta is not None and getattr(choice, "finish_reason", None):
+            meta["finish_reason"] = choice.finish_reason
+        delta = choice.delta.content or ""
+        if delta:
+            parts.append(delta)
+            job.partial = "".join(parts)
+    return "".join(parts)
@@ -0,0 +1,416 @@
+"""Tiered model routing for every LLM call in the project.
+
+Each call names a *task* (``daily_summary``, ``weekly_narrative``,
+``chat_lookup``, ...). ``TASK_TIERS`` in the config maps the task to a
+starting tier and ``MODEL_TIERS`` maps tiers to models. When a caller
+supplies a validator, or the built-in confidence checks fail (empty
+output, truncated output, an "I don't know" answer to a lookup), the
+call is retried on the next tier up. Every attempt is appended to
+``LLM_ROUTING_LOG`` for cost analysis.
+
+All calls, from the pipelines and every Streamlit session, pass through
+one process-wide :class:`Gateway`. It reuses a single provider client
+(and its connection pool), bounds in-flight calls, keeps each model
+under its requests- and tokens-per-minute limits, applies a timeout, and
+retries 429/5xx/connection failures with exponential backoff (honouring
+``Retry-After``), raising :class:`LLMError` once the retries run out.
+:func:`acomplete` is the asyncio entry point and shares the same limits.
+
+Before each attempt the budget governor (src/budget.py) sizes the call
+locally and refuses it if it would break the per-call, per-run or
+per-day budget. Inside a deadline-bound run (src/deadline.py) requests
+time out with the stage's budget, and retries or escalations that would
+overrun it are skipped.
+
+Set ``LLM_PROVIDER=stub`` (or call :func:`set_provider`) to route calls
+to a local :class:`StubProvider` instead of OpenAI.
+"""
+
+import asyncio, json, os, random, re, threading, time
+from collections import deque
+from datetime import datetime, timezone
+
+from src.config import (
+    OPENAI_API_KEY, OPENAI_BASE_URL, LLM_PROVIDER, MODEL_TIERS, TIER_ORDER, TASK_TIERS, LLM_ROUTING_LOG,
+    LLM_RATE_LIMITS, LLM_MAX_CONCURRENCY, LLM_TIMEOUT_S, LLM_MAX_RETRIES, LLM_BACKOFF_BASE_S,
+    LLM_DEFAULT_COMPLETION_TOKENS,
+)
+from src import budget, deadline, storage
+from src.tokens import count_message_tokens, count_tokens
+
+UNSURE_PATTERNS = re.compile(
+    r"\b(i don't know|i do not know|not (mentioned|covered|available) in the (provided )?context|"
+    r"cannot (determine|answer)|no information)\b",
+    re.IGNORECASE,
+)
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+MAX_BACKOFF_S = 30.0
+LOOKUP_START = re.compile(
+    r"^\s*(who|when|where|what (is|was|are|were|did)|which|how (many|much)|list|name|quién|cuándo|dónde|cuál)\b",
+    re.IGNORECASE,
+)
+
+
+class LLMValidationError(ValueError):
+    """Raised by validators when an output is unusable."""
+
+
+class LLMError(RuntimeError):
+    """A transient failure (429/5xx/timeout) that outlasted the gateway's retries."""
+
+
+# -----------------------------------------------------
+# 1️⃣ PROVIDERS
+# -----------------------------------------------------
+class _Response:
+    """Minimal response shape shared by all providers."""
+
+    def __init__(self, text, finish_reason="stop", usage=None):
+        self.text = text or ""
+        self.finish_reason = finish_reason
+        self.usage = usage or {}
+        self.retries = 0
+        self.throttled_s = 0.0
+
+
+class OpenAIProvider:
+    """Chat completions through the OpenAI SDK (client built lazily).
+
+    The SDK's own retries are disabled; the :class:`Gateway` retries
+    with its quota accounting instead.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                import openai
+                self._client = openai.OpenAI(
+                    api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, timeout=LLM_TIMEOUT_S, max_retries=0,
+                )
+        return self._client
+
+    @staticmethod
+    def is_retryable(exc):
+        import openai
+        return isinstance(exc, openai.APIConnectionError) or getattr(exc, "status_code", None) in RETRY_STATUS
+
+    def chat(self, model, messages, temperature, stream_to=None, **kwargs):
+        if stream_to is not None:
+            from src.jobs import stream_chat_completion
+            meta = {}
+            text = stream_chat_completion(
+                stream_to, self.client, meta=meta, model=model, messages=messages, temperature=temperature,
+                stream_options={"include_usage": True}, **kwargs
+            )
+            # A cancelled stream has no finish_reason; treat what arrived as final
+            return _Response(text, meta.get("finish_reason") or "stop", meta.get("usage"))
+        resp = self.client.chat.completions.create(
+            model=model, messages=messages, temperature=temperature, **kwargs
+        )
+        choice = resp.choices[0]
+        usage = getattr(resp, "usage", None)
+        return _Response(
+            choice.message.content,
+            getattr(choice, "finish_reason", "stop"),
+            {
+                "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                "completion_tokens": getattr(usage, "completion_tokens", None),
+            } if usage is not None else None,
+        )
+
+
+class StubProvider:
+    """Offline provider: ``responder(model, messages)`` returns the text.
+
+    The default responder echoes the model name and the start of the
+    last message, which is enough to exercise routing and logging.
+    """
+
+    def __init__(self, responder=None):
+        self.responder = responder or (lambda model, messages: f"[{model}] {messages[-1]['content'][:200]}")
+        self.calls = []
+
+    def chat(self, model, messages, temperature, stream_to=None, **kwargs):
+        self.calls.append({"model": model, "messages": messages, "temperature": temperature, **kwargs})
+        text = self.responder(model, messages)
+        if stream_to is not None:
+            stream_to.partial = text
+        return _Response(text)
+
+
+# -----------------------------------------------------
+# 2️⃣ GATEWAY: concurrency, quotas, retries
+# -----------------------------------------------------
+class RateWindow:
+    """Sliding one-minute window of requests and tokens for one model."""
+
+    def __init__(self, rpm, tpm):
+        self.rpm, self.tpm = rpm, tpm
+        self.events = deque()     # [start_time, tokens]
+        self.tokens = 0
+
+    def _expire(self, now):
+        while self.events and now - self.events[0][0] >= 60:
+            self.tokens -= self.events.popleft()[1]
+
+    def reserve(self, tokens, now):
+        """Return ``(entry, 0)`` if the call fits now, else ``(None, seconds_to_wait)``.
+
+        A call larger than the whole token budget is let through once
+        the window is empty rather than blocking forever.
+        """
+        self._expire(now)
+        fits = self.tokens + tokens <= self.tpm or not self.events
+        if len(self.events) < self.rpm and fits:
+            entry = [now, tokens]
+            self.events.append(entry)
+            self.tokens += tokens
+            return entry, 0.0
+        return None, max(60 - (now - self.events[0][0]), 0.05)
+
+    def settle(self, entry, actual, now):
+        """Replace a reservation's estimate with the tokens actually used."""
+        if now - entry[0] < 60:
+            self.tokens += actual - entry[1]
+            entry[1] = actual
+
+
+class Gateway:
+    """Process-wide front door for every model call."""
+
+    def __init__(self, provider, limits=None, max_concurrency=LLM_MAX_CONCURRENCY, max_retries=LLM_MAX_RETRIES,
+                 backoff_base=LLM_BACKOFF_BASE_S, sleep=time.sleep, clock=time.monotonic):
+        self.provider = provider
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.sleep, self.clock = sleep, clock
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        limits = LLM_RATE_LIMITS if limits is None else limits
+        self._windows = {model: RateWindow(l["rpm"], l["tpm"]) for model, l in limits.items()}
+        self.stats = {"calls": 0, "retries": 0, "throttled_s": 0.0, "in_flight": 0}
+
+    def _reserve(self, model, tokens):
+        window = self._windows.get(model)
+        waited = 0.0
+        while window is not None:
+            with self._lock:
+                entry, wait = window.reserve(tokens, self.clock())
+            if entry is not None:
+                return window, entry, waited
+            self.sleep(wait)
+            waited += wait
+        return None, None, waited
+
+    def _retryable(self, exc):
+        check = getattr(self.provider, "is_retryable", None)
+        if check is not None:
+            return check(exc)
+        return getattr(exc, "status_code", None) in RETRY_STATUS or isinstance(exc, (TimeoutError, ConnectionError))
+
+    def _retry_delay(self, exc, attempt):
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        try:
+            retry_after = float(headers.get("retry-after", 0))
+        except (TypeError, ValueError):
+            retry_after = 0.0
+        backoff = self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.0)
+        return min(max(retry_after, backoff), MAX_BACKOFF_S)
+
+    def chat(self, model, messages, temperature, stream_to=None, **kwargs):
+        """Call the provider within quota, retrying transient failures."""
+        estimate = count_message_tokens(messages) + (kwargs.get("max_tokens") or LLM_DEFAULT_COMPLETION_TOKENS)
+        retries, throttled = 0, 0.0
+        while True:
+            window, entry, waited = self._reserve(model, estimate)
+            throttled += waited
+            error = None
+            with self._slots:
+                with self._lock:
+                    self.stats["in_flight"] += 1
+                try:
+                    resp = self.provider.chat(model, messages, temperature, stream_to=stream_to, **kwargs)
+                except Exception as exc:
+                    error = exc
+                finally:
+                    with self._lock:
+                        self.stats["in_flight"] -= 1
+            if error is None:
+                break
+            cancelled = stream_to is not None and stream_to.cancel_requested
+            if cancelled or not self._retryable(error):
+                raise error
+            if retries >= self.max_retries:
+                raise LLMError(f"{model}: {type(error).__name__} after {retries} retries") from error
+            delay = self._retry_delay(error, retries)
+            if delay >= deadline.stage_left():
+                deadline.degrade(f"no retry of {model}", reason=type(error).__name__)
+                raise LLMError(f"{model}: {type(error).__name__}, no time left to retry") from error
+            retries += 1
+            print(f"⏳ {model}: {type(error).__name__}; retry {retries}/{self.max_retries} in {delay:.1f}s")
+            self.sleep(delay)
+            if stream_to is not None:
+                stream_to.partial = ""
+
+        if window is not None:
+            actual = (resp.usage.get("prompt_tokens") or 0) + (resp.usage.get("completion_tokens") or 0)
+            actual = actual or (estimate - (kwargs.get("max_tokens") or LLM_DEFAULT_COMPLETION_TOKENS) + count_tokens(resp.text))
+            with self._lock:
+                window.settle(entry, actual, self.clock())
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["retries"] += retries
+            self.stats["throttled_s"] += throttled
+        resp.retries, resp.throttled_s = retries, throttled
+        return resp
+
+
+_provider = None
+_gateway = None
+_init_lock = threading.Lock()
+
+def get_provider():
+    global _provider
+    with _init_lock:
+        if _provider is None:
+            _provider = StubProvider() if LLM_PROVIDER == "stub" else OpenAIProvider()
+        return _provider
+
+
+def get_gateway():
+    """The shared gateway around the current provider."""
+    global _gateway
+    provider = get_provider()
+    with _init_lock:
+        if _gateway is None or _gateway.provider is not provider:
+            _gateway = Gateway(provider)
+        return _gateway
+
+
+def set_provider(provider):
+    """Swap the provider (tests, replay harness); ``None`` restores the default."""
+    global _provider, _gateway
+    with _init_lock:
+        _provider = provider
+        _gateway = None
+
+
+# -----------------------------------------------------
+# 3️⃣ ROUTING
+# -----------------------------------------------------
+def tier_for(task):
+    return TASK_TIERS.get(task, TIER_ORDER[-1])
+
+
+def classify_chat(question):
+    """Route short factual lookups to ``chat_lookup``; everything else is ``chat``."""
+    if len(question) <= 160 and LOOKUP_START.match(question):
+        return "chat_lookup"
+    return "chat"
+
+
+def looks_unsure(text):
+    return bool(UNSURE_PATTERNS.search(text or ""))
+
+
+def _check(task, resp, validate):
+    """Return ``None`` if the output is acceptable, else the reason it is not."""
+    if not resp.text.strip():
+        return "empty output"
+    if resp.finish_reason == "length":
+        return "truncated output"
+    if task == "chat_lookup" and looks_unsure(resp.text):
+        return "low-confidence answer"
+    if validate is not None:
+        try:
+            if validate(resp.text) is False:
+                return "validation failed"
+        except ValueError as e:
+            return f"validation failed: {e}"
+    return None
+
+
+def log_decision(entry, path=LLM_ROUTING_LOG):
+    storage.append_jsonl(path, [entry])
+
+
+def complete(task, messages, temperature=0.3, validate=None, stream_to=None, tier=None, **kwargs):
+    """Run ``messages`` for ``task`` on its tier, escalating on failed checks.
+
+    ``validate(text)`` may raise ``ValueError`` or return ``False`` to
+    reject an output. On the top tier the last output is returned even
+    if it fails, so callers keep their own error handling. ``stream_to``
+    is a job handle that receives partial text. ``tier`` overrides the
+    starting tier (see :func:`src.budget.plan`).
+
+    Each attempt is checked against the budgets first; the first raises
+    :class:`src.budget.BudgetExceededError`, an escalation that does not
+    fit returns the output already in hand.
+    """
+    gateway = get_gateway()
+    start = TIER_ORDER.index(tier or tier_for(task))
+    text = ""
+    for i, tier in enumerate(TIER_ORDER[start:], start=start):
+        model = MODEL_TIERS[tier]
+        try:
+            budget.preflight(task, model, messages, kwargs.get("max_tokens"))
+        except budget.BudgetExceededError as e:
+            if i == start:
+                raise
+            print(f"💸 {task}: escalation to {model} blocked ({e}); keeping the previous output.")
+            return text
+        t0 = time.perf_counter()
+        if stream_to is not None:
+            stream_to.partial = ""
+        call_kwargs = {**kwargs, "timeout": deadline.timeout(LLM_TIMEOUT_S)} if deadline.active() else kwargs
+        resp = gateway.chat(model, messages, temperature, stream_to=stream_to, **call_kwargs)
+        text = resp.text
+        usage = resp.usage or {"prompt_tokens": count_message_tokens(messages), "completion_tokens": count_tokens(text)}
+        cancelled = stream_to is not None and stream_to.cancel_requested
+        reason = None if cancelled else _check(task, resp, validate)
+        last = i == len(TIER_ORDER) - 1
+        log_decision({
+            "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "task": task,
+            "tier": tier,
+            "model": model,
+            "outcome": "ok" if reason is None else ("failed" if last else "escalated"),
+            "reason": reason,
+            "latency_s": round(time.perf_counter() - t0, 3),
+            "retries": resp.retries,
+            "throttled_s": round(resp.throttled_s, 3),
+            "cost_usd": round(budget.record(model, usage), 6),
+            **resp.usage,
+        })
+        if reason is None or last:
+            return text
+        if time.perf_counter() - t0 >= deadline.stage_left():   # the next tier is no faster
+            deadline.degrade(f"kept {tier}-tier output", reason=reason)
+            return text
+        print(f"↗️ {task}: {model} output rejected ({reason}); escalating.")
+    return text
+
+
+def complete_within_budget(task, build, max_tokens=None, start=None, **kwargs):
+    """:func:`complete` on the first budget plan that fits; ``build(context, articles)`` makes the messages.
+
+    ``start`` names the first ``BUDGET_STEPS`` step to try.
+    """
+    messages, tier = budget.plan(task, build, max_tokens, start)
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    return complete(task, messages, tier=tier, **kwargs)
+
+
+async def acomplete(task, messages, **kwargs):
+    """Async :func:`complete` for event-loop callers.
+
+    Runs on a worker thread so it shares the gateway's client,
+    concurrency slots and quotas with synchronous callers.
+    """
+    return await asyncio.to_thread(complete, task, messages, **kwargs)
@@ -0,0 +1,93 @@
+"""Rolling conversation memory for the Interact chat.
+
+Instead of sending the last eight messages verbatim (and forgetting
+everything older), the chat keeps:
+
+- a token-budgeted window of the most recent turns, and
+- a running synopsis of everything before that window, updated
+  incrementally: each evicted turn is folded into the synopsis once and
+  the result is reused on every later turn.
+
+Prompts are laid out stable-first (instructions + context, then the
+synopsis, then the recent turns) so provider-side prompt caching can
+reuse the long shared prefix across turns and analysts.
+"""
+
+from src.tokens import count_tokens, MESSAGE_OVERHEAD_TOKENS
+from src.config import CHAT_WINDOW_TOKENS, CHAT_SYNOPSIS_MAX_TOKENS
+
+SYNOPSIS_SYSTEM = (
+    "You maintain a compact running synopsis of an analyst's conversation about Venezuela. "
+    "Keep facts, questions asked, conclusions reached and open threads. "
+    "Drop pleasantries and repetition. Write plain prose, no headings."
+)
+
+
+class ConversationMemory:
+    """Synopsis + window bookkeeping for one chat session.
+
+    ``summarized_upto`` is the index (into the session's message list)
+    of the first message *not* yet folded into ``synopsis``.
+    """
+
+    def __init__(self, window_tokens=CHAT_WINDOW_TOKENS, synopsis_max_tokens=CHAT_SYNOPSIS_MAX_TOKENS):
+        self.window_tokens = window_tokens
+        self.synopsis_max_tokens = synopsis_max_tokens
+        self.synopsis = ""
+        self.summarized_upto = 0
+
+    def window_start(self, messages):
+        """Return the index where the recent-turn window begins.
+
+        The newest message is always kept; older ones are added while
+        they fit in the token budget, and the window never reaches back
+        into turns that are already summarized.
+        """
+        start = len(messages)
+        used = 0
+        for i in range(len(messages) - 1, -1, -1):
+            cost = count_tokens(messages[i]["content"]) + MESSAGE_OVERHEAD_TOKENS
+            if start < len(messages) and used + cost > self.window_tokens:
+                break
+            if i < self.summarized_upto:
+                break
+            used += cost
+            start = i
+        return start
+
+    def pending(self, messages):
+        """Messages that have left the window but are not in the synopsis yet."""
+        return messages[self.summarized_upto:self.window_start(messages)]
+
+    def compact(self, messages, summarize):
+        """Fold newly evicted turns into the synopsis.
+
+        ``summarize(system, prompt, max_tokens)`` performs the LLM call;
+        it runs at most once per turn and only when something was
+        evicted since the last compaction.
+        """
+        start = self.window_start(messages)
+        evicted = messages[self.summarized_upto:start]
+        if not evicted:
+            return False
+
+        transcript = "\n".join(f"{m['role'].upper()}: {m['content']}" for m in evicted)
+        prompt = (
+            f"Current synopsis:\n{self.synopsis or '(empty)'}\n\n"
+            f"New exchanges to fold in:\n{transcript}\n\n"
+            f"Return the updated synopsis in at most {self.synopsis_max_tokens} tokens."
+        )
+        self.synopsis = (summarize(SYNOPSIS_SYSTEM, prompt, self.synopsis_max_tokens) or self.synopsis).strip()
+        self.summarized_upto = start
+        return True
+
+    def build_messages(self, system_prompt, context, messages):
+        """Assemble the chat prompt: stable prefix, synopsis, recent turns."""
+        prefix = system_prompt
+        if context:
+            prefix += f"\n\nContext:\n{context}"
+        out = [{"role": "system", "content": prefix}]
+        if self.synopsis:
+            out.append({"role": "system", "content": f"Earlier in this conversation (summary):\n{self.synopsis}"})
+        out.extend({"role": m["role"], "content": m["content"]} for m in messages[self.window_start(messages):])
+        return out
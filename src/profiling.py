@@ -0,0 +1,306 @@
+"""Opt-in CPU and memory profiling of pipeline runs and dashboard jobs.
+
+Enabled with ``PROFILE=1`` in the environment or ``--profile`` on the
+daily/weekly command lines; otherwise every hook is a no-op
+(``PROFILE=cpu`` skips the tracemalloc part, which slows runs down
+several times). A profiled run (:func:`run`, or the :func:`profiled`
+decorator) gets a directory ``PROFILE_DIR/<run_id>/``, and each
+:func:`stage` inside it writes:
+
+- ``NN_<stage>.prof``: a cProfile dump of the stage (pstats/snakeviz);
+- ``NN_<stage>.snapshot``: a tracemalloc snapshot taken at its end;
+- an entry in ``summary.json``: wall and CPU time, traced memory at the
+  end and the peak during the stage, the top functions by cumulative
+  time and the top allocation sites the stage added.
+
+Stages are timed in the thread that runs them, but tracemalloc figures
+are process-wide: tracing starts with the first profiled run and stops
+when the last one still open finishes. A stage opened inside another
+one is timed, and its CPU profile stays with the outer stage.
+
+Usage::
+
+    PROFILE=1 python -m src.daily_pipeline      # or: python -m src.daily_pipeline --profile
+    python -m src.profiling list
+    python -m src.profiling show <run_id>
+    python -m src.profiling diff <run_a> <run_b>
+"""
+
+import argparse, contextlib, contextvars, cProfile, functools, glob, json, os, pstats, re, sys, threading, time, tracemalloc
+from datetime import datetime, timezone
+
+from src import storage
+from src.config import PROFILE_ENABLED, PROFILE_MEMORY, PROFILE_DIR, PROFILE_TOP_N, PROFILE_TRACE_FRAMES
+
+_enabled = PROFILE_ENABLED
+_run = contextvars.ContextVar("profiling_run", default=None)
+_tracing = {"runs": 0, "ours": False}   # open runs using tracemalloc; whether we started it
+_tracing_lock = threading.Lock()
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def enabled():
+    return _enabled
+
+
+# -----------------------------------------------------
+# 1️⃣ RUNS AND STAGES
+# -----------------------------------------------------
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", str(text)).strip("-") or "stage"
+
+
+def _write_summary(state):
+    storage.atomic_write_json(os.path.join(state["dir"], "summary.json"), state["summary"])
+
+
+def _start_tracing():
+    with _tracing_lock:
+        if _tracing["runs"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACE_FRAMES)
+            _tracing["ours"] = True
+        _tracing["runs"] += 1
+
+
+def _stop_tracing():
+    """Stop tracemalloc once no profiled run needs it (and only if a run started it)."""
+    with _tracing_lock:
+        _tracing["runs"] -= 1
+        if _tracing["runs"] == 0 and _tracing["ours"]:
+            tracemalloc.stop()
+            _tracing["ours"] = False
+
+
+@contextlib.contextmanager
+def run(name, profile_dir=None):
+    """Collect the stages of one run under ``<profile_dir>/<run_id>``; yields the run id (``None`` when off)."""
+    if not _enabled or _run.get() is not None:   # off, or nested: stages go to the outer run
+        yield None
+        return
+    run_id = base = f"{_slug(name)}_{datetime.now(timezone.utc):%Y%m%dT%H%M%S}_{os.getpid()}"
+    n = 1
+    while os.path.exists(os.path.join(profile_dir or PROFILE_DIR, run_id)):   # same name within a second
+        n += 1
+        run_id = f"{base}-{n}"
+    state = {
+        "dir": os.path.join(profile_dir or PROFILE_DIR, run_id),
+        "profiler": None,
+        "started": 0,
+        "summary": {"run_id": run_id, "name": name, "argv": sys.argv, "started": datetime.now(timezone.utc).isoformat(
+            timespec="seconds"), "stages": []},
+    }
+    os.makedirs(state["dir"], exist_ok=True)
+    if PROFILE_MEMORY:
+        _start_tracing()
+    token = _run.set(state)
+    t0 = time.perf_counter()
+    try:
+        yield run_id
+    finally:
+        _run.reset(token)
+        state["summary"]["wall_s"] = round(time.perf_counter() - t0, 4)
+        state["summary"]["finished"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        _write_summary(state)
+        if PROFILE_MEMORY:
+            _stop_tracing()
+        print(f"🔬 Profile saved → {state['dir']}")
+
+
+# Allocation sites left out of the per-stage top list (Snapshot.filter_traces
+# would do the same but takes seconds on a large snapshot).
+IGNORED_SITES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+
+def top_allocations(after, before, n=PROFILE_TOP_N):
+    rows = []
+    for s in after.compare_to(before, "lineno"):
+        if len(rows) == n or s.size_diff <= 0:
+            break
+        if s.traceback[0].filename not in IGNORED_SITES:
+            rows.append({"site": str(s.traceback[0]), "size_kb": round(s.size_diff / 1024, 1), "count": s.count_diff})
+    return rows
+
+
+def top_functions(stats, n=PROFILE_TOP_N):
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:n]
+    return [{"function": func_label(k), "ncalls": v[1], "tottime": round(v[2], 4), "cumtime": round(v[3], 4)}
+            for k, v in rows]
+
+
+@contextlib.contextmanager
+def stage(name, key=None):
+    """Profile the enclosed block as stage ``name`` (``key``: e.g. the report date) of the current run."""
+    state = _run.get()
+    if state is None:
+        yield
+        return
+    key = None if key is None else str(key)
+    index = state["started"] = state["started"] + 1   # numbered in start order
+    stem = os.path.join(state["dir"], f"{index:02d}_{_slug(name if key is None else f'{name}_{key}')}")
+    profiler = None
+    if state["profiler"] is None:
+        profiler = state["profiler"] = cProfile.Profile()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+    t0, c0 = time.perf_counter(), time.thread_time()
+    if profiler:
+        try:
+            profiler.enable()
+        except ValueError:   # another thread's stage holds the (process-wide) profiler hook
+            profiler = state["profiler"] = None
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            state["profiler"] = None
+        wall, cpu = time.perf_counter() - t0, time.thread_time() - c0
+        entry = {"stage": name, "key": key, "wall_s": round(wall, 4), "cpu_s": round(cpu, 4)}
+        if tracing and tracemalloc.is_tracing():   # stopped meanwhile only if started outside a run
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            after.dump(stem + ".snapshot")
+            entry.update(mem_current_kb=current // 1024, mem_peak_kb=peak // 1024,
+                         top_allocations=top_allocations(after, before))
+        if profiler:
+            profiler.dump_stats(stem + ".prof")
+            entry["profile"] = os.path.basename(stem) + ".prof"
+            entry["top_functions"] = top_functions(pstats.Stats(profiler))
+        state["summary"]["stages"].append(entry)
+        _write_summary(state)   # keep what we have if the run dies later
+
+
+def profiled(name, whole=True):
+    """Decorator: each call is a profiled run (no-op unless enabled).
+
+    With ``whole`` the call is profiled as one stage; pass ``False`` for
+    functions that open their own :func:`stage` blocks.
+    """
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with run(name), (stage(fn.__name__) if whole else contextlib.nullcontext()):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+# -----------------------------------------------------
+# 2️⃣ READING AND COMPARING RUNS
+# -----------------------------------------------------
+def func_label(key):
+    """``file:function``; line numbers are left out so runs of different versions still line up."""
+    filename, _, func = key
+    if filename == "~":   # built-ins: "<built-in method __new__ of type object at 0x7f...>"
+        return re.sub(r" at 0x[0-9a-f]+", "", func)
+    return f"{os.path.basename(filename)}:{func}"
+
+
+def load_run(run_id, profile_dir=PROFILE_DIR):
+    path = run_id if os.path.isdir(run_id) else os.path.join(profile_dir, run_id)
+    with open(os.path.join(path, "summary.json"), "r", encoding="utf-8") as f:
+        summary = json.load(f)
+    return path, summary
+
+
+def list_runs(profile_dir=PROFILE_DIR):
+    return sorted(os.path.basename(os.path.dirname(p)) for p in glob.glob(os.path.join(profile_dir, "*", "summary.json")))
+
+
+def stage_totals(summary):
+    """``{stage: {"wall_s", "cpu_s", "mem_peak_kb", "n"}}`` summed over keys (dates differ between runs)."""
+    totals = {}
+    for s in summary["stages"]:
+        t = totals.setdefault(s["stage"], {"wall_s": 0.0, "cpu_s": 0.0, "mem_peak_kb": 0, "n": 0})
+        t["wall_s"] += s["wall_s"]
+        t["cpu_s"] += s["cpu_s"]
+        t["mem_peak_kb"] = max(t["mem_peak_kb"], s.get("mem_peak_kb", 0))
+        t["n"] += 1
+    return totals
+
+
+def function_times(path):
+    """``{file:function: [tottime, cumtime]}`` over every stage profile of a run."""
+    files = sorted(glob.glob(os.path.join(path, "*.prof")))
+    if not files:
+        return {}
+    times = {}
+    for k, v in pstats.Stats(*files).stats.items():
+        t = times.setdefault(func_label(k), [0.0, 0.0])
+        t[0] += v[2]
+        t[1] += v[3]
+    return times
+
+
+def diff(run_a, run_b, profile_dir=PROFILE_DIR, n=PROFILE_TOP_N):
+    """Per-stage and per-function changes from ``run_a`` to ``run_b``."""
+    path_a, sum_a = load_run(run_a, profile_dir)
+    path_b, sum_b = load_run(run_b, profile_dir)
+    stages_a, stages_b = stage_totals(sum_a), stage_totals(sum_b)
+    stages = []
+    for name in list(stages_a) + [s for s in stages_b if s not in stages_a]:
+        a, b = stages_a.get(name), stages_b.get(name)
+        stages.append({"stage": name, "a": a, "b": b,
+                       "wall_delta_s": round((b or {}).get("wall_s", 0) - (a or {}).get("wall_s", 0), 4)})
+    funcs_a, funcs_b = function_times(path_a), function_times(path_b)
+    functions = []
+    for label in set(funcs_a) | set(funcs_b):
+        a, b = funcs_a.get(label, [0.0, 0.0]), funcs_b.get(label, [0.0, 0.0])
+        functions.append({"function": label, "tottime_a": round(a[0], 4), "tottime_b": round(b[0], 4),
+                          "delta_s": round(b[0] - a[0], 4), "cumtime_b": round(b[1], 4)})
+    functions.sort(key=lambda f: abs(f["delta_s"]), reverse=True)
+    return {"a": sum_a["run_id"], "b": sum_b["run_id"], "wall_a": sum_a.get("wall_s"), "wall_b": sum_b.get("wall_s"),
+            "stages": stages, "functions": functions[:n]}
+
+
+def _print_diff(d):
+    print(f"🔬 {d['a']} → {d['b']}   total {d['wall_a']}s → {d['wall_b']}s")
+    print(f"\n{'stage':<14}{'wall a':>10}{'wall b':>10}{'Δ':>10}{'peak MB a':>12}{'peak MB b':>12}")
+    for s in d["stages"]:
+        a, b = s["a"] or {}, s["b"] or {}
+        print(f"{s['stage']:<14}{a.get('wall_s', 0):>10.3f}{b.get('wall_s', 0):>10.3f}{s['wall_delta_s']:>+10.3f}"
+              f"{a.get('mem_peak_kb', 0) / 1024:>12.1f}{b.get('mem_peak_kb', 0) / 1024:>12.1f}")
+    print(f"\n{'self time a':>12}{'self time b':>12}{'Δ':>10}  function")
+    for f in d["functions"]:
+        print(f"{f['tottime_a']:>12.4f}{f['tottime_b']:>12.4f}{f['delta_s']:>+10.4f}  {f['function']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profiles of pipeline runs and dashboard jobs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="saved runs, oldest first")
+    show = sub.add_parser("show", help="stages and hot spots of one run")
+    show.add_argument("run_id")
+    d = sub.add_parser("diff", help="compare two runs stage by stage and function by function")
+    d.add_argument("run_a")
+    d.add_argument("run_b")
+    d.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for run_id in list_runs():
+            _, summary = load_run(run_id)
+            print(f"{run_id}  {summary.get('wall_s', '?')}s  {len(summary['stages'])} stages")
+    elif args.command == "show":
+        _, summary = load_run(args.run_id)
+        for s in summary["stages"]:
+            print(f"\n⏱️ {s['stage']} {s['key'] or ''}  wall {s['wall_s']}s  cpu {s['cpu_s']}s  "
+                  f"peak {s.get('mem_peak_kb', 0) / 1024:.1f} MB")
+            for f in s.get("top_functions", [])[:10]:
+                print(f"   {f['cumtime']:>8.3f}s cum  {f['tottime']:>8.3f}s self  {f['ncalls']:>7}  {f['function']}")
+            for a in s.get("top_allocations", [])[:5]:
+                print(f"   {a['size_kb']:>8.1f} KB  {a['site']}")
+    else:
+        result = diff(args.run_a, args.run_b)
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            _print_diff(result)
@@ -0,0 +1,379 @@
+"""Local, CPU-only relevance scoring for fetched articles.
+
+``clean_rank`` historically kept an article when it mentioned
+"venezuela", any keyword, and had a 40+ character description. That
+misses Spanish phrasing and keeps roundup pieces that mention Venezuela
+once. This module learns a replacement from our own data:
+
+- features: hashed unigrams + bigrams of title/description/content
+  (accent-folded, so English and Spanish share tokens), TF-IDF weighted
+  and L2-normalised, plus a few length markers;
+- model: logistic regression trained with full-batch gradient descent;
+- everything is kept as flat NumPy arrays (row ids, column ids, values),
+  so scoring a whole batch is one gather + ``bincount``.
+
+Labels come from two places:
+
+- analyst labels in ``data/labels/relevance.jsonl`` (``{"url": ...,
+  "relevant": true|false}``), covering the roundups, live blogs and
+  sports pieces the rules keep. They are the gold labels: they weigh
+  ``GOLD_WEIGHT`` times more in training and are the only labels
+  precision/recall is measured on. The file was seeded with entries
+  marked ``"provisional": true`` that no analyst has judged yet; they
+  are trained on like the others but left out of the reported metric
+  (``eval`` scores them separately, flagged, until an analyst drops the
+  flag);
+- history, as weak labels: a raw article is positive when it appears in
+  the curated file produced from that raw file, negative otherwise, and
+  raw files without a curated counterpart fall back to the keyword
+  rules. Curated files are themselves rule (or model) output, so these
+  can only teach the model what the rules already do.
+
+``train`` holds out a deterministic quarter of the articles and saves
+the model fit on the rest, so ``eval`` scores it on rows it has not
+seen; ``train --all`` refits on everything, and ``eval`` then reports
+an in-sample score.
+
+Usage::
+
+    python -m src.relevance train   # fit, report held-out precision/recall vs rules, save
+    python -m src.relevance eval    # evaluate the saved model only
+"""
+
+import argparse, glob, json, os, re, unicodedata, zlib
+
+import numpy as np
+
+from src import archive, storage
+from src.config import RELEVANCE_MODEL_PATH, RELEVANCE_THRESHOLD
+
+N_FEATURES = 2 ** 18
+LABELS_PATH = "data/labels/relevance.jsonl"
+GOLD_WEIGHT = 20.0   # one analyst label outweighs this many weak ones
+HOLDOUT = 0.25
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+GNEWS_TRUNCATION = re.compile(r"\s*\.\.\.\s*\[\d+ chars\]\s*$")
+# Baseline rule keywords for training/eval (the weekly_watch.KEYWORDS list)
+RULE_KEYWORDS = ["venezuela", "caracas", "maduro", "pdvsa", "chevron",
+                 "opposition", "sanction", "machado"]
+
+
+# -----------------------------------------------------
+# 1️⃣ KEYWORD RULES (the baseline we compare against)
+# -----------------------------------------------------
+def rule_score(article, keywords):
+    """Return the keyword score if the article passes the legacy rules, else ``None``."""
+    title = article.get("title") or ""
+    desc = article.get("description") or ""
+    content = article.get("content") or ""
+    text = (title + " " + desc + " " + content).lower()
+
+    if "venezuela" not in text:
+        return None
+    if not any(k in text for k in keywords):
+        return None
+    if len(desc) < 40:
+        return None
+    return sum(text.count(k) for k in keywords)
+
+
+# -----------------------------------------------------
+# 2️⃣ FEATURES: hashed TF-IDF in flat sparse arrays
+# -----------------------------------------------------
+def fold(text):
+    """Lowercase and strip accents so "Nicolás"/"nicolas" share a token."""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def article_text(article):
+    content = GNEWS_TRUNCATION.sub("", article.get("content") or "")
+    return " ".join([article.get("title") or "", article.get("description") or "", content])
+
+
+def tokens(article):
+    words = TOKEN_RE.findall(fold(article_text(article)))
+    feats = words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+    # Title words get their own namespace: a title mention matters more
+    feats += ["t:" + w for w in TOKEN_RE.findall(fold(article.get("title")))]
+    desc_len = len(article.get("description") or "")
+    feats.append(f"__desc_{min(desc_len // 40, 5)}")
+    return feats
+
+
+def hash_features(articles, n_features=N_FEATURES):
+    """Return ``(rows, cols, counts)`` term counts for a batch of articles."""
+    rows, cols = [], []
+    for i, a in enumerate(articles):
+        toks = tokens(a)
+        rows.extend([i] * len(toks))
+        cols.extend(zlib.crc32(t.encode("utf-8")) % n_features for t in toks)
+    if not rows:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.float32)
+    keys = np.asarray(rows, np.int64) * n_features + np.asarray(cols, np.int64)
+    uniq, counts = np.unique(keys, return_counts=True)
+    return uniq // n_features, uniq % n_features, counts.astype(np.float32)
+
+
+def fit_idf(rows, cols, n_docs, n_features=N_FEATURES):
+    df = np.bincount(cols, minlength=n_features).astype(np.float32)
+    return (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+
+def tfidf(rows, cols, counts, idf, n_docs):
+    vals = (1.0 + np.log(counts)) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=vals * vals, minlength=n_docs))
+    vals = vals / np.maximum(norms[rows], 1e-12)
+    return vals.astype(np.float32)
+
+
+# -----------------------------------------------------
+# 3️⃣ MODEL
+# -----------------------------------------------------
+class RelevanceModel:
+    """Linear model over hashed TF-IDF features."""
+
+    def __init__(self, weights, bias, idf, threshold=RELEVANCE_THRESHOLD, n_features=N_FEATURES, holdout=0.0):
+        self.weights = weights
+        self.bias = float(bias)
+        self.idf = idf
+        self.threshold = float(threshold)
+        self.n_features = n_features
+        self.holdout = float(holdout)   # fraction of holdout_mask() rows left out of training
+
+    def features(self, articles):
+        rows, cols, counts = hash_features(articles, self.n_features)
+        return rows, cols, tfidf(rows, cols, counts, self.idf, len(articles))
+
+    def score(self, articles):
+        """Return the relevance probability of every article, in one pass."""
+        if not articles:
+            return np.zeros(0, np.float32)
+        rows, cols, vals = self.features(articles)
+        z = np.bincount(rows, weights=vals * self.weights[cols], minlength=len(articles)) + self.bias
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def save(self, path=RELEVANCE_MODEL_PATH):
+        with storage.replacing(path) as tmp:
+            np.savez_compressed(
+                tmp, weights=self.weights, bias=self.bias, idf=self.idf,
+                threshold=self.threshold, n_features=self.n_features, holdout=self.holdout,
+            )
+
+    @classmethod
+    def load(cls, path=RELEVANCE_MODEL_PATH):
+        with np.load(path) as z:
+            holdout = float(z["holdout"]) if "holdout" in z.files else 0.0
+            return cls(z["weights"], z["bias"], z["idf"], z["threshold"], int(z["n_features"]), holdout)
+
+
+_model_cache = {}
+
+def load_model(path=RELEVANCE_MODEL_PATH):
+    """Return the trained model, or ``None`` when none has been trained yet."""
+    if not os.path.exists(path):
+        return None
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _model_cache:
+        _model_cache.clear()
+        _model_cache[key] = RelevanceModel.load(path)
+    return _model_cache[key]
+
+
+def train(articles, labels, n_features=N_FEATURES, epochs=300, lr=2.0, l2=1e-4, weights=None):
+    """Fit logistic regression with class-balanced full-batch gradient descent.
+
+    ``weights`` (one per article, default 1) scale each article's loss,
+    e.g. ``GOLD_WEIGHT`` for analyst labels.
+    """
+    y = np.asarray(labels, np.float32)
+    n = len(articles)
+    rows, cols, counts = hash_features(articles, n_features)
+    idf = fit_idf(rows, cols, n, n_features)
+    vals = tfidf(rows, cols, counts, idf, n)
+
+    weights = np.ones(n, np.float32) if weights is None else np.asarray(weights, np.float32)
+    pos = max(float((weights * y).sum()), 1.0)
+    neg = max(float((weights * (1 - y)).sum()), 1.0)
+    total = float(weights.sum())
+    sample_w = (weights * np.where(y > 0, total / (2 * pos), total / (2 * neg))).astype(np.float32)
+
+    w = np.zeros(n_features, np.float32)
+    b = 0.0
+    for _ in range(epochs):
+        z = np.bincount(rows, weights=vals * w[cols], minlength=n) + b
+        p = 1.0 / (1.0 + np.exp(-z))
+        resid = (p - y) * sample_w / n
+        grad = np.bincount(cols, weights=vals * resid[rows], minlength=n_features)
+        w -= (lr * (grad + l2 * w)).astype(np.float32)
+        b -= lr * float(resid.sum())
+    return RelevanceModel(w, b, idf, n_features=n_features)
+
+
+def filter_rank(raw, model):
+    """Keep and rank articles the model deems relevant; ``_score`` is the probability."""
+    probs = model.score(raw)
+    curated = []
+    for r, p in zip(raw, probs):
+        if p >= model.threshold and (r.get("title") or "").strip():
+            r["_score"] = round(float(p), 4)
+            curated.append(r)
+    curated.sort(key=lambda x: x["_score"], reverse=True)
+    return curated
+
+
+# -----------------------------------------------------
+# 4️⃣ TRAINING DATA FROM HISTORY
+# -----------------------------------------------------
+def article_url(a):
+    return a.get("url") or a.get("link") or ""
+
+
+def _load_json_list(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _label_entries(path):
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                yield entry["url"], bool(entry["relevant"]), bool(entry.get("provisional"))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+
+
+def load_analyst_labels(path=LABELS_PATH):
+    return {url: relevant for url, relevant, _ in _label_entries(path)}
+
+
+def provisional_urls(path=LABELS_PATH):
+    """URLs whose label was seeded but not yet judged by an analyst."""
+    return {url for url, _, provisional in _label_entries(path) if provisional}
+
+
+def judged_mask(articles, gold, path=LABELS_PATH):
+    """``gold`` minus the provisional labels: the rows the reported metric uses."""
+    pending = provisional_urls(path)
+    return gold & ~np.array([article_url(a) in pending for a in articles], dtype=bool)
+
+
+def build_dataset(raw_dir="data/raw", curated_dir="data/curated", keywords=None):
+    """Return ``(articles, labels, is_gold)`` built from analyst labels and raw vs curated history.
+
+    ``is_gold`` marks analyst labels. Curated membership and the keyword
+    rules only give weak labels: they are what the model is compared
+    against, so they cannot be what it is evaluated on.
+    """
+    keywords = keywords or RULE_KEYWORDS
+
+    curated_sets = []
+    for path in glob.glob(os.path.join(curated_dir, "**", "*.json"), recursive=True):
+        urls = {article_url(a) for a in _load_json_list(path)} - {""}
+        if urls:
+            curated_sets.append(urls)
+    analyst = load_analyst_labels()
+
+    articles, labels, gold, seen = [], [], [], set()
+    for _, data in archive.iter_files(raw_dir):
+        raw = [a for a in data if isinstance(a, dict) and article_url(a)]
+        urls = {article_url(a) for a in raw}
+        matched = [c for c in curated_sets if c & urls]
+        for a in raw:
+            url = article_url(a)
+            if url in seen:
+                continue
+            seen.add(url)
+            if url in analyst:
+                label, is_gold = analyst[url], True
+            elif matched:
+                label, is_gold = any(url in c for c in matched), False
+            else:
+                label, is_gold = rule_score(a, keywords) is not None, False
+            articles.append(a)
+            labels.append(int(label))
+            gold.append(is_gold)
+    return articles, np.asarray(labels), np.asarray(gold, bool)
+
+
+def gold_weights(gold):
+    return np.where(gold, GOLD_WEIGHT, 1.0).astype(np.float32)
+
+
+def holdout_mask(articles, fraction=HOLDOUT):
+    """Deterministic train/test split keyed on the article URL."""
+    return np.array([zlib.crc32(article_url(a).encode("utf-8")) % 100 < fraction * 100 for a in articles])
+
+
+def precision_recall(pred, truth):
+    pred, truth = np.asarray(pred, bool), np.asarray(truth, bool)
+    tp = float((pred & truth).sum())
+    precision = tp / pred.sum() if pred.sum() else 0.0
+    recall = tp / truth.sum() if truth.sum() else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 3), "recall": round(recall, 3), "f1": round(f1, 3), "n": int(len(truth))}
+
+
+def evaluate(model, articles, labels, gold, keywords=None):
+    """Compare model and keyword rules on gold-labelled articles."""
+    keywords = keywords or RULE_KEYWORDS
+    idx = np.flatnonzero(gold)
+    subset = [articles[i] for i in idx]
+    truth = labels[idx] > 0
+    model_pred = model.score(subset) >= model.threshold
+    rule_pred = [rule_score(a, keywords) is not None for a in subset]
+    return {"model": precision_recall(model_pred, truth), "rules": precision_recall(rule_pred, truth)}
+
+
+def _print_report(title, report):
+    print(f"\n📊 {title}")
+    for name, m in report.items():
+        print(f"   {name:<6} precision={m['precision']:.3f}  recall={m['recall']:.3f}  f1={m['f1']:.3f}  (n={m['n']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or evaluate the local relevance model.")
+    parser.add_argument("command", choices=["train", "eval"])
+    parser.add_argument("--model", default=RELEVANCE_MODEL_PATH)
+    parser.add_argument("--all", action="store_true", help="train: fit on every article, held-out rows included")
+    args = parser.parse_args()
+
+    articles, labels, gold = build_dataset()
+    judged = judged_mask(articles, gold)
+    print(f"🧮 {len(articles)} articles ({int(gold.sum())} analyst-labelled, {int(judged.sum())} judged, "
+          f"{int(labels.sum())} relevant)")
+
+    if args.command == "train":
+        holdout = 0.0 if args.all else HOLDOUT
+        train_idx = np.flatnonzero(~holdout_mask(articles, holdout))
+        model = train([articles[i] for i in train_idx], labels[train_idx], weights=gold_weights(gold[train_idx]))
+        model.holdout = holdout
+        model.save(args.model)
+        print(f"✅ Relevance model saved → {args.model} (trained on {len(train_idx)} articles)")
+    else:
+        model = load_model(args.model)
+        if model is None:
+            raise SystemExit(f"❌ No model at {args.model}; run `python -m src.relevance train` first.")
+
+    if model.holdout:
+        test_idx = np.flatnonzero(holdout_mask(articles, model.holdout))
+        title = "Held-out evaluation"
+    else:
+        test_idx = np.arange(len(articles))
+        title = "In-sample evaluation (the model was trained on these rows)"
+    test = [articles[i] for i in test_idx]
+    if judged[test_idx].any():
+        _print_report(f"{title}, analyst-judged labels", evaluate(model, test, labels[test_idx], judged[test_idx]))
+    else:
+        print("\n⚠️ No analyst-judged labels in the evaluation rows; precision/recall is not reported.")
+    pending = gold[test_idx] & ~judged[test_idx]
+    if pending.any():
+        _print_report(f"{title}, PROVISIONAL labels (seeded, not analyst-judged; not the reported metric)",
+                      evaluate(model, test, labels[test_idx], pending))
@@ -0,0 +1,90 @@
+"""Pre-rendered HTML pages for daily and weekly reports.
+
+The pipelines render each report once, when they write it, to a
+sanitized HTML file next to the markdown (``venezuela_<date>.html``).
+The dashboard then loads only the page it shows instead of re-rendering
+markdown on every rerun. Rendering uses markdown-it in CommonMark mode
+with raw HTML disabled (escaped) and its default link validation, which
+rejects ``javascript:``/``vbscript:``/``file:`` URLs.
+
+``archive_months`` groups report labels by month for the paginated
+selectors; it re-scans a directory only when the directory changes.
+
+Usage::
+
+    python -m src.render   # pre-render any report whose page is missing or stale
+"""
+
+import glob, os
+from collections import OrderedDict
+
+from markdown_it import MarkdownIt
+
+from src import storage
+
+_md = MarkdownIt("commonmark", {"html": False, "linkify": False, "typographer": False}).enable("table")
+
+
+def render_markdown(text):
+    return _md.render(text or "")
+
+
+def html_path(md_path):
+    return os.path.splitext(md_path)[0] + ".html"
+
+
+def write_html(md_path, text=None):
+    """Render ``md_path`` (or ``text``, its content) to the sibling ``.html`` file."""
+    if text is None:
+        with open(md_path, "r", encoding="utf-8") as f:
+            text = f.read()
+    return storage.atomic_write_text(html_path(md_path), render_markdown(text))
+
+
+def load_page(md_path):
+    """Return the pre-rendered page, rendering in memory if it is missing or stale."""
+    out = html_path(md_path)
+    if os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(md_path):
+        with open(out, "r", encoding="utf-8") as f:
+            return f.read()
+    with open(md_path, "r", encoding="utf-8") as f:
+        return render_markdown(f.read())
+
+
+_months_cache = {}
+
+def archive_months(dir_path, prefix):
+    """``{"YYYY-MM": [label, ...]}`` for ``<prefix><label>.md`` reports, newest first."""
+    if not os.path.isdir(dir_path):
+        return OrderedDict()
+    key = (os.path.abspath(dir_path), prefix)
+    mtime = os.path.getmtime(dir_path)
+    cached = _months_cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    labels = sorted(
+        (e.name[len(prefix):-len(".md")] for e in os.scandir(dir_path)
+         if e.name.startswith(prefix) and e.name.endswith(".md")),
+        reverse=True,
+    )
+    months = OrderedDict()
+    for label in labels:
+        months.setdefault(label[:7], []).append(label)
+    _months_cache[key] = (mtime, months)
+    return months
+
+
+def render_all(dirs=("outputs/daily", "outputs/weekly")):
+    """Pre-render every report whose page is missing or older than its markdown."""
+    n = 0
+    for d in dirs:
+        for md_path in glob.glob(os.path.join(d, "*.md")):
+            out = html_path(md_path)
+            if not os.path.exists(out) or os.path.getmtime(out) < os.path.getmtime(md_path):
+                write_html(md_path)
+                n += 1
+    return n
+
+
+if __name__ == "__main__":
+    print(f"✅ Pre-rendered {render_all()} report page(s).")
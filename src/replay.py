@@ -0,0 +1,582 @@
+"""Offline replay harness: local GNews and OpenAI stand-ins for load tests.
+
+Small HTTP servers replace the external APIs:
+
+- a fake GNews ``/search`` endpoint serving the recorded
+  ``data/raw/news_*.json`` articles, filtered by language and by the
+  ``from``/``to`` window of each request;
+- a fake OpenAI ``/chat/completions`` endpoint (plain and streaming)
+  answering each pipeline prompt with output that passes its
+  validation, with token usage counted locally, plus the ``/files`` and
+  ``/batches`` endpoints used by batch mode (src/batch.py);
+- fake publishers serving each recorded article as an HTML page at
+  ``/<host>/<path>`` (plus ``robots.txt``) for full-text enrichment
+  (src/enrich.py), counting requests in flight per host.
+
+All take configurable latency, a random 5xx error rate and
+requests-/tokens-per-minute limits (answered with 429 and
+``Retry-After``). A replay run copies the context files into a scratch
+directory, runs the real daily or weekly pipeline there as a subprocess
+pointed at the fakes (``GNEWS_BASE_URL``/``OPENAI_BASE_URL``/
+``ENRICH_BASE_URL``), and
+reports end-to-end throughput, per-call latency and what the fakes saw.
+
+Usage::
+
+    python -m src.replay daily --since 2025-11-03 --until 2025-11-30
+    python -m src.replay daily --enrich --pages-latency 0.5   # with full-text enrichment
+    python -m src.replay weekly --since 2025-11-03 --until 2025-11-30 --openai-latency 1.5 --openai-rpm 60
+    python -m src.replay serve      # keep both fakes up for manual runs or the dashboard
+"""
+
+import argparse, email.policy, glob, html, json, os, random, re, shutil, subprocess, sys, tempfile, threading, time
+from collections import Counter, deque
+from datetime import date, timedelta
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from src import archive
+from src.relevance import GNEWS_TRUNCATION
+from src.tokens import count_message_tokens, count_tokens
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COPIED_DIRS = ("data/context", "data/models")
+
+
+# -----------------------------------------------------
+# 1️⃣ FAULTS: latency, errors, rate limits
+# -----------------------------------------------------
+class Faults:
+    """Latency, random 5xx errors and per-minute limits for one fake API."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rpm=0, tpm=0):
+        self.latency, self.jitter, self.error_rate = latency, jitter, error_rate
+        self.rpm, self.tpm = rpm, tpm
+        self._lock = threading.Lock()
+        self._window = deque()       # (time, tokens) of admitted requests
+        self._tokens = 0
+        self.counts = Counter()      # status code → requests
+        self.latencies = []
+
+    def admit(self, tokens=0):
+        """Wait out the latency; return ``(status, retry_after)`` to fail with, or ``(None, None)``."""
+        time.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0.0))
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0][0] >= 60:
+                self._tokens -= self._window.popleft()[1]
+            over_rpm = self.rpm and len(self._window) >= self.rpm
+            over_tpm = self.tpm and self._window and self._tokens + tokens > self.tpm
+            if over_rpm or over_tpm:
+                return 429, max(60 - (now - self._window[0][0]), 1)
+            self._window.append((now, tokens))
+            self._tokens += tokens
+        if random.random() < self.error_rate:
+            return random.choice((500, 502, 503)), None
+        return None, None
+
+    def record(self, status, seconds):
+        with self._lock:
+            self.counts[status] += 1
+            self.latencies.append(seconds)
+
+    def summary(self):
+        with self._lock:
+            lat = np.array(self.latencies or [0.0])
+            return {
+                "requests": sum(self.counts.values()),
+                "status": {str(k): v for k, v in sorted(self.counts.items())},
+                "p50_s": round(float(np.percentile(lat, 50)), 3),
+                "p95_s": round(float(np.percentile(lat, 95)), 3),
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ReplayFake/1.0"
+    protocol_version = "HTTP/1.1"     # keep-alive, like the real APIs
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.faults.record(status, time.perf_counter() - self._t0)
+
+    def _send_text(self, status, text, content_type="text/plain; charset=utf-8"):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.faults.record(status, time.perf_counter() - self._t0)
+
+    def _rejected(self, tokens=0):
+        """Apply the fault model; send the error and return True if the request fails."""
+        self._t0 = time.perf_counter()
+        status, retry_after = self.server.faults.admit(tokens)
+        if status is None:
+            return False
+        headers = {"Retry-After": str(int(retry_after))} if retry_after else None
+        error = {"message": "rate limit exceeded" if status == 429 else "upstream error", "code": status}
+        self._send_json(status, {"error": error, "errors": [error["message"]]}, headers)
+        return True
+
+
+# -----------------------------------------------------
+# 2️⃣ FAKE GNEWS
+# -----------------------------------------------------
+def load_archive(raw_dir="data/raw"):
+    """Recorded articles by language, sorted by publication time, de-duplicated by URL."""
+    by_lang, seen = {}, set()
+    for _, data in archive.iter_files(raw_dir):
+        for a in data:
+            if not isinstance(a, dict) or not a.get("publishedAt"):
+                continue
+            lang = a.get("lang") or "en"
+            key = (lang, a.get("url") or a.get("title"))
+            if key in seen:
+                continue
+            seen.add(key)
+            by_lang.setdefault(lang, []).append({k: v for k, v in a.items() if k != "lang" and not k.startswith("_")})
+    for articles in by_lang.values():
+        articles.sort(key=lambda a: a["publishedAt"])
+    return by_lang
+
+
+def recorded_range(raw_dir="data/raw"):
+    """First and last day of the latest unbroken run of recorded daily files, or ``None``.
+
+    The daily pipeline stops at the first day without articles, so the
+    default replay covers only consecutive recorded days.
+    """
+    days = archive.days(raw_dir)
+    if not days:
+        return None
+    first = days[-1]
+    while first - timedelta(days=1) in days:
+        first -= timedelta(days=1)
+    return first, days[-1]
+
+
+class GNewsHandler(_Handler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/search"):
+            self._t0 = time.perf_counter()
+            return self._send_json(404, {"errors": ["not found"]})
+        if self._rejected():
+            return
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if not params.get("apikey"):
+            return self._send_json(401, {"errors": ["You did not provide an API key."]})
+        start, end = params.get("from", ""), params.get("to", "￿")
+        matches = [a for a in self.server.archive.get(params.get("lang", "en"), []) if start <= a["publishedAt"] <= end]
+        limit = int(params.get("max", 10))
+        self.server.served += min(len(matches), limit)
+        self._send_json(200, {"totalArticles": len(matches), "articles": matches[:limit]})
+
+
+# Article pages, for full-text enrichment
+def page_key(url):
+    """``host/path`` of an article URL, as requested through ``ENRICH_BASE_URL``."""
+    parts = urlparse(url or "")
+    return f"{parts.netloc}{parts.path or '/'}"
+
+
+def article_page(article):
+    """An HTML page for a recorded article: site chrome around a body longer than the GNews excerpt."""
+    title = html.escape(article.get("title") or "")
+    description = article.get("description") or ""
+    body = [description, GNEWS_TRUNCATION.sub("", article.get("content") or "")]
+    body += [f"Replayed paragraph {i} of the full story: {description}" for i in range(2, 6)]
+    paragraphs = "\n".join(f"<p>{html.escape(p)}</p>" for p in body if p)
+    return f"""<!doctype html><html><head><title>{title}</title><script>window.ads = [];</script></head><body>
+<header><nav><p>Home · World · Americas · Business · Markets · Opinion · Subscribe now</p></nav></header>
+<main><article><h1>{title}</h1>
+{paragraphs}
+<div class="newsletter-signup"><p>Sign up for our daily briefing and get the top stories in your inbox.</p></div>
+</article></main>
+<footer><p>© Replay Publisher. All rights reserved. Terms of use · Privacy policy · Cookie settings.</p></footer>
+</body></html>"""
+
+
+class PublisherHandler(_Handler):
+    def do_GET(self):
+        self._t0 = time.perf_counter()
+        key = urlparse(self.path).path.lstrip("/")
+        host = key.split("/", 1)[0]
+        if key == f"{host}/robots.txt":
+            return self._send_text(200, "User-agent: *\nDisallow: /private/\n")
+        with self.server.lock:
+            self.server.in_flight[host] += 1
+            self.server.max_in_flight[host] = max(self.server.max_in_flight[host], self.server.in_flight[host])
+        try:
+            if self._rejected():
+                return
+            article = self.server.pages.get(key)
+            if article is None:
+                return self._send_text(404, "not found")
+            self._send_text(200, article_page(article), "text/html; charset=utf-8")
+        finally:
+            with self.server.lock:
+                self.server.in_flight[host] -= 1
+
+
+# -----------------------------------------------------
+# 3️⃣ FAKE OPENAI
+# -----------------------------------------------------
+def answer(messages):
+    """Output for each pipeline prompt that passes the pipeline's validation."""
+    system = messages[0]["content"] if len(messages) > 1 else ""
+    user = messages[-1]["content"] if messages else ""
+    if "extract structured facts" in system:
+        titles = re.findall(r"^\[(\d+)\] Title: (.*)\nPublished: (.*)$", user, re.MULTILINE)
+        return json.dumps({"records": [
+            {"article": int(n), "actors": ["Venezuela"], "event_type": "statement", "location": "Venezuela",
+             "date": published[:10], "key_claim": title}
+            for n, title, published in titles
+        ]}, ensure_ascii=False)
+    if "valid JSON array" in user:
+        scenarios = re.findall(r"^### (\S+) – (.+)$", user, re.MULTILINE)
+        return json.dumps([
+            {"id": sid, "title": title, "plausibility": "steady",
+             "reasoning": "Replayed assessment: no decisive change in the recorded evidence.", "updated_confidence": 0.5}
+            for sid, title in scenarios
+        ], ensure_ascii=False)
+    if "Key Developments Today" in user:
+        headlines = re.findall(r"^- (?:\[[^\]]*\] )?(.+?)(?: \[http[^\]]*\])?$", user, re.MULTILINE)[:5]
+        headlines += ["No further developments recorded."] * (3 - len(headlines))
+        bullets = "\n".join(f"- {h}" for h in headlines)
+        return f"Replayed daily update covering {len(headlines)} storylines.\n\n**Key Developments Today**\n{bullets}"
+    if "Weekly Watch" in user:
+        return ("## Factual Summary\nReplayed weekly summary.\n\n"
+                "## Scenario Assessment\nNo scenario shifted decisively.\n\n"
+                "## Forward Outlook\n- Follow-up statements\n- Sanctions policy\n- Regional deployments")
+    return f"Replayed answer to: {user[:200]}"
+
+
+def completion(model, messages, text):
+    """A chat.completion object for ``text``, with locally counted usage."""
+    usage = {"prompt_tokens": count_message_tokens(messages), "completion_tokens": count_tokens(text)}
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+    return {
+        "id": f"chatcmpl-replay-{random.getrandbits(48):x}", "object": "chat.completion",
+        "created": int(time.time()), "model": model, "usage": usage,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+    }
+
+
+def _store_file(server, content, filename, purpose):
+    file_id = f"file-replay-{random.getrandbits(48):x}"
+    server.files[file_id] = {
+        "id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+        "filename": filename, "purpose": purpose, "status": "processed", "content": content,
+    }
+    return file_id
+
+
+def run_batch(server, batch_id):
+    """Answer every line of a batch after ``server.batch_seconds``, like the offline worker.
+
+    Each line fails with the fake's error rate; failures go to the
+    batch's error file as on the real endpoint.
+    """
+    batch = server.batches[batch_id]
+    batch.update(status="in_progress", in_progress_at=int(time.time()))
+    time.sleep(server.batch_seconds)
+    done, failed = [], []
+    for line in server.files[batch["input_file_id"]]["content"].decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        row = {"id": f"batch_req_{random.getrandbits(48):x}", "custom_id": request["custom_id"]}
+        if random.random() < server.faults.error_rate:
+            failed.append({**row, "response": None, "error": {"code": "server_error", "message": "replayed failure"}})
+            continue
+        messages = request["body"].get("messages") or []
+        body = completion(request["body"].get("model"), messages, answer(messages))
+        done.append({**row, "response": {"status_code": 200, "body": body}, "error": None})
+    for rows, field, name in ((done, "output_file_id", "output"), (failed, "error_file_id", "errors")):
+        if rows:
+            content = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode("utf-8")
+            batch[field] = _store_file(server, content, f"{batch_id}_{name}.jsonl", "batch_output")
+    batch.update(status="completed", completed_at=int(time.time()),
+                 request_counts={"total": len(done) + len(failed), "completed": len(done), "failed": len(failed)})
+
+
+class OpenAIHandler(_Handler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = urlparse(self.path).path.rstrip("/")
+        if path.endswith("/files"):
+            return self._upload(body)
+        if path.endswith("/batches"):
+            return self._create_batch(json.loads(body or b"{}"))
+        if not path.endswith("/chat/completions"):
+            self._t0 = time.perf_counter()
+            return self._send_json(404, {"error": {"message": "not found"}})
+        request = json.loads(body or b"{}")
+        messages = request.get("messages") or []
+        if self._rejected(count_message_tokens(messages) + (request.get("max_tokens") or 0)):
+            return
+        response = completion(request.get("model"), messages, answer(messages))
+        if request.get("stream"):
+            usage = response["usage"] if (request.get("stream_options") or {}).get("include_usage") else None
+            return self._stream({k: response[k] for k in ("id", "created", "model")},
+                                response["choices"][0]["message"]["content"], usage)
+        self._send_json(200, response)
+
+    def do_GET(self):
+        self._t0 = time.perf_counter()
+        parts = urlparse(self.path).path.rstrip("/").split("/")
+        if len(parts) >= 2 and parts[-2] == "batches" and parts[-1] in self.server.batches:
+            return self._send_json(200, self.server.batches[parts[-1]])
+        if len(parts) >= 3 and parts[-3] == "files" and parts[-1] == "content" and parts[-2] in self.server.files:
+            content = self.server.files[parts[-2]]["content"]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+            return self.server.faults.record(200, time.perf_counter() - self._t0)
+        self._send_json(404, {"error": {"message": "not found"}})
+
+    # ---- batch endpoints (no latency or HTTP faults; lines fail instead) ----
+    def _upload(self, body):
+        self._t0 = time.perf_counter()
+        form = BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("latin-1") + body
+        )
+        fields = {part.get_param("name", header="content-disposition"): part for part in form.iter_parts()}
+        upload = fields.get("file")
+        if upload is None:
+            return self._send_json(400, {"error": {"message": "missing file"}})
+        purpose = fields["purpose"].get_content() if "purpose" in fields else "batch"
+        file_id = _store_file(self.server, upload.get_payload(decode=True), upload.get_filename() or "input.jsonl", purpose)
+        self._send_json(200, {k: v for k, v in self.server.files[file_id].items() if k != "content"})
+
+    def _create_batch(self, request):
+        self._t0 = time.perf_counter()
+        if request.get("input_file_id") not in self.server.files:
+            return self._send_json(400, {"error": {"message": "unknown input_file_id"}})
+        batch_id = f"batch_replay_{random.getrandbits(48):x}"
+        self.server.batches[batch_id] = {
+            "id": batch_id, "object": "batch", "endpoint": request.get("endpoint"),
+            "input_file_id": request["input_file_id"], "completion_window": request.get("completion_window", "24h"),
+            "status": "validating", "created_at": int(time.time()), "metadata": request.get("metadata"),
+        }
+        threading.Thread(target=run_batch, args=(self.server, batch_id), daemon=True).start()
+        self._send_json(200, self.server.batches[batch_id])
+
+    def _stream(self, head, text, usage=None):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        words = re.findall(r"\S+\s*", text) or [""]
+        for i in range(0, len(words), 8):
+            delta = {"content": "".join(words[i:i + 8])}
+            chunk = {**head, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+        done = {**head, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        self.wfile.write(f"data: {json.dumps(done)}\n\n".encode("utf-8"))
+        if usage is not None:   # stream_options={"include_usage": true}: one last chunk with no choices
+            tail = {**head, "object": "chat.completion.chunk", "choices": [], "usage": usage}
+            self.wfile.write(f"data: {json.dumps(tail)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+        self.server.faults.record(200, time.perf_counter() - self._t0)
+
+
+# -----------------------------------------------------
+# 4️⃣ SERVERS
+# -----------------------------------------------------
+def start_server(handler, faults, port=0, **attrs):
+    """Serve ``handler`` on localhost in a daemon thread; ``port=0`` picks a free one."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.faults = faults
+    for k, v in attrs.items():
+        setattr(server, k, v)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_fakes(gnews_faults=None, openai_faults=None, raw_dir="data/raw", gnews_port=0, openai_port=0,
+                batch_seconds=1.0):
+    """Start both fakes; return ``(gnews_server, openai_server, env)`` with the env vars pointing at them."""
+    gnews = start_server(GNewsHandler, gnews_faults or Faults(), gnews_port, archive=load_archive(raw_dir), served=0)
+    openai = start_server(OpenAIHandler, openai_faults or Faults(), openai_port,
+                          files={}, batches={}, batch_seconds=batch_seconds)
+    env = {
+        "GNEWS_BASE_URL": f"http://127.0.0.1:{gnews.server_port}/api/v4",
+        "GNEWS_API_KEY": "replay",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{openai.server_port}/v1",
+        "OPENAI_API_KEY": "replay",
+        "LLM_PROVIDER": "openai",
+    }
+    return gnews, openai, env
+
+
+def start_publisher(faults=None, raw_dir="data/raw", port=0):
+    """Start the fake publishers; return ``(server, env)``."""
+    pages = {page_key(a.get("url")): a for articles in load_archive(raw_dir).values() for a in articles if a.get("url")}
+    server = start_server(PublisherHandler, faults or Faults(), port, pages=pages, lock=threading.Lock(),
+                          in_flight=Counter(), max_in_flight=Counter())
+    return server, {"ENRICH_BASE_URL": f"http://127.0.0.1:{server.server_port}"}
+
+
+# -----------------------------------------------------
+# 5️⃣ REPLAY RUNS
+# -----------------------------------------------------
+def prepare_workdir(workdir=None):
+    """Scratch directory holding copies of the context files the pipelines read."""
+    workdir = workdir or tempfile.mkdtemp(prefix="replay_")
+    for rel in COPIED_DIRS:
+        src = os.path.join(REPO_ROOT, rel)
+        if os.path.isdir(src):
+            shutil.copytree(src, os.path.join(workdir, rel), dirs_exist_ok=True)
+    return workdir
+
+
+def pipeline_command(kind, since, until):
+    if kind == "daily":
+        return [sys.executable, "-m", "src.daily_pipeline", "--since", str(since), "--until", str(until)]
+    # Weekly: every week from the one starting ``since`` through the one containing ``until``
+    monday = since - timedelta(days=since.weekday())
+    today = until - timedelta(days=until.weekday()) + timedelta(days=7)
+    return [sys.executable, "-m", "src.weekly_watch", "--since", str(monday), "--today", str(today)]
+
+
+def _routing_latencies(workdir):
+    from src.config import LLM_ROUTING_LOG
+
+    path = os.path.join(workdir, LLM_ROUTING_LOG)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(kind, since, until, gnews_faults=None, openai_faults=None, workdir=None, raw_dir="data/raw",
+        request_interval=0.0, enrich=False, pages_faults=None):
+    """Run the real ``kind`` pipeline ("daily" or "weekly") against the fakes; return a report dict.
+
+    With ``enrich`` the pipeline fetches full text from the fake publishers.
+    """
+    workdir = prepare_workdir(workdir)
+    gnews, openai, env = start_fakes(gnews_faults, openai_faults, raw_dir)
+    pages, pages_env = start_publisher(pages_faults, raw_dir)
+    env = {**os.environ, **env, **pages_env, "GNEWS_REQUEST_INTERVAL_S": str(request_interval),
+           "ENRICH_FULLTEXT": "1" if enrich else "0",
+           "PYTHONPATH": os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")]))}
+    log_path = os.path.join(workdir, f"replay_{kind}.log")
+    print(f"▶️ Replaying {kind} {since} → {until} in {workdir}")
+    t0 = time.perf_counter()
+    try:
+        with open(log_path, "w", encoding="utf-8") as log:
+            proc = subprocess.run(pipeline_command(kind, since, until), cwd=workdir, env=env,
+                                  stdout=log, stderr=subprocess.STDOUT)
+        wall = time.perf_counter() - t0
+    finally:
+        gnews.shutdown()
+        openai.shutdown()
+        pages.shutdown()
+
+    reports = glob.glob(os.path.join(workdir, "outputs", kind, "*.md"))
+    calls = _routing_latencies(workdir)
+    lat = np.array([c["latency_s"] for c in calls] or [0.0])
+    report = {
+        "kind": kind, "since": str(since), "until": str(until), "workdir": workdir,
+        "exit_code": proc.returncode, "wall_s": round(wall, 2),
+        "reports": len(reports),
+        "reports_per_min": round(len(reports) / wall * 60, 2) if wall else None,
+        "articles_served": gnews.served,
+        "articles_per_s": round(gnews.served / wall, 1) if wall else None,
+        "llm_calls": len(calls),
+        "llm_retries": sum(c.get("retries", 0) for c in calls),
+        "llm_throttled_s": round(sum(c.get("throttled_s", 0) for c in calls), 2),
+        "llm_p50_s": round(float(np.percentile(lat, 50)), 3),
+        "llm_p95_s": round(float(np.percentile(lat, 95)), 3),
+        "gnews": gnews.faults.summary(),
+        "openai": openai.faults.summary(),
+        "pages": {**pages.faults.summary(), "max_per_host": max(pages.max_in_flight.values(), default=0)},
+        "log": log_path,
+    }
+    with open(os.path.join(workdir, f"replay_{kind}.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def print_report(r):
+    icon = "✅" if r["exit_code"] == 0 else "❌"
+    print(f"{icon} {r['kind']}: {r['reports']} report(s) in {r['wall_s']}s ({r['reports_per_min']}/min), exit {r['exit_code']}")
+    print(f"📰 GNews: {r['articles_served']} articles ({r['articles_per_s']}/s), "
+          f"{r['gnews']['requests']} requests {r['gnews']['status']}, p95 {r['gnews']['p95_s']}s")
+    print(f"🤖 OpenAI: {r['llm_calls']} calls, {r['llm_retries']} retries, {r['llm_throttled_s']}s throttled, "
+          f"latency p50 {r['llm_p50_s']}s / p95 {r['llm_p95_s']}s; server saw {r['openai']['status']}")
+    if r["pages"]["requests"]:
+        print(f"📖 Pages: {r['pages']['requests']} requests {r['pages']['status']}, "
+              f"p95 {r['pages']['p95_s']}s, at most {r['pages']['max_per_host']} in flight per host")
+    print(f"🗂️ Outputs and log under {r['workdir']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded news against local GNews/OpenAI stand-ins.")
+    parser.add_argument("command", choices=["daily", "weekly", "serve"])
+    parser.add_argument("--since", type=date.fromisoformat, help="first date (default: start of the latest recorded run of days)")
+    parser.add_argument("--until", type=date.fromisoformat, help="last date (default: last recorded day)")
+    parser.add_argument("--workdir", help="scratch directory (default: a new temp dir)")
+    parser.add_argument("--raw-dir", default="data/raw")
+    parser.add_argument("--interval", type=float, default=0.0, help="pipeline pause between GNews calls")
+    parser.add_argument("--enrich", action="store_true", help="enable full-text enrichment against the fake publishers")
+    for api, latency in (("gnews", 0.2), ("openai", 0.8), ("pages", 0.3)):
+        parser.add_argument(f"--{api}-latency", type=float, default=latency, help="seconds per request")
+        parser.add_argument(f"--{api}-jitter", type=float, default=latency / 2)
+        parser.add_argument(f"--{api}-error-rate", type=float, default=0.0, help="share of requests failing with 5xx")
+        parser.add_argument(f"--{api}-rpm", type=int, default=0, help="requests per minute before 429 (0 = unlimited)")
+    parser.add_argument("--openai-tpm", type=int, default=0, help="tokens per minute before 429 (0 = unlimited)")
+    parser.add_argument("--batch-seconds", type=float, default=5.0, help="time the fake takes to finish a batch")
+    parser.add_argument("--gnews-port", type=int, default=0)
+    parser.add_argument("--openai-port", type=int, default=0)
+    args = parser.parse_args()
+
+    faults = {
+        api: Faults(getattr(args, f"{api}_latency"), getattr(args, f"{api}_jitter"),
+                    getattr(args, f"{api}_error_rate"), getattr(args, f"{api}_rpm"),
+                    args.openai_tpm if api == "openai" else 0)
+        for api in ("gnews", "openai", "pages")
+    }
+    if args.command == "serve":
+        gnews, openai, env = start_fakes(faults["gnews"], faults["openai"], args.raw_dir, args.gnews_port, args.openai_port,
+                                         args.batch_seconds)
+        pages, pages_env = start_publisher(faults["pages"], args.raw_dir)
+        env.update(pages_env)
+        print("🛰️ Fakes running; export these to use them (Ctrl+C to stop):")
+        for k, v in env.items():
+            print(f"export {k}={v}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print(f"\n📊 GNews {gnews.faults.summary()}\n📊 OpenAI {openai.faults.summary()}\n📊 Pages {pages.faults.summary()}")
+    else:
+        recorded = recorded_range(args.raw_dir)
+        if recorded is None and not (args.since and args.until):
+            raise SystemExit(f"❌ No recorded daily files under {args.raw_dir}.")
+        since, until = args.since or recorded[0], args.until or recorded[1]
+        print_report(run(args.command, since, until, faults["gnews"], faults["openai"], args.workdir,
+                         args.raw_dir, args.interval, args.enrich, faults["pages"]))
@@ -0,0 +1,263 @@
+"""Long-running service mode for the daily, weekly and intraday jobs.
+
+Instead of an external scheduler re-launching ``daily_pipeline`` and
+``weekly_watch`` as separate scripts, this module keeps one process
+alive and runs the jobs on an internal clock in the configured local
+timezone. Because the pipelines stay imported, their OpenAI client,
+HTTP session and cached context/scenarios are reused between runs.
+
+Run with ``python -m src.scheduler``; ``GET /health`` and ``GET /status``
+on ``STATUS_PORT`` report liveness and per-job history.
+"""
+
+import argparse, json, threading, time, traceback
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src import archive, assessment, daily_pipeline, deadline, weekly_watch
+from src.config import (
+    LOCAL_TZ_NAME, LOCAL_ZONE, DAILY_RUN_AT, DAILY_DEADLINE, WEEKLY_RUN_AT, INTRADAY_EVERY_MINUTES, STATUS_PORT,
+    SCENARIO_PULSE_AFTER_DAILY, RAW_COMPACT_AFTER_DAILY,
+)
+
+WEEKDAYS = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
+MAX_SLEEP_SECONDS = 30  # wake up regularly so clock jumps/DST are picked up
+
+
+# -----------------------------------------------------
+# 🕒 NEXT-RUN CALCULATIONS (all in local wall-clock time)
+# -----------------------------------------------------
+def _parse_hhmm(value):
+    hour, minute = value.split(":")
+    return int(hour), int(minute)
+
+
+def next_daily_run(now, at=DAILY_RUN_AT):
+    """Return the next local datetime strictly after ``now`` at ``at`` (HH:MM)."""
+    hour, minute = _parse_hhmm(at)
+    local = now.astimezone(LOCAL_ZONE)
+    candidate = datetime(local.year, local.month, local.day, hour, minute, tzinfo=LOCAL_ZONE)
+    if candidate <= local:
+        day = local.date() + timedelta(days=1)
+        candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=LOCAL_ZONE)
+    return candidate
+
+
+def next_weekly_run(now, at=WEEKLY_RUN_AT):
+    """Return the next local datetime on weekday ``at[0]`` at time ``at[1]``."""
+    weekday, hhmm = at
+    target = WEEKDAYS.index(weekday.upper()[:3])
+    candidate = next_daily_run(now, hhmm)
+    while candidate.weekday() != target:
+        day = candidate.date() + timedelta(days=1)
+        candidate = datetime(day.year, day.month, day.day, candidate.hour, candidate.minute, tzinfo=LOCAL_ZONE)
+    return candidate
+
+
+def next_interval_run(now, minutes):
+    """Return ``now`` plus the interval, in local time."""
+    return now.astimezone(LOCAL_ZONE) + timedelta(minutes=minutes)
+
+
+# -----------------------------------------------------
+# 🧰 JOBS
+# -----------------------------------------------------
+class Job:
+    """A named callable with a next-run rule and a small run history."""
+
+    def __init__(self, name, fn, next_run):
+        self.name = name
+        self.fn = fn
+        self.next_run = next_run
+        self.due_at = None
+        self.runs = 0
+        self.failures = 0
+        self.last_started = None
+        self.last_duration_s = None
+        self.last_status = None
+        self.last_error = None
+        self.running = False
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "due_at": self.due_at.isoformat() if self.due_at else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "running": self.running,
+            "last_started": self.last_started.isoformat() if self.last_started else None,
+            "last_duration_s": self.last_duration_s,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+        }
+
+
+class Scheduler:
+    """Run jobs sequentially whenever they fall due.
+
+    Jobs run one at a time on the scheduler thread: the pipelines share
+    files under ``data/`` and ``outputs/`` and are not meant to overlap.
+    """
+
+    def __init__(self, jobs, clock=None):
+        self.jobs = jobs
+        self.clock = clock or (lambda: datetime.now(LOCAL_ZONE))
+        self.started_at = self.clock()
+        self._stop = threading.Event()
+        for job in self.jobs:
+            job.due_at = job.next_run(self.started_at)
+
+    def run_job(self, job):
+        job.running = True
+        job.last_started = self.clock()
+        t0 = time.perf_counter()
+        print(f"\n⏰ [{job.last_started:%Y-%m-%d %H:%M %Z}] Running job: {job.name}")
+        try:
+            job.fn()
+            job.last_status = "ok"
+            job.last_error = None
+        except (Exception, SystemExit) as exc:
+            job.failures += 1
+            job.last_status = "error"
+            job.last_error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+            print(f"⚠️ Job {job.name} failed: {job.last_error}")
+            traceback.print_exc()
+        finally:
+            job.runs += 1
+            job.running = False
+            job.last_duration_s = round(time.perf_counter() - t0, 3)
+            job.due_at = job.next_run(self.clock())
+
+    def run_pending(self):
+        """Run every job that is due now; return the names that ran."""
+        ran = []
+        for job in self.jobs:
+            if job.due_at is not None and job.due_at <= self.clock():
+                self.run_job(job)
+                ran.append(job.name)
+        return ran
+
+    def run_forever(self):
+        print(f"🛰️ Scheduler started ({LOCAL_TZ_NAME}); jobs: {', '.join(j.name for j in self.jobs)}")
+        for job in self.jobs:
+            print(f"   • {job.name}: next run {job.due_at:%Y-%m-%d %H:%M %Z}")
+        while not self._stop.is_set():
+            self.run_pending()
+            next_due = min(j.due_at for j in self.jobs)
+            wait = (next_due - self.clock()).total_seconds()
+            self._stop.wait(max(0.0, min(wait, MAX_SLEEP_SECONDS)))
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        return {
+            "status": "ok",
+            "timezone": LOCAL_TZ_NAME,
+            "now": self.clock().isoformat(),
+            "started_at": self.started_at.isoformat(),
+            "jobs": [j.as_dict() for j in self.jobs],
+        }
+
+
+# -----------------------------------------------------
+# 📋 DEFAULT JOBS (state kept in memory between runs)
+# -----------------------------------------------------
+def build_default_jobs(state=None):
+    """Create the daily, weekly and (optional) intraday jobs.
+
+    ``state`` remembers the newest report of each kind so the output
+    directories are scanned only once at startup.
+    """
+    state = state if state is not None else {}
+    state.setdefault("last_daily", daily_pipeline.latest_report_date())
+    state.setdefault("last_weekly", weekly_watch.find_latest_report_start())
+
+    def daily():
+        # Stages degrade (cached raw data, smaller prompt, ...) as needed
+        # for the brief to be out by DAILY_DEADLINE (src/deadline.py).
+        generated = daily_pipeline.run_daily(last_saved=state["last_daily"], due=deadline.due_today(DAILY_DEADLINE))
+        if generated:
+            state["last_daily"] = generated[-1]
+            if SCENARIO_PULSE_AFTER_DAILY:
+                # Re-assesses only scenarios the day's articles bear on
+                assessment.run_pulse(day=generated[-1])
+        if RAW_COMPACT_AFTER_DAILY:
+            # Keeps data/raw to recent files plus one segment per month
+            archive.compact()
+
+    def weekly():
+        local_today = datetime.now(LOCAL_ZONE).date()
+        generated = weekly_watch.run_weekly(
+            local_today=local_today,
+            latest_existing_start=state["last_weekly"],
+            context=weekly_watch.load_context(),
+            scenarios=weekly_watch.load_scenarios(),
+        )
+        if generated:
+            state["last_weekly"] = generated[-1]
+
+    def intraday():
+        # Refresh today's raw/curated articles so far; the daily run for
+        # this date happens after the local day closes.
+        today = datetime.now(LOCAL_ZONE).date()
+        articles, _ = daily_pipeline.fetch_articles(report_date=today)
+        if articles:
+            daily_pipeline.clean_rank(articles, today)
+
+    jobs = [
+        Job("daily", daily, lambda now: next_daily_run(now, DAILY_RUN_AT)),
+        Job("weekly", weekly, lambda now: next_weekly_run(now, WEEKLY_RUN_AT)),
+    ]
+    if INTRADAY_EVERY_MINUTES > 0:
+        jobs.append(Job("intraday", intraday, lambda now: next_interval_run(now, INTRADAY_EVERY_MINUTES)))
+    return jobs
+
+
+# -----------------------------------------------------
+# ❤️ HEALTH / STATUS ENDPOINT
+# -----------------------------------------------------
+def start_status_server(scheduler, port=STATUS_PORT, host="127.0.0.1"):
+    """Serve ``/health`` and ``/status`` as JSON from a daemon thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") == "/health":
+                body = {"status": "ok", "uptime_s": round((scheduler.clock() - scheduler.started_at).total_seconds())}
+            elif self.path.rstrip("/") == "/status":
+                body = scheduler.status()
+            else:
+                self.send_error(404)
+                return
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"❤️ Status endpoint → http://{host}:{server.server_address[1]}/status")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Venezuela Watch jobs as a long-running service.")
+    parser.add_argument("--port", type=int, default=STATUS_PORT, help="status endpoint port")
+    parser.add_argument("--run-now", action="store_true", help="run daily and weekly once at startup")
+    args = parser.parse_args()
+
+    scheduler = Scheduler(build_default_jobs())
+    if args.run_now:
+        for job in scheduler.jobs:
+            if job.name in ("daily", "weekly"):
+                job.due_at = scheduler.clock()
+    start_status_server(scheduler, port=args.port)
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Scheduler stopped.")
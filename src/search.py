@@ -0,0 +1,197 @@
+"""Full-text search over daily/weekly reports and curated articles.
+
+An SQLite FTS5 index at ``SEARCH_DB_PATH`` holds one row per report
+file and one per curated article. It is maintained incrementally:
+reports are re-indexed only when their modification time changes and
+articles are keyed by id, so the pipelines just add what they wrote.
+The ``unicode61 remove_diacritics`` tokenizer with Porter stemming lets
+"licences"/"licence" and "sanción"/"sancion" match.
+
+Usage::
+
+    python -m src.search index                 # (re)index everything on disk
+    python -m src.search query "chevron licence" [--kind daily|weekly|article]
+"""
+
+import argparse, glob, json, os, re, sqlite3, time
+
+from src import facts
+from src.config import SEARCH_DB_PATH
+
+KINDS = ("daily", "weekly", "article")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id    INTEGER PRIMARY KEY,
+    key   TEXT UNIQUE,      -- report path or "article:<id>"
+    kind  TEXT,
+    label TEXT,             -- report date / week label / article date
+    ref   TEXT,             -- report path or article URL
+    mtime REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, body, tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+TERM_RE = re.compile(r"[\w'-]+\*?", re.UNICODE)
+
+
+# -----------------------------------------------------
+# 1️⃣ INDEX
+# -----------------------------------------------------
+def connect(path=SEARCH_DB_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _upsert(conn, key, kind, label, ref, mtime, title, body):
+    row = conn.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+    if row:
+        conn.execute("UPDATE docs SET kind = ?, label = ?, ref = ?, mtime = ? WHERE id = ?", (kind, label, ref, mtime, row[0]))
+        conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (row[0],))
+        doc_id = row[0]
+    else:
+        doc_id = conn.execute(
+            "INSERT INTO docs (key, kind, label, ref, mtime) VALUES (?, ?, ?, ?, ?)", (key, kind, label, ref, mtime)
+        ).lastrowid
+    conn.execute("INSERT INTO docs_fts (rowid, title, body) VALUES (?, ?, ?)", (doc_id, title, body))
+
+
+def report_label(path):
+    """``("daily", "2025-12-04")`` or ``("weekly", "2025-11-24_to_2025-11-30")`` from a report path."""
+    name = os.path.basename(path)[: -len(".md")]
+    if name.startswith("venezuela_week_"):
+        return "weekly", name[len("venezuela_week_"):]
+    return "daily", name[len("venezuela_"):]
+
+
+def add_reports(paths, conn=None):
+    """Index report files whose modification time changed; returns how many were (re)indexed."""
+    own = conn is None
+    conn = conn or connect()
+    n = 0
+    with conn:
+        for path in paths:
+            mtime = os.path.getmtime(path)
+            row = conn.execute("SELECT mtime FROM docs WHERE key = ?", (path,)).fetchone()
+            if row and row[0] == mtime:
+                continue
+            kind, label = report_label(path)
+            with open(path, "r", encoding="utf-8") as f:
+                body = f.read()
+            title = f"{'Daily Report' if kind == 'daily' else 'Weekly Watch'} – {label}"
+            _upsert(conn, path, kind, label, path, mtime, title, body)
+            n += 1
+    if own:
+        conn.close()
+    return n
+
+
+def add_articles(articles, conn=None):
+    """Index curated articles not seen before (keyed by article id)."""
+    own = conn is None
+    conn = conn or connect()
+    n = 0
+    with conn:
+        for a in articles:
+            key = f"article:{facts.article_id(a)}"
+            if conn.execute("SELECT 1 FROM docs WHERE key = ?", (key,)).fetchone():
+                continue
+            body = "\n".join(x for x in (a.get("description"), a.get("full_text") or a.get("content")) if x)
+            label = (a.get("publishedAt") or a.get("pubDate") or "")[:10]
+            _upsert(conn, key, "article", label, a.get("url") or "", None, a.get("title") or "", body)
+            n += 1
+    if own:
+        conn.close()
+    return n
+
+
+def update(daily_dir="outputs/daily", weekly_dir="outputs/weekly", curated_dir="data/curated", path=SEARCH_DB_PATH):
+    """Bring the index up to date with everything on disk; drop removed reports."""
+    conn = connect(path)
+    reports = sorted(glob.glob(f"{daily_dir}/venezuela_*.md")) + sorted(glob.glob(f"{weekly_dir}/venezuela_week_*.md"))
+    n_reports = add_reports(reports, conn)
+    n_articles = 0
+    for cpath in sorted(glob.glob(os.path.join(curated_dir, "**", "*.json"), recursive=True)):
+        try:
+            with open(cpath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if isinstance(data, list):
+            n_articles += add_articles([a for a in data if isinstance(a, dict)], conn)
+    with conn:
+        on_disk = set(reports)
+        for doc_id, key in conn.execute("SELECT id, key FROM docs WHERE kind != 'article'").fetchall():
+            if key not in on_disk:
+                conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+                conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+    conn.close()
+    return n_reports, n_articles
+
+
+# -----------------------------------------------------
+# 2️⃣ QUERY
+# -----------------------------------------------------
+def to_match(query):
+    """Turn free text into an FTS5 query: every term required, ``term*`` for prefixes."""
+    terms = []
+    for t in TERM_RE.findall(query or ""):
+        prefix = t.endswith("*")
+        t = t.rstrip("*").strip("'-")
+        if t:
+            terms.append('"' + t.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search(query, kind=None, limit=20, path=SEARCH_DB_PATH):
+    """Ranked matches as dicts with a ``**``-highlighted snippet; newest first on ties."""
+    match = to_match(query)
+    if not match or not os.path.exists(path):
+        return []
+    sql = """
+        SELECT d.kind, d.label, d.ref,
+               highlight(docs_fts, 0, '**', '**'),
+               snippet(docs_fts, 1, '**', '**', ' … ', 24),
+               bm25(docs_fts, 4.0, 1.0) AS score
+        FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid
+        WHERE docs_fts MATCH ?
+    """
+    params = [match]
+    if kind:
+        sql += " AND d.kind = ?"
+        params.append(kind)
+    sql += " ORDER BY score, d.label DESC LIMIT ?"
+    params.append(limit)
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return [
+        {"kind": k, "label": label, "ref": ref, "title": title, "snippet": snip, "score": round(-score, 3)}
+        for k, label, ref, title, snip, score in rows
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-text search over reports and articles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("index", help="index everything on disk")
+    q = sub.add_parser("query", help="search the index")
+    q.add_argument("text")
+    q.add_argument("--kind", choices=KINDS)
+    q.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "index":
+        t0 = time.perf_counter()
+        n_reports, n_articles = update()
+        print(f"✅ Indexed {n_reports} report(s) and {n_articles} article(s) in {time.perf_counter() - t0:.2f}s → {SEARCH_DB_PATH}")
+    else:
+        t0 = time.perf_counter()
+        hits = search(args.text, kind=args.kind, limit=args.limit)
+        print(f"🔎 {len(hits)} result(s) in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        for h in hits:
+            print(f"\n[{h['kind']} {h['label']}] {h['title']}\n   {h['snippet']}\n   {h['ref']}")
@@ -0,0 +1,144 @@
+"""Crash- and concurrency-safe writes for pipeline artifacts.
+
+The scheduler, ``python -m`` runs, batch backfills and dashboard jobs
+can all write to ``data/`` and ``outputs/`` at the same time, so:
+
+- every file is written to a unique temp file in the same directory and
+  moved over the target with ``os.replace`` (readers see the old or the
+  new file, never half of one; two writers never share a temp file);
+- JSONL logs are appended under an advisory ``flock`` on the log itself,
+  one ``write`` per batch of lines, so lines from different processes
+  never interleave;
+- shared state that is read, changed and written back (the thread
+  index, the scenario state, the answer cache) is updated under
+  :func:`file_lock`, so concurrent runs do not drop each other's
+  changes;
+- curated articles are stored per run (``data/curated/daily/<date>.json``,
+  ``data/curated/weekly/<week>.json``) instead of one shared file that
+  concurrent runs overwrite.
+
+Usage::
+
+    from src import storage
+    storage.atomic_write_json("data/x.json", obj)
+    storage.append_jsonl("data/logs/x.jsonl", entries)
+    curated = storage.load_curated("daily", "2025-11-10")
+"""
+
+import contextlib, glob, json, os, tempfile, threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a process-local lock
+    fcntl = None
+
+from src.config import CURATED_DIR, CURATED_LEGACY
+
+# -----------------------------------------------------
+# 1️⃣ ATOMIC WRITES
+# -----------------------------------------------------
+@contextlib.contextmanager
+def replacing(path):
+    """Yield a temp path next to ``path``; move it over ``path`` if the block succeeds.
+
+    For writers that need a file name (``np.savez``); the temp name keeps
+    the extension so such writers do not append their own.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def atomic_write_bytes(path, data):
+    with replacing(path) as tmp:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    return path
+
+
+def atomic_write_text(path, text):
+    return atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_json(path, obj, indent=2):
+    return atomic_write_text(path, json.dumps(obj, ensure_ascii=False, indent=indent))
+
+
+# -----------------------------------------------------
+# 2️⃣ LOCKS AND JSONL LOGS
+# -----------------------------------------------------
+_append_lock = threading.Lock()
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock on ``path + ".lock"`` (single writer across processes)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            with _append_lock:
+                yield
+
+
+def append_jsonl(path, entries):
+    """Append ``entries`` (dicts) as one locked write; safe across threads and processes."""
+    data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries).encode("utf-8")
+    if not data:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "ab") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.write(data)
+                f.flush()
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            with _append_lock:
+                f.write(data)
+                f.flush()
+
+
+# -----------------------------------------------------
+# 3️⃣ CURATED PARTITIONS
+# -----------------------------------------------------
+def curated_path(kind, key, curated_dir=CURATED_DIR):
+    """``kind`` is "daily" (key: ISO date) or "weekly" (key: week label)."""
+    return os.path.join(curated_dir, kind, f"{key}.json")
+
+
+def save_curated(kind, key, curated, curated_dir=CURATED_DIR):
+    return atomic_write_json(curated_path(kind, key, curated_dir), curated)
+
+
+def load_curated(kind, key=None, curated_dir=CURATED_DIR):
+    """The partition for ``key``, or the newest one; ``None`` if there is none.
+
+    Without partitions, falls back to the shared file written before
+    partitioning (``CURATED_LEGACY``).
+    """
+    if key is not None:
+        path = curated_path(kind, key, curated_dir)
+    else:
+        keys = sorted(glob.glob(curated_path(kind, "*", curated_dir)))
+        path = keys[-1] if keys else os.path.join(curated_dir, CURATED_LEGACY[kind])
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
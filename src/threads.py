@@ -0,0 +1,265 @@
+"""Persistent story threads across days.
+
+Every curated article is assigned to a thread: the active thread whose
+centroid is most similar to it, or a new thread when none is close
+enough. Vectors are the hashed TF-IDF features from
+:mod:`src.relevance`; document frequencies are kept in a running
+``df.npy`` so IDF weights stay consistent from one run to the next.
+
+``THREADS_DIR/index.json`` holds::
+
+    {"n_docs": int,
+     "articles": {article_id: thread_id},
+     "threads": {thread_id: {"id", "label", "first_seen", "last_seen",
+                             "article_count", "days_seen", "recent_titles",
+                             "centroid": {"cols": [...], "vals": [...]}}}}
+
+Daily and weekly prompts get the period's articles grouped by thread,
+with new threads separated from continuing ones (see :func:`prepare`
+and :func:`thread_context`), so long-running storylines are not
+re-explained from scratch each time.
+
+Usage::
+
+    python -m src.threads rebuild   # re-thread the curated history from scratch
+    python -m src.threads show      # list the most recently active threads
+"""
+
+import argparse, json, os
+from datetime import date, timedelta
+
+import numpy as np
+
+from src import archive, facts, relevance, storage
+from src.config import THREADS_DIR, THREAD_SIMILARITY, THREAD_ACTIVE_DAYS
+
+CENTROID_TERMS = 120     # strongest terms kept per centroid
+RECENT_TITLES = 3
+PER_THREAD = 3           # article lines shown per thread in prompts
+
+
+# -----------------------------------------------------
+# 1️⃣ INDEX STORAGE
+# -----------------------------------------------------
+def _paths(threads_dir):
+    return os.path.join(threads_dir, "index.json"), os.path.join(threads_dir, "df.npy")
+
+
+def load_index(threads_dir=THREADS_DIR):
+    index_path, df_path = _paths(threads_dir)
+    index = {"n_docs": 0, "articles": {}, "threads": {}}
+    if os.path.exists(index_path):
+        with open(index_path, "r", encoding="utf-8") as f:
+            index.update(json.load(f))
+    df = np.load(df_path) if os.path.exists(df_path) else np.zeros(relevance.N_FEATURES, np.float32)
+    return index, df
+
+
+def save_index(index, df, threads_dir=THREADS_DIR):
+    index_path, df_path = _paths(threads_dir)
+    storage.atomic_write_json(index_path, index, indent=None)
+    with storage.replacing(df_path) as tmp:
+        np.save(tmp, df)
+
+
+def article_day(article, default):
+    published = article.get("publishedAt") or article.get("pubDate") or ""
+    try:
+        return date.fromisoformat(published[:10]).isoformat()
+    except ValueError:
+        return str(default)
+
+
+# -----------------------------------------------------
+# 2️⃣ INCREMENTAL CLUSTERING
+# -----------------------------------------------------
+def _vectors(articles, index, df):
+    """TF-IDF vectors for ``articles``; updates the running document frequencies."""
+    rows, cols, counts = relevance.hash_features(articles)
+    df += np.bincount(cols, minlength=len(df)).astype(np.float32)
+    index["n_docs"] += len(articles)
+    idf = (np.log((1.0 + index["n_docs"]) / (1.0 + df)) + 1.0).astype(np.float32)
+    return rows, cols, relevance.tfidf(rows, cols, counts, idf, len(articles))
+
+
+def _top_terms(vec, local_cols):
+    keep = np.argsort(vec)[::-1][:CENTROID_TERMS]
+    keep = keep[vec[keep] > 0]
+    return {"cols": local_cols[keep].tolist(), "vals": np.round(vec[keep], 5).tolist()}
+
+
+def update_index(articles, day, threads_dir=THREADS_DIR):
+    """Assign ``articles`` to threads and persist the index.
+
+    Articles seen before keep their thread. Returns ``(assignments,
+    index)`` where ``assignments`` maps every article id to its thread id.
+    The whole load → assign → save runs under the index lock, so
+    concurrent runs (a backfill and an intraday refresh) do not drop
+    each other's assignments.
+    """
+    with storage.file_lock(_paths(threads_dir)[0]):
+        return _update_index(articles, day, threads_dir)
+
+
+def _update_index(articles, day, threads_dir):
+    index, df = load_index(threads_dir)
+    threads = index["threads"]
+    assignments, new = {}, []
+    for a in articles:
+        aid = facts.article_id(a)
+        if aid in index["articles"]:
+            assignments[aid] = index["articles"][aid]
+        elif aid not in assignments:
+            assignments[aid] = None
+            new.append(a)
+    if not new:
+        return assignments, index
+
+    new.sort(key=lambda a: article_day(a, day))
+    rows, cols, vals = _vectors(new, index, df)
+
+    # Dense matrices over the local vocabulary of the batch + active centroids
+    cutoff = (date.fromisoformat(str(day)) - timedelta(days=THREAD_ACTIVE_DAYS)).isoformat()
+    active = [t for t in threads.values() if t["last_seen"] >= cutoff]
+    centroid_cols = [np.asarray(t["centroid"]["cols"], np.int64) for t in active]
+    local_cols = np.unique(np.concatenate([cols] + centroid_cols)) if len(cols) or centroid_cols else np.zeros(0, np.int64)
+    A = np.zeros((len(new), len(local_cols)), np.float32)
+    A[rows, np.searchsorted(local_cols, cols)] = vals
+    C = np.zeros((len(active), len(local_cols)), np.float32)
+    for i, t in enumerate(active):
+        C[i, np.searchsorted(local_cols, t["centroid"]["cols"])] = t["centroid"]["vals"]
+    C = list(C)
+    members = [t["article_count"] for t in active]
+
+    for i, a in enumerate(new):
+        aid, a_day = facts.article_id(a), article_day(a, day)
+        sims = np.asarray([c @ A[i] for c in C]) if C else np.zeros(0)
+        best = int(sims.argmax()) if len(sims) else -1
+        if best >= 0 and sims[best] >= THREAD_SIMILARITY:
+            t = active[best]
+            merged = C[best] * members[best] + A[i]
+            C[best] = merged / max(np.linalg.norm(merged), 1e-12)
+            members[best] += 1
+        else:
+            tid = f"t{len(threads) + 1:04d}"
+            t = {"id": tid, "label": a.get("title") or "", "first_seen": a_day, "last_seen": a_day,
+                 "article_count": 0, "days_seen": [], "recent_titles": []}
+            threads[tid] = t
+            active.append(t)
+            C.append(A[i].copy())
+            members.append(1)
+        t["article_count"] += 1
+        t["first_seen"] = min(t["first_seen"], a_day)
+        t["last_seen"] = max(t["last_seen"], a_day)
+        if a_day not in t["days_seen"]:
+            t["days_seen"] = sorted(t["days_seen"] + [a_day])
+        t["recent_titles"] = ([a.get("title") or ""] + t["recent_titles"])[:RECENT_TITLES]
+        index["articles"][aid] = t["id"]
+        assignments[aid] = t["id"]
+
+    for t, c in zip(active, C):
+        t["centroid"] = _top_terms(c, local_cols)
+    save_index(index, df, threads_dir)
+    print(f"🧵 Threaded {len(new)} article(s): {len(threads)} threads in index.")
+    return assignments, index
+
+
+# -----------------------------------------------------
+# 3️⃣ PROMPT CONTEXT: new vs continuing threads
+# -----------------------------------------------------
+def prepare(items, since):
+    """Fact records and threads for the period: ``(records, assignments, index)``.
+
+    This is the step that writes (fact cache, thread index); call it
+    once per run and build prompts from its result with
+    :func:`thread_context` as often as the budget needs.
+    """
+    records = facts.facts_for(items)
+    assignments, index = update_index(items, since)
+    return records, assignments, index
+
+
+def group_by_thread(items, assignments):
+    groups = {}
+    for it in items:
+        tid = assignments.get(facts.article_id(it))
+        if tid is not None:
+            groups.setdefault(tid, []).append(it)
+    return groups
+
+
+def thread_deltas(items, assignments, index, since):
+    """Split the period's threads into ``(new, continuing)`` lists.
+
+    A thread is new when it was first seen on or after ``since`` (the
+    first day of the period). Each entry is ``(thread, articles)``,
+    largest first.
+    """
+    new, continuing = [], []
+    for tid, arts in group_by_thread(items, assignments).items():
+        t = index["threads"][tid]
+        (new if t["first_seen"] >= str(since) else continuing).append((t, arts))
+    key = lambda pair: -len(pair[1])
+    return sorted(new, key=key), sorted(continuing, key=key)
+
+
+def _thread_header(t, arts, is_new):
+    if is_new:
+        return f"[{t['id']}] {t['label']} — {len(arts)} article(s)"
+    return (f"[{t['id']}] {t['label']} — ongoing since {t['first_seen']} "
+            f"({len(t['days_seen'])} days, {t['article_count']} articles total); {len(arts)} new article(s)")
+
+
+def thread_context(items, assignments, index, since, records, raw_piece, cap_chars, per_thread=PER_THREAD):
+    """Thread-grouped prompt text: new threads first, then continuing ones.
+
+    Each thread lists at most ``per_thread`` articles (fact line when a
+    record exists, else ``raw_piece``); near-duplicate reports beyond
+    that are only counted.
+    """
+    new, continuing = thread_deltas(items, assignments, index, since)
+    chunks, used = [], 0
+    for title, group, is_new in (("NEW STORYLINES", new, True), ("CONTINUING STORYLINES", continuing, False)):
+        if not group:
+            continue
+        section = [f"## {title}"]
+        for t, arts in group:
+            lines = [_thread_header(t, arts, is_new)]
+            for it in arts[:per_thread]:
+                rec = records.get(facts.article_id(it))
+                lines.append(facts.format_record(rec) if rec else raw_piece(it).rstrip())
+            if len(arts) > per_thread:
+                lines.append(f"  (+{len(arts) - per_thread} more report(s) on this thread)")
+            block = "\n".join(lines) + "\n"
+            if used + len(block) > cap_chars:
+                break
+            section.append(block)
+            used += len(block)
+        if len(section) > 1:
+            chunks.append("\n".join(section))
+    return "\n".join(chunks)
+
+
+# -----------------------------------------------------
+# 4️⃣ CLI
+# -----------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Story-thread index.")
+    parser.add_argument("command", choices=["rebuild", "show"])
+    parser.add_argument("--limit", type=int, default=15)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        for p in _paths(THREADS_DIR):
+            if os.path.exists(p):
+                os.remove(p)
+        # Daily raw files, filtered with the keyword rules, in date order
+        for day in archive.days():
+            raw = archive.load(f"news_{day}")
+            curated = [a for a in raw if relevance.rule_score(a, relevance.RULE_KEYWORDS) is not None]
+            if curated:
+                update_index(curated, day.isoformat())
+    index, _ = load_index()
+    latest = sorted(index["threads"].values(), key=lambda t: (t["last_seen"], t["article_count"]), reverse=True)
+    for t in latest[: args.limit]:
+        print(f"{t['id']}  {t['first_seen']} → {t['last_seen']}  {t['article_count']:>3}  {t['label'][:80]}")
@@ -0,0 +1,181 @@
+"""Columnar time series of weekly scenario assessments.
+
+``scenarios_log.jsonl`` stays the source of truth. This module keeps a
+compact NumPy artifact next to it so the Weekly tab can chart scenario
+confidence without parsing the log on every rerun::
+
+    ids           (S,)    scenario ids
+    titles        (S,)    latest title per scenario
+    weeks         (W,)    week starts, datetime64[D], ascending
+    confidence    (S, W)  updated_confidence, NaN where not assessed
+    plausibility  (S, W)  1 up / 0 steady / -1 down, MISSING where not assessed
+    carried       (S, W)  True where the assessment was carried forward
+
+The weekly pipeline calls :func:`append` after logging; the artifact is
+rebuilt from the log when missing (or with ``python -m src.timeseries
+rebuild``). Only weekly entries (those with ``week_start``) are charted;
+daily pulses stay in the log.
+"""
+
+import argparse, json, os
+
+import numpy as np
+
+from src import storage
+from src.config import SCENARIO_SERIES_PATH, SCENARIO_LOG_PATH
+
+MISSING = -128
+PLAUSIBILITY = {"up": 1, "steady": 0, "down": -1}
+
+
+# -----------------------------------------------------
+# 1️⃣ LOAD / SAVE
+# -----------------------------------------------------
+def empty():
+    return {
+        "ids": np.zeros(0, "U32"),
+        "titles": np.zeros(0, "U200"),
+        "weeks": np.zeros(0, "datetime64[D]"),
+        "confidence": np.zeros((0, 0), np.float32),
+        "plausibility": np.zeros((0, 0), np.int8),
+        "carried": np.zeros((0, 0), bool),
+    }
+
+
+_cache = {}
+
+def load(path=SCENARIO_SERIES_PATH):
+    """Return the series arrays (empty when no artifact exists yet)."""
+    if not os.path.exists(path):
+        return empty()
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if _cache.get("key") != key:
+        with np.load(path) as z:
+            _cache.update(key=key, series={k: z[k] for k in z.files})
+    return _cache["series"]
+
+
+def save(series, path=SCENARIO_SERIES_PATH):
+    with storage.replacing(path) as tmp:
+        np.savez(tmp, **series)
+
+
+# -----------------------------------------------------
+# 2️⃣ UPDATE
+# -----------------------------------------------------
+def _add(series, entries):
+    """Insert weekly ``entries`` (log dicts) into ``series``; returns a new dict."""
+    entries = [e for e in entries if e.get("week_start") and e.get("id")]
+    if not entries:
+        return series
+    ids = list(series["ids"])
+    titles = list(series["titles"])
+    for e in entries:
+        if e["id"] not in ids:
+            ids.append(e["id"])
+            titles.append(e.get("title") or e["id"])
+        else:
+            titles[ids.index(e["id"])] = e.get("title") or titles[ids.index(e["id"])]
+    weeks = np.union1d(series["weeks"], np.array([e["week_start"] for e in entries], "datetime64[D]"))
+
+    # Re-grid the existing columns, then write the new cells
+    shape = (len(ids), len(weeks))
+    conf = np.full(shape, np.nan, np.float32)
+    plaus = np.full(shape, MISSING, np.int8)
+    carried = np.zeros(shape, bool)
+    old_rows = np.arange(len(series["ids"]))
+    old_cols = np.searchsorted(weeks, series["weeks"])
+    conf[np.ix_(old_rows, old_cols)] = series["confidence"]
+    plaus[np.ix_(old_rows, old_cols)] = series["plausibility"]
+    carried[np.ix_(old_rows, old_cols)] = series["carried"]
+
+    row = {sid: i for i, sid in enumerate(ids)}
+    r = np.array([row[e["id"]] for e in entries])
+    c = np.searchsorted(weeks, np.array([e["week_start"] for e in entries], "datetime64[D]"))
+    conf[r, c] = [float(e["updated_confidence"]) if e.get("updated_confidence") is not None else np.nan for e in entries]
+    plaus[r, c] = [PLAUSIBILITY.get(e.get("plausibility"), MISSING) for e in entries]
+    carried[r, c] = [e.get("assessment") == "carried_forward" for e in entries]
+    return {
+        "ids": np.array(ids, "U32"),
+        "titles": np.array(titles, "U200"),
+        "weeks": weeks,
+        "confidence": conf,
+        "plausibility": plaus,
+        "carried": carried,
+    }
+
+
+def read_log(log_path=SCENARIO_LOG_PATH):
+    entries = []
+    if os.path.exists(log_path):
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return entries
+
+
+def rebuild(log_path=SCENARIO_LOG_PATH, path=SCENARIO_SERIES_PATH):
+    series = _add(empty(), read_log(log_path))
+    save(series, path)
+    return series
+
+
+def append(entries, path=SCENARIO_SERIES_PATH, log_path=SCENARIO_LOG_PATH):
+    """Add freshly logged weekly entries; rebuilds from the log if no artifact exists."""
+    if not os.path.exists(path):
+        return rebuild(log_path, path)
+    series = _add(load(path), entries)
+    save(series, path)
+    return series
+
+
+# -----------------------------------------------------
+# 3️⃣ VECTORIZED VIEWS
+# -----------------------------------------------------
+def forward_fill(values):
+    """Carry the last non-NaN value along each row."""
+    valid = ~np.isnan(values)
+    idx = np.where(valid, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    filled = values[np.arange(values.shape[0])[:, None], idx]
+    return np.where(np.maximum.accumulate(valid, axis=1), filled, np.nan)
+
+
+def week_over_week(series):
+    """Confidence change vs the previous week, per scenario and week (NaN for the first)."""
+    conf = forward_fill(series["confidence"])
+    delta = np.full_like(conf, np.nan)
+    delta[:, 1:] = conf[:, 1:] - conf[:, :-1]
+    return delta
+
+
+def latest(series):
+    """Per scenario: last confidence, its week-over-week delta and plausibility code."""
+    if not series["weeks"].size:
+        return []
+    conf = forward_fill(series["confidence"])
+    delta = week_over_week(series)
+    return [
+        {
+            "id": sid,
+            "title": title,
+            "confidence": float(conf[i, -1]),
+            "delta": float(delta[i, -1]),
+            "plausibility": int(series["plausibility"][i, -1]),
+            "carried": bool(series["carried"][i, -1]),
+        }
+        for i, (sid, title) in enumerate(zip(series["ids"], series["titles"]))
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scenario confidence time series.")
+    parser.add_argument("command", choices=["rebuild", "show"])
+    args = parser.parse_args()
+    series = rebuild() if args.command == "rebuild" else load()
+    print(f"📈 {len(series['ids'])} scenarios × {len(series['weeks'])} weeks → {SCENARIO_SERIES_PATH}")
+    for row in latest(series):
+        print(f"   {row['id']}  {row['confidence']:.2f}  ({row['delta']:+.2f})  {row['title']}")
@@ -0,0 +1,37 @@
+"""Local token estimates for sizing prompts before they are sent.
+
+Uses ``tiktoken`` when it is installed and falls back to a
+characters-per-token heuristic otherwise, so nothing here needs the
+network or an API key.
+"""
+
+CHARS_PER_TOKEN = 4          # rough average for English/Spanish prose
+MESSAGE_OVERHEAD_TOKENS = 4  # role + separators per chat message
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoding = False
+    return _encoding or None
+
+
+def count_tokens(text):
+    """Return the (estimated) number of tokens in ``text``."""
+    if not text:
+        return 0
+    enc = _get_encoding()
+    if enc is not None:
+        return len(enc.encode(text))
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def count_message_tokens(messages):
+    """Return the estimated prompt tokens for a list of chat messages."""
+    return sum(count_tokens(m.get("content") or "") + MESSAGE_OVERHEAD_TOKENS for m in messages)
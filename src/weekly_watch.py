@@ -1,7 +1,12 @@
 import os, json, time, requests
-from datetime import datetime, timedelta, timezone
-from openai import OpenAI
-from .config import GNEWS_API_KEY, OPENAI_API_KEY, QUERY, LANGS
+from datetime import datetime, timedelta
+from .config import (
+    GNEWS_API_KEY, GNEWS_BASE_URL, GNEWS_REQUEST_INTERVAL_S, QUERY, LANGS, SCENARIO_ASSESSMENT_MODE, ENRICH_ENABLED,
+    local_date,
+)
+from . import archive, assessment, budget, compress, context_bundle, daily_pipeline, enrich, llm, profiling, render, search, storage, threads, timeseries
+# Reasoning parsing lives with the scenario assessment; re-exported here
+from .assessment import REASONING_FIELDS, strip_code_fences, parse_reasoning
 
 
 def parse_week_start_from_filename(filename):
@@ -27,13 +32,9 @@ def find_latest_report_start(dir_path="outputs/weekly"):
             latest = start
     return latest
 
-# -----------------------------------------------------
-# 🕒 LOCAL DATE
-# -----------------------------------------------------
-LOCAL_OFFSET_HOURS = -4  # Example: UTC-4 (New York)
-local_today = (datetime.now(timezone.utc) + timedelta(hours=LOCAL_OFFSET_HOURS)).date()
-
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Reused across fetches so long-running callers (src/scheduler.py) keep
+# their HTTP connections warm between runs.
+SESSION = requests.Session()
 
 # -----------------------------------------------------
 # 1️⃣ FETCH WEEKLY NEWS (for an arbitrary week)
@@ -44,17 +45,17 @@ def fetch_week_for_range(start_date, end_date):
     Example: 2025-11-10 to 2025-11-16 (7 days).
     """
     print(f"\n⏳ Fetching weekly news {start_date} → {end_date} (via GNews)...")
-    base = "https://gnews.io/api/v4/search"
+    base = f"{GNEWS_BASE_URL}/search"
 
     # cache filename per week-range
     label = f"{start_date}_to_{end_date}"
     path = f"data/raw/news_week_{label}.json"
 
-    # ✅ Reuse cached file if available
-    if os.path.exists(path):
+    # ✅ Reuse cached file if available (loose or compacted)
+    cached = archive.load(f"news_week_{label}")
+    if cached is not None:
         print(f"📦 Using cached file: {path}")
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return cached
 
     results = []
     day = start_date
@@ -69,7 +70,7 @@ def fetch_week_for_range(start_date, end_date):
                 "to": f"{day}T23:59:59Z",
                 "max": 10,  # Free-tier limit
             }
-            r = requests.get(base, params=params, timeout=30)
+            r = SESSION.get(base, params=params, timeout=30)
             if r.status_code != 200:
                 print(f"⚠️ Error {r.status_code}: {r.text}")
                 continue
@@ -77,12 +78,10 @@ def fetch_week_for_range(start_date, end_date):
             for a in articles:
                 a["lang"] = lang
             results.extend(articles)
-            time.sleep(1.2)
+            time.sleep(GNEWS_REQUEST_INTERVAL_S)
         day += timedelta(days=1)
 
-    os.makedirs("data/raw", exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    storage.atomic_write_json(path, results)
     print(f"✅ Saved {len(results)} articles → {path}")
     return results
 
@@ -92,25 +91,19 @@ def fetch_week_for_range(start_date, end_date):
 KEYWORDS = ["venezuela", "caracas", "maduro", "pdvsa", "chevron",
             "opposition", "sanction", "machado"]
 
-def clean_rank(raw):
-    """Filter and rank relevant articles based on keywords."""
-    curated = []
-    for r in raw:
-        text = " ".join([r.get("title", ""), r.get("description", ""), r.get("content", "")]).lower()
-        if "venezuela" not in text:
-            continue
-        if not any(k in text for k in KEYWORDS):
-            continue
-        if len(r.get("description", "")) < 40:
-            continue
-        r["_score"] = sum(text.count(k) for k in KEYWORDS)
-        curated.append(r)
-
-    curated.sort(key=lambda x: x["_score"], reverse=True)
-    os.makedirs("data/curated", exist_ok=True)
-    path = "data/curated/venezuela_weekly.json"
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(curated, f, ensure_ascii=False, indent=2)
+def clean_rank(raw, label=None):
+    """Filter and rank relevant articles (learned model if trained, else keywords).
+
+    The result is saved as the curated partition for ``label``
+    (``<monday>_to_<sunday>``, default: the last completed week).
+    """
+    curated = daily_pipeline.rank_articles(raw, KEYWORDS)
+
+    if label is None:
+        today = local_date()
+        start = today - timedelta(days=today.weekday() + 7)
+        label = f"{start}_to_{start + timedelta(days=6)}"
+    path = storage.save_curated("weekly", label, curated)
     print(f"✅ Curated {len(curated)} relevant articles → {path}")
     return curated
 
@@ -118,114 +111,81 @@ def clean_rank(raw):
 # -----------------------------------------------------
 # 3️⃣ LOAD CONTEXT & SCENARIOS
 # -----------------------------------------------------
+_FILE_CACHE = {}
+
+def _read_cached(path, parse):
+    """Return ``parse(file)`` for ``path``, re-reading only when it changes.
+
+    Keyed on the absolute path and modification time so a long-running
+    process keeps context and scenarios in memory between runs.
+    """
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _FILE_CACHE:
+        with open(path, "r", encoding="utf-8") as f:
+            _FILE_CACHE[key] = parse(f)
+    return _FILE_CACHE[key]
+
 def load_scenarios():
     path = "data/context/venezuela_scenarios.json"
     if not os.path.exists(path):
         raise FileNotFoundError("❌ Missing scenario file: data/context/venezuela_scenarios.json")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _read_cached(path, json.load)
 
 def load_context():
     path = "data/context/venezuela_context.md"
     if not os.path.exists(path):
         print("⚠️ No context file found → continuing without it.")
         return ""
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read().strip()
+    return _read_cached(path, lambda f: f.read().strip())
 
 
 # -----------------------------------------------------
 # 4️⃣ BUILD TEXT CONTEXT
 # -----------------------------------------------------
-def build_context(items, cap_chars=10000):
-    """Assemble a condensed text block from curated articles."""
-    chunks, used = [], 0
-    for it in items:
-        title, url = it.get("title", ""), it.get("url") or ""
-        desc, content = it.get("description") or "", it.get("content") or ""
-        piece = f"- {title} [{url}]\n{desc}\n{content}\n"
-        if used + len(piece) > cap_chars:
-            break
-        chunks.append(piece)
-        used += len(piece)
-    return "\n".join(chunks)
+def article_piece(it, body=None):
+    """One article as prompt text, its body compressed extractively."""
+    title, url = it.get("title", ""), it.get("url") or ""
+    body = compress.compress_article(it) if body is None else body
+    return f"- {title} [{url}]\n{body}\n"
+
 
 
 # -----------------------------------------------------
 # 5️⃣ SUMMARIZE WEEKLY DEVELOPMENTS
 # -----------------------------------------------------
-def summarize_week(curated, scenarios, context):
-    """Generate structured reasoning (internal) and narrative summary (public)."""
-    ctx = build_context(curated)
+NARRATIVE_SECTIONS = ("factual summary", "scenario assessment", "forward outlook")
 
-    scenario_text = "\n".join([
-        f"### {s['id']} – {s['title']}\n{s['narrative']}\n"
-        for s in scenarios
-    ])
+def validate_narrative(text):
+    """Reject narratives that skip one of the three required sections."""
+    missing = [s for s in NARRATIVE_SECTIONS if s not in text.lower()]
+    if missing:
+        raise llm.LLMValidationError(f"narrative missing sections: {missing}")
 
-    # ---- Structured reasoning (internal use) ----
-    reasoning_prompt = f"""
-You are a geopolitical analyst assessing developments in Venezuela.
-
-Your task:
-Evaluate how the plausibility of each scenario changed this week, based on factual developments.
-
-Return ONLY a valid JSON array (no markdown or explanations).
-Each element must have the following fields and structure — populate each field based on your own assessment, not the example values:
-
-[
-  {{
-    "id": "SCENARIO_ID",
-    "title": "SCENARIO_TITLE",
-    "plausibility": "up" | "down" | "steady",
-    "reasoning": "2–3 factual sentences explaining why plausibility changed, referencing evidence from this week.",
-    "updated_confidence": FLOAT between 0 and 1
-  }}
-]
-
----
-Context:
-{context}
-
----
-Scenarios:
-{scenario_text}
-
----
-Weekly News Feed:
-{ctx}
-"""
-    print("🤖 Calling OpenAI for structured reasoning...")
-    reasoning_resp = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {
-                "role": "system",
-                "content": "Output only a valid JSON array following the structure above. Populate all fields based on reasoning; do not repeat example values or explanations."
-            },
-            {"role": "user", "content": reasoning_prompt},
-        ],
-        temperature=0.3,
-    )
+def summarize_week(curated, scenarios, context, week_start=None, mode=SCENARIO_ASSESSMENT_MODE):
+    """Generate structured reasoning (internal) and narrative summary (public)."""
+    # Reason over story threads (new this week vs continuing) rather than
+    # a flat list of articles. Articles already extracted and threaded by
+    # the daily runs come from the fact cache and thread index; this is
+    # the only write, build_ctx below is pure.
+    today = local_date()
+    week_start = week_start or min((threads.article_day(a, today) for a in curated), default=str(today))
+    records, assignments, index = threads.prepare(curated, week_start)
 
-    def strip_code_fences(text: str) -> str:
-        text = text.strip()
-        if text.startswith("```") and text.endswith("```"):
-            text = text[3:-3].strip()
-            if text.lower().startswith("json"):
-                text = text[4:].strip()
-        return text
+    def build_ctx(items):
+        return threads.thread_context(items, assignments, index, week_start, records, article_piece, cap_chars=10000)
 
-    raw_output = reasoning_resp.choices[0].message.content or ""
-    raw_output = strip_code_fences(raw_output)
-    structured_reasoning = json.loads(raw_output)
+    # ---- Structured reasoning (internal use) ----
+    # Incremental mode re-assesses only scenarios with new evidence and
+    # carries the rest forward (see src/assessment.py).
+    structured_reasoning, pending = assessment.assess(curated, scenarios, context, build_ctx, mode=mode)
+    analysis = [{k: e[k] for k in REASONING_FIELDS} for e in structured_reasoning]
 
     # ---- Narrative summary (public output) ----
     narrative_prompt = f"""
 You are writing the public Weekly Watch Report for Venezuela.
 
 Using the following internal analysis:
-{structured_reasoning}
+{analysis}
 
 Write a cohesive report:
 - Factual Summary: 1–2 paragraphs summarizing verified factual developments from the past 7 days.
@@ -234,88 +194,139 @@ Avoid speculation or editorial tone.
 - Forward Outlook: 3–5 bullet points for key trends or uncertainties to watch next week. Avoid speculation of what is likely to happen but identify key issues that are important to observe.
 """
     print("📝 Generating narrative report...")
-    narrative_resp = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
+    narrative = llm.complete(
+        "weekly_narrative",
+        [
             {"role": "system", "content": "You write factual, polished geopolitical summaries."},
             {"role": "user", "content": narrative_prompt}
         ],
         temperature=0.5,
+        validate=validate_narrative,
     )
 
-    return structured_reasoning, narrative_resp.choices[0].message.content
+    return structured_reasoning, narrative, pending
 
 
 # -----------------------------------------------------
 # 6️⃣ MAIN PIPELINE – run for last completed week
 # -----------------------------------------------------
-def generate_weekly_report(week_start, week_end, local_today, context, scenarios):
+def generate_weekly_report(week_start, week_end, local_today, context, scenarios, mode=SCENARIO_ASSESSMENT_MODE):
     label = f"{week_start}_to_{week_end}"
     print(f"🗓️ Generating Weekly Watch for {week_start} → {week_end} (label: {label})")
 
-    articles = fetch_week_for_range(week_start, week_end)
+    with profiling.stage("fetch", week_start):
+        articles = fetch_week_for_range(week_start, week_end)
     if not articles:
         print(f"⚠️ No articles for week {label}, aborting.")
-        raise SystemExit(0)
+        return None
 
-    curated = clean_rank(articles)
+    with profiling.stage("rank", week_start):
+        curated = clean_rank(articles, label)
     if not curated:
         print(f"⚠️ No curated Venezuela articles for week {label}, aborting.")
-        raise SystemExit(0)
+        return None
+
+    if ENRICH_ENABLED:
+        # Mostly cache hits: the daily runs enriched the same top articles
+        with profiling.stage("enrich", week_start):
+            enrich.enrich(curated)
 
     print("🧠 Generating weekly synthesis...")
-    structured_reasoning, summary = summarize_week(curated, scenarios, context)
-
-    os.makedirs("outputs/weekly", exist_ok=True)
-    out_path = f"outputs/weekly/venezuela_week_{label}.md"
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(summary)
-    print(f"\n✅ Weekly Watch saved → {out_path}")
-
-    os.makedirs("data/logs", exist_ok=True)
-    log_path = "data/logs/scenarios_log.jsonl"
-    with open(log_path, "a", encoding="utf-8") as f:
-        for e in structured_reasoning:
-            e["week_start"] = str(week_start)
-            e["week_end"] = str(week_end)
-            e["report_generated_on"] = str(local_today)
-            f.write(json.dumps(e, ensure_ascii=False) + "\n")
-    print(f"🗂️ Logged structured reasoning → {log_path}")
+    with profiling.stage("summarize", week_start), budget.run(f"weekly {label}"):
+        structured_reasoning, summary, pending = summarize_week(curated, scenarios, context, str(week_start), mode)
+
+    with profiling.stage("save", week_start):
+        out_path = f"outputs/weekly/venezuela_week_{label}.md"
+        storage.atomic_write_text(out_path, summary)
+        print(f"\n✅ Weekly Watch saved → {out_path}")
+        render.write_html(out_path, summary)
+        search.add_reports([out_path])
+        search.add_articles(curated)
+
+        assessment.log_entries(
+            structured_reasoning,
+            week_start=str(week_start),
+            week_end=str(week_end),
+            report_generated_on=str(local_today),
+        )
+        assessment.commit_state(structured_reasoning, pending)
+        timeseries.append(structured_reasoning)
+        # The dashboard reads this instead of re-assembling its context
+        context_bundle.publish()
 
     print("\n--- Preview ---\n")
     print(summary[:800])
     print("\n--- Scenario Reasoning ---")
     for e in structured_reasoning:
-        print(f"{e['id']} ({e['plausibility']}): {e['reasoning']}")
+        print(f"{e['id']} ({e['plausibility']}, {e['assessment']}): {e['reasoning']}")
 
+    return out_path
 
-if __name__ == "__main__":
-    local_today = (datetime.now(timezone.utc) + timedelta(hours=LOCAL_OFFSET_HOURS)).date()
-    print(f"📆 Local today: {local_today}")
 
+def weeks_to_generate(local_today, latest_existing_start=None):
+    """Return the Monday of every completed week still missing a report."""
     weekday = local_today.weekday()
     current_week_monday = local_today - timedelta(days=weekday)
 
     target_week_start = current_week_monday - timedelta(days=7)
 
-    latest_existing_start = find_latest_report_start()
-    weeks_to_generate = []
+    if latest_existing_start is None:
+        return [target_week_start]
+
+    weeks = []
+    candidate = latest_existing_start + timedelta(days=7)
+    while candidate <= target_week_start:
+        weeks.append(candidate)
+        candidate += timedelta(days=7)
+    return weeks
+
+
+@profiling.profiled("weekly", whole=False)
+def run_weekly(local_today=None, latest_existing_start=None, context=None, scenarios=None,
+               mode=SCENARIO_ASSESSMENT_MODE):
+    """Generate every missing Weekly Watch report up to last week.
+
+    Callers that keep state between runs can pass the latest existing
+    week start and preloaded context/scenarios to skip the disk reads.
+    Returns the list of week starts written.
+    """
+    local_today = local_today or local_date()
+    print(f"📆 Local today: {local_today}")
 
     if latest_existing_start is None:
-        weeks_to_generate.append(target_week_start)
-    else:
-        candidate = latest_existing_start + timedelta(days=7)
-        while candidate <= target_week_start:
-            weeks_to_generate.append(candidate)
-            candidate += timedelta(days=7)
-
-    if not weeks_to_generate:
+        latest_existing_start = find_latest_report_start()
+    pending = weeks_to_generate(local_today, latest_existing_start)
+
+    if not pending:
         print("✅ Weekly reports are up to date. Nothing to generate.")
-        raise SystemExit(0)
+        return []
 
-    context = load_context()
-    scenarios = load_scenarios()
+    context = load_context() if context is None else context
+    scenarios = load_scenarios() if scenarios is None else scenarios
 
-    for start in weeks_to_generate:
+    generated = []
+    for start in pending:
         end = start + timedelta(days=6)
-        generate_weekly_report(start, end, local_today, context, scenarios)
+        if generate_weekly_report(start, end, local_today, context, scenarios, mode) is None:
+            break
+        generated.append(start)
+    return generated
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate missing Weekly Watch reports.")
+    parser.add_argument("--full", action="store_true", help="re-assess every scenario, not only those with new evidence")
+    parser.add_argument("--since", type=lambda s: datetime.fromisoformat(s).date(),
+                        help="Monday of the first week to (re)generate")
+    parser.add_argument("--today", type=lambda s: datetime.fromisoformat(s).date(),
+                        help="local date to run as (default: now); weeks up to the one before it are generated")
+    parser.add_argument("--profile", action="store_true", help="save CPU/memory profiles per stage (src/profiling.py)")
+    args = parser.parse_args()
+    if args.profile:
+        profiling.enable()
+    run_weekly(
+        local_today=args.today,
+        latest_existing_start=args.since - timedelta(days=7) if args.since else None,
+        mode="full" if args.full else SCENARIO_ASSESSMENT_MODE,
+    )
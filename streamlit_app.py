@@ -1,14 +1,20 @@
 import streamlit as st
-import os, subprocess, json
-from datetime import datetime, timedelta, timezone
+import os, subprocess, json, time, uuid
 import glob
-from src.config import OPENAI_API_KEY
-from openai import OpenAI
-
-# --- LOCAL DATE (still useful for display if needed) ---
-LOCAL_OFFSET_HOURS = -4
-local_today = (datetime.now(timezone.utc) + timedelta(hours=LOCAL_OFFSET_HOURS)).date()
-today_str = local_today.isoformat()
+import pandas as pd
+from src.config import local_date
+from src import answer_cache, budget, context_bundle, deadline, llm, profiling, render, search, timeseries
+# Reasoning summaries now live with the context bundle; re-exported here
+from src.context_bundle import load_recent_reasoning
+from src.jobs import JobQueue, JobLimitError, DONE, ERROR
+from src.memory import ConversationMemory
+from src.drafting import (
+    split_blocks, apply_edits, join_blocks, parse_edit_response, draft_diff, edit_messages,
+    DRAFT_VARIANTS, variant_messages,
+)
+
+# --- LOCAL DATE (still useful for display if needed; re-evaluated on each rerun) ---
+today_str = local_date().isoformat()
 
 # --- FILE PATHS ---
 DAILY_DIR = "outputs/daily"
@@ -20,37 +26,158 @@ st.set_page_config(page_title="Venezuela Watch", layout="wide")
 st.title("🗞️ Venezuela Political & Economic Watch")
 st.caption("Automated monitoring and scenario reasoning using GNews + GPT-4o")
 
-tabs = st.tabs(["📅 Daily Report", "📈 Weekly Analysis", "💬 Interact", "📝 Draft"])
+tabs = st.tabs(["📅 Daily Report", "📈 Weekly Analysis", "💬 Interact", "📝 Draft", "🔎 Search"])
+
+
+# -------------------------------------------------
+# BACKGROUND LLM JOBS (shared by Interact + Draft)
+# -------------------------------------------------
+@st.cache_resource
+def get_job_queue():
+    """One worker pool per server process, shared by every session."""
+    return JobQueue()
+
+
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
+
+@profiling.profiled("streamlit-draft")
+def run_chat_job(job, messages, temperature, task="draft", tier=None):
+    """Worker-thread body: stream a model reply into the job handle."""
+    with budget.run(f"{task} job"):
+        return llm.complete(task, messages, temperature=temperature, stream_to=job, tier=tier)
+
+
+@profiling.profiled("streamlit-chat")
+def run_memory_chat_job(job, memory, system_prompt, context, history, temperature, task="chat"):
+    """Worker-thread body for the Interact tab.
+
+    Folds any turns that just left the recent window into the running
+    synopsis (one short call, only when needed), then streams the reply.
+    """
+
+    def summarize(system, prompt, max_tokens):
+        return llm.complete(
+            "chat_synopsis",
+            [{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+            temperature=0.2,
+            max_tokens=max_tokens,
+        )
+
+    with budget.run(f"{task} job"):
+        memory.compact(history, summarize)
+        # Over budget, the brainstorm context is shortened first
+        return llm.complete_within_budget(
+            task,
+            lambda scale, share: memory.build_messages(system_prompt, budget.shrink(context, scale), history),
+            temperature=temperature,
+            stream_to=job,
+        )
+
+
+def apply_edit_response(draft, raw):
+    """Return ``(mode, new_draft, n_edits)`` for a targeted-edit answer; raise ``ValueError`` if unusable."""
+    mode, edits = parse_edit_response(raw)
+    if mode == "rewrite":
+        return mode, None, 0
+    return mode, join_blocks(apply_edits(split_blocks(draft), edits)), len(edits)
+
+
+def plan_edits(system_msg, style_label, draft, instructions, topic, context_text=""):
+    """Budget-fitted ``(messages, tier)`` for targeted edits; ``(None, None)`` to go straight to a rewrite.
+
+    Over budget, the brainstorm context is shortened first, as for the
+    rewrite; the draft itself is always sent whole.
+    """
+    try:
+        return budget.plan("draft_edits", lambda scale, share: edit_messages(
+            system_msg, style_label, draft, instructions, topic, budget.shrink(context_text, scale)))
+    except budget.BudgetExceededError as e:
+        print(f"⚠️ Targeted edits do not fit the budget ({e}); using a full rewrite.")
+        return None, None
+
+
+@profiling.profiled("streamlit-refine")
+def run_refine_job(job, draft, edit_msgs, rewrite_msgs, tier=None, edit_tier=None):
+    """Worker-thread body for draft refinement.
+
+    Tries targeted block edits first (small JSON answer applied locally);
+    falls back to streaming a full rewrite when the model asks for one,
+    its edits do not apply, or targeted mode is off (``edit_msgs`` None).
+    """
+    with budget.run("draft job"):
+        return _refine(job, draft, edit_msgs, rewrite_msgs, tier, edit_tier)
+
+
+def _refine(job, draft, edit_msgs, rewrite_msgs, tier, edit_tier=None):
+    if edit_msgs is not None:
+        job.partial = "_Preparing targeted edits…_"
+        raw = llm.complete(
+            "draft_edits",
+            edit_msgs,
+            temperature=0.3,
+            validate=lambda text: apply_edit_response(draft, text),
+            response_format={"type": "json_object"},
+            tier=edit_tier,
+        )
+        try:
+            mode, new_draft, n_edits = apply_edit_response(draft, raw)
+            if mode == "edits":
+                return {"text": new_draft, "mode": "edits", "n_edits": n_edits, "diff": draft_diff(draft, new_draft)}
+        except ValueError as e:
+            print(f"⚠️ Targeted edits unusable ({e}); falling back to full rewrite.")
+        job.partial = ""
+        if job.cancel_requested:
+            return None
+    new_draft = llm.complete("draft", rewrite_msgs, temperature=0.5, stream_to=job, tier=tier)
+    return {"text": new_draft, "mode": "rewrite", "diff": draft_diff(draft, new_draft)}
+
+
+def submit_llm_job(kind, fn, *args, meta=None, group=None):
+    """Queue an LLM call for this session; return the handle or ``None`` if over the limit."""
+    try:
+        return get_job_queue().submit(st.session_state.session_id, kind, fn, *args, meta=meta, group=group)
+    except JobLimitError as e:
+        st.warning(str(e))
+        return None
 
 
 # -------------------------------------------------
 # DAILY TAB
 # -------------------------------------------------
+def pick_report(months, key):
+    """Month-paginated report selector; returns the chosen label."""
+    month = st.selectbox("Month:", options=list(months), index=0, key=f"{key}_month")
+    return st.selectbox("Report:", options=months[month], index=0, key=f"{key}_label")
+
+
+@profiling.profiled("streamlit-reports")
+def show_reports(report_dir, prefix, heading, key):
+    """Show one pre-rendered report, or two side by side."""
+    months = render.archive_months(report_dir, prefix)
+    compare = st.checkbox("Compare two reports side by side", key=f"{key}_compare")
+    panes = st.columns(2) if compare else [st.container()]
+    for i, pane in enumerate(panes):
+        with pane:
+            label = pick_report(months, f"{key}_{i}")
+            st.markdown(f"### {heading} – {label}")
+            meta = deadline.load_meta(f"{report_dir}/{prefix}{label}.md")
+            if meta and meta.get("degraded"):
+                # Shortcuts taken to ship by the deadline (src/deadline.py)
+                st.caption("⏳ Shipped under deadline pressure: " + "; ".join(
+                    f"{d['stage']}: {d['what']}" for d in meta["degradations"]))
+            # Pages are rendered once by the pipelines (src/render.py)
+            st.html(render.load_page(f"{report_dir}/{prefix}{label}.md"))
+
+
 with tabs[0]:
     st.subheader("Daily Report")
 
-    # ❌ Removed auto-generation via subprocess
-    # ✅ Just load whatever is already in outputs/daily
-    files = sorted(glob.glob(f"{DAILY_DIR}/venezuela_*.md"))
-    dates = [os.path.basename(f).split("_")[-1].replace(".md", "") for f in files]
-
-    if not dates:
+    if not render.archive_months(DAILY_DIR, "venezuela_"):
         st.error("No daily reports available yet. Make sure your backend job has generated them in `outputs/daily`.")
     else:
-        # Sort newest → oldest and show the most recent report by default
-        sorted_dates = sorted(dates, reverse=True)
-        selected_date = st.selectbox(
-            "Select report date:",
-            options=sorted_dates,
-            index=0  # default to latest
-        )
-
-        # Load and display selected report
-        selected_file = f"{DAILY_DIR}/venezuela_{selected_date}.md"
-        with open(selected_file, "r", encoding="utf-8") as f:
-            report = f.read()
-        st.markdown(f"### 📰 Daily Report – {selected_date}")
-        st.markdown(report)
+        show_reports(DAILY_DIR, "venezuela_", "📰 Daily Report", "daily")
 
 
 # -------------------------------------------------
@@ -59,100 +186,43 @@ with tabs[0]:
 with tabs[1]:
     st.subheader("Weekly Analysis")
 
-    weekly_files = sorted(glob.glob(f"{WEEKLY_DIR}/venezuela_week_*.md"))
-    if not weekly_files:
+    # Scenario trend from the columnar series the weekly job maintains
+    # (src/timeseries.py); the page only reads it.
+    series = timeseries.load()
+    if not series["ids"].size and os.path.exists(timeseries.SCENARIO_LOG_PATH):
+        st.info("The scenario trend has not been built yet. Run `python -m src.timeseries rebuild` "
+                "or wait for the next weekly run.")
+    if series["weeks"].size:
+        st.markdown("#### Scenario confidence trend")
+        week_index = pd.to_datetime(series["weeks"])
+        st.line_chart(pd.DataFrame(series["confidence"].T, index=week_index, columns=series["titles"]))
+        latest_rows = timeseries.latest(series)
+        for col, row in zip(st.columns(len(latest_rows)), latest_rows):
+            delta = None if row["delta"] != row["delta"] else f"{row['delta']:+.2f} vs previous week"
+            col.metric(row["title"], f"{row['confidence']:.2f}", delta)
+        with st.expander("Week-over-week changes"):
+            st.dataframe(pd.DataFrame(
+                timeseries.week_over_week(series).T, index=week_index.date, columns=series["titles"]
+            ).round(2))
+
+    if not render.archive_months(WEEKLY_DIR, "venezuela_week_"):
         st.info("No weekly reports available yet. Make sure your backend job has generated them in `outputs/weekly`.")
     else:
-        # Allow selecting among all weeks instead of only the latest
-        week_labels = [
-            os.path.basename(f).replace("venezuela_week_", "").replace(".md", "")
-            for f in weekly_files
-        ]
-        # newest → oldest (string sort works fine for YYYY-MM-DD[_to_...] format)
-        week_pairs = sorted(
-            zip(week_labels, weekly_files),
-            key=lambda x: x[0],
-            reverse=True
-        )
-
-        default_label = week_pairs[0][0]
-        selected_label = st.selectbox(
-            "Select weekly report:",
-            options=[w[0] for w in week_pairs],
-            index=0  # latest by default
-        )
-
-        # Find the corresponding file
-        selected_path = dict(week_pairs)[selected_label]
-        st.markdown(f"### 📆 Weekly Report – {selected_label}")
-        with open(selected_path, "r", encoding="utf-8") as f:
-            st.markdown(f.read())
+        show_reports(WEEKLY_DIR, "venezuela_week_", "📆 Weekly Report", "weekly")
 
 
 # -------------------------------------------------
 # EXCHANGE TAB
 # -------------------------------------------------
-def load_recent_reasoning(log_path="data/logs/scenarios_log.jsonl", n_per_scenario=3):
-    if not os.path.exists(log_path):
-        return "No reasoning logs available yet."
-    
-    from collections import defaultdict
-    scenario_notes = defaultdict(list)
-    with open(log_path, "r", encoding="utf-8") as f:
-        for line in f:
-            try:
-                entry = json.loads(line)
-                scenario_notes[entry["id"]].append(entry)
-            except:
-                continue
-    
-    # keep only last n entries per scenario
-    summary_texts = []
-    for sid, entries in scenario_notes.items():
-        # support both old "date" and new "report_generated_on" fields
-        def get_sort_date(e):
-            return e.get("date") or e.get("report_generated_on") or ""
-
-        entries = sorted(entries, key=get_sort_date, reverse=True)[:n_per_scenario]
-        for e in entries:
-            display_date = e.get("date") or e.get("report_generated_on") or "n/a"
-            summary_texts.append(
-                f"**{e['title']} ({display_date})** — {e['reasoning']} "
-                f"(→ plausibility: {e['plausibility']}, confidence: {e['updated_confidence']})"
-            )
-    
-    return "\n\n".join(summary_texts)
-
-@st.cache_data(ttl=3600)
 def load_brainstorm_context():
-    ctx_parts = []
-
-    # 1. Background context
-    if os.path.exists("data/context/venezuela_context.md"):
-        with open("data/context/venezuela_context.md", "r", encoding="utf-8") as f:
-            ctx_parts.append(f.read())
-
-    # 2. Scenarios (short summaries)
-    if os.path.exists("data/context/venezuela_scenarios.json"):
-        with open("data/context/venezuela_scenarios.json", "r", encoding="utf-8") as f:
-            scenarios = json.load(f)
-        text = "\n\n".join([f"**{s['title']}**: {s['narrative']}" for s in scenarios])
-        ctx_parts.append("### Current Scenarios\n" + text)
-
-    # 3. Latest weekly report
-    weekly_files = sorted(glob.glob("outputs/weekly/venezuela_week_*.md"))
-    if weekly_files:
-        with open(weekly_files[-1], "r", encoding="utf-8") as f:
-            ctx_parts.append("### Latest Weekly Report\n" + f.read())
-
-    # 4. Recent reasoning logs
-    log_summary = load_recent_reasoning()
-    ctx_parts.append("### Recent Analytical Reasoning\n" + log_summary)
-
-    return "\n\n---\n\n".join(ctx_parts)
+    """The pipelines' pre-assembled context bundle (src/context_bundle.py), read once per change."""
+    return context_bundle.load()["text"]
 
 with tabs[2]:
     st.subheader("💭 Brainstorm: Discuss Current Dynamics")
+    if context_bundle.stale(context_bundle.load()):
+        st.caption("⚠️ Some sources changed after the analysis context was last published; "
+                   "answers use the published version until the next pipeline run.")
 
     # 1️⃣ Initialize chat history
     if "messages" not in st.session_state:
@@ -162,53 +232,109 @@ with tabs[2]:
                 "content": "Hi! Let’s discuss the current dynamics in Venezuela. What’s on your mind?"
             }
         ]
+    if st.session_state.get("chat_memory") is None:
+        st.session_state.chat_memory = ConversationMemory()
+
+    CHAT_SYSTEM_PROMPT = (
+        "You are an experienced political analyst specializing in Venezuela. "
+        "Maintain a thoughtful, grounded discussion. "
+        "Use the provided context and previous exchanges for continuity."
+    )
+
+    def submit_chat_reply(question, context, version, opening):
+        """Queue the reply; opening questions are stored in the shared answer cache when done."""
+        task = llm.classify_chat(question)
+        # The memory manager keeps a token-budgeted window of recent turns
+        # plus a running synopsis of older ones, with the stable
+        # instructions + context first so prompt caching can apply.
+        st.session_state.chat_job = submit_llm_job(
+            "chat",
+            run_memory_chat_job,
+            st.session_state.chat_memory,
+            CHAT_SYSTEM_PROMPT,
+            context,
+            list(st.session_state.messages),
+            0.6,
+            task,
+            meta={"cache": {"question": question, "version": version, "task": task}} if opening else None,
+        )
 
     # 2️⃣ Display existing chat history
-    for msg in st.session_state.messages:
+    for i, msg in enumerate(st.session_state.messages):
         with st.chat_message(msg["role"]):
             st.markdown(msg["content"])
+            cached = msg.get("cached")
+            if cached:
+                st.caption(
+                    f"⚡ Cached answer to a similar question (“{cached['question']}”, "
+                    f"{cached['ts'][:16].replace('T', ' ')} UTC, similarity {cached['score']:.2f}), "
+                    "from the same context version."
+                )
+                last = i == len(st.session_state.messages) - 1
+                idle = st.session_state.get("chat_job") is None
+                if last and idle and st.button("Ask again without cache", key=f"uncache_{i}"):
+                    st.session_state.messages.pop()
+                    bundle = context_bundle.load()
+                    submit_chat_reply(st.session_state.messages[-1]["content"], bundle["text"],
+                                      bundle["version"], opening=True)
+                    st.rerun()
+
+    if st.session_state.get("chat_error"):
+        st.error(f"The last reply failed: {st.session_state.pop('chat_error')}")
+
+    # 3️⃣ Pending reply: poll the background job without blocking other widgets
+    if st.session_state.get("chat_job") is not None:
+
+        @st.fragment(run_every=1.0)
+        def chat_job_panel():
+            job = st.session_state.chat_job
+            if job is None:
+                return
+            if job.finished:
+                if job.status == DONE:
+                    st.session_state.messages.append({"role": "assistant", "content": job.result})
+                    if job.meta.get("cache"):
+                        answer_cache.store(answer=job.result, **job.meta["cache"])
+                elif job.status == ERROR:
+                    st.session_state.chat_error = job.error
+                st.session_state.chat_job = None
+                st.rerun()
+            with st.chat_message("assistant"):
+                st.markdown(job.partial or "_Thinking…_")
+                if st.button("Cancel", key=f"cancel_chat_{job.id}"):
+                    get_job_queue().cancel(job)
+                    st.session_state.chat_job = None
+                    st.rerun()
+
+        chat_job_panel()
+
+    # 4️⃣ Chat input (this will be pinned to the bottom)
+    user_input = st.chat_input(
+        "Ask about Venezuela's current situation...",
+        disabled=st.session_state.get("chat_job") is not None,
+    )
 
-    # 3️⃣ Chat input (this will be pinned to the bottom)
-    user_input = st.chat_input("Ask about Venezuela's current situation...")
-
-    # 4️⃣ Handle new input
+    # 5️⃣ Handle new input
     if user_input:
         # Store user message in state
         st.session_state.messages.append({"role": "user", "content": user_input})
 
-        # Generate model reply and store it in state
-        with st.spinner("Thinking..."):
-            context = load_brainstorm_context()
-
-            messages_for_model = [
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an experienced political analyst specializing in Venezuela. "
-                        "Maintain a thoughtful, grounded discussion. "
-                        "Use the provided context and previous exchanges for continuity."
-                    ),
-                }
-            ]
-            # include recent conversation
-            messages_for_model.extend(st.session_state.messages[-8:])
-
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages_for_model + [
-                    {
-                        "role": "user",
-                        "content": f"Context:\n{context}\n\nQuestion:\n{user_input}",
-                    }
-                ],
-                temperature=0.6,
-            )
-            reply = response.choices[0].message.content
-
-        st.session_state.messages.append({"role": "assistant", "content": reply})
+        bundle = context_bundle.load()
+        context, version = bundle["text"], bundle["version"]
+        # Opening questions do not depend on earlier turns, so they can be
+        # answered from (and added to) the answer cache shared by all analysts.
+        opening = sum(m["role"] == "user" for m in st.session_state.messages) == 1
+        hit = answer_cache.lookup(user_input, version, llm.classify_chat(user_input)) if opening else None
+        if hit:
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": hit["answer"],
+                "cached": {k: hit[k] for k in ("question", "ts", "score")},
+            })
+        else:
+            submit_chat_reply(user_input, context, version, opening)
 
-        # 5️⃣ Rerun so the new messages show up in the history *above* the input
+        # 6️⃣ Rerun so the new messages show up in the history *above* the input
         st.rerun()
 
 # -------------------------------------------------
@@ -251,18 +377,42 @@ with tabs[3]:
         value=True
     )
 
+    n_variants = st.slider(
+        "Variants to compare",
+        min_value=1,
+        max_value=len(DRAFT_VARIANTS),
+        value=1,
+        help="Generate several framings in parallel from the same context and pick one to refine.",
+    )
+
     col_gen, col_clear = st.columns([3, 1])
     generate_btn = col_gen.button("Generate draft")
     clear_btn = col_clear.button("Clear draft")
 
     if clear_btn:
+        for job in st.session_state.get("draft_variants") or []:
+            get_job_queue().cancel(job)
+        st.session_state.draft_variants = []
         st.session_state.draft_text = ""
         st.session_state.draft_meta = {}
+        st.session_state.draft_last_change = None
         st.success("Draft cleared.")
 
-    # --- Helper to call OpenAI once for drafting/refining ---
-    def call_drafting_model(instruction_block: str, draft: str | None = None):
-        context_text = load_brainstorm_context() if include_context else ""
+    style_label = "background note" if doc_type == "Background note" else "talking points"
+
+    system_msg = (
+        "You are a UN political affairs officer drafting internal background notes and talking points. "
+        "Match the structure and tone of the examples provided, but do not copy their wording or facts. "
+        "For background notes, use a title and numbered sections with short factual paragraphs. "
+        "For talking points, use a clear heading and concise bullets, grouped under subheadings if needed. "
+        "Maintain a neutral, diplomatic tone and base all content only on the provided context and instructions. "
+    )
+
+    # --- Helper to assemble the drafting/refining prompt ---
+    def drafting_messages(instruction_block: str, draft: str | None = None, context_scale=1.0, examples_share=1.0):
+        # The budget governor (src/budget.py) may shorten the context; its
+        # "drop articles" step drops the style examples here.
+        context_text = budget.shrink(load_brainstorm_context(), context_scale) if include_context else ""
 
         examples = """
 EXAMPLE 1: Background note
@@ -279,14 +429,9 @@ Heading: Proposed talking points for SG Meeting with the PR of the DRC on curren
 
 """
 
-        style_label = "background note" if doc_type == "Background note" else "talking points"
-
-        system_msg = (
-            "You are a UN political affairs officer drafting internal background notes and talking points. "
-            "Match the structure and tone of the examples provided, but do not copy their wording or facts. "
-            "For background notes, use a title and numbered sections with short factual paragraphs. "
-            "For talking points, use a clear heading and concise bullets, grouped under subheadings if needed. "
-            "Maintain a neutral, diplomatic tone and base all content only on the provided context and instructions. "
+        examples_block = (
+            f"\nUse the following examples for structure and tone (do not copy wording):\n{examples}\n"
+            if examples_share >= 1 else ""
         )
 
         if draft:
@@ -320,44 +465,170 @@ Meeting information:
 
 Initial instructions:
 {instruction_block or "none"}
-
-Use the following examples for structure and tone (do not copy wording):
-{examples}
-
+{examples_block}
 Context to ground your draft (if provided):
 {context_text}
 """
 
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.5,
+        return [
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def plan_drafting(instruction_block: str, draft: str | None = None):
+        """Budget-fitted ``(messages, tier)``, or ``None`` (error shown) if no plan fits."""
+        try:
+            return budget.plan("draft", lambda scale, share: drafting_messages(instruction_block, draft, scale, share))
+        except budget.BudgetExceededError as e:
+            st.error(f"💸 {e}")
+            return None
+
+    # --- Queue one drafting/refining call in the background ---
+    def call_drafting_model(instruction_block: str, draft: str | None = None, meta=None, targeted=False):
+        planned = plan_drafting(instruction_block, draft)
+        if planned is None:
+            return None
+        messages, tier = planned
+        if not draft:
+            return submit_llm_job("draft", run_chat_job, messages, 0.5, "draft", tier, meta=meta)
+        edit_msgs = edit_tier = None
+        if targeted:
+            context_text = load_brainstorm_context() if include_context else ""
+            edit_msgs, edit_tier = plan_edits(system_msg, style_label, draft, instruction_block, topic, context_text)
+        return submit_llm_job(
+            "draft", run_refine_job, draft, edit_msgs, messages, tier, edit_tier, meta=meta
         )
-        return response.choices[0].message.content
 
-    # --- Generate initial draft ---
+    # --- Generate initial draft (or N variants in parallel) ---
     if generate_btn:
+        draft_meta = {
+            "doc_type": doc_type,
+            "topic": topic,
+            "initial_instructions": initial_instructions,
+        }
+        busy = st.session_state.get("draft_job") is not None or any(
+            not j.finished for j in st.session_state.get("draft_variants") or []
+        )
         if not topic.strip():
             st.error("Please provide at least a topic or meeting description.")
+        elif busy:
+            st.warning("A draft is already being generated.")
+        elif n_variants > 1:
+            # One shared prompt (context assembled once), N concurrent calls
+            planned = plan_drafting(initial_instructions)
+            if planned is not None:
+                base_messages, tier = planned
+                group = uuid.uuid4().hex
+                jobs = []
+                for variant in DRAFT_VARIANTS[:n_variants]:
+                    job = submit_llm_job(
+                        "draft",
+                        run_chat_job,
+                        variant_messages(base_messages, variant),
+                        variant["temperature"],
+                        "draft",
+                        tier,
+                        meta={"variant": variant, "draft_meta": draft_meta},
+                        group=group,
+                    )
+                    if job is not None:
+                        jobs.append(job)
+                st.session_state.draft_variants = jobs
         else:
-            with st.spinner("Drafting..."):
-                draft = call_drafting_model(initial_instructions, draft=None)
-                st.session_state.draft_text = draft
-                st.session_state.draft_meta = {
-                    "doc_type": doc_type,
-                    "topic": topic,
-                    "initial_instructions": initial_instructions,
-                }
+            st.session_state.draft_job = call_drafting_model(
+                initial_instructions,
+                draft=None,
+                meta={"mode": "generate", "draft_meta": draft_meta},
+            )
+
+    # --- Variants: stream side by side, pick one to continue refining ---
+    variants = st.session_state.get("draft_variants") or []
+    if variants:
+        polling = any(not j.finished for j in variants)
+
+        @st.fragment(run_every=1.0 if polling else None)
+        def draft_variants_panel():
+            jobs = st.session_state.draft_variants
+            if polling and all(j.finished for j in jobs):
+                st.rerun()
+            st.markdown("### 🔀 Draft variants")
+            for col, job in zip(st.columns([1] * len(jobs)), jobs):
+                variant = job.meta["variant"]
+                with col:
+                    st.markdown(f"**{variant['label']}** · temperature {variant['temperature']}")
+                    if job.status == DONE:
+                        if st.button("Use this draft", key=f"pick_{job.id}"):
+                            for other in jobs:
+                                get_job_queue().cancel(other)
+                            st.session_state.draft_text = job.result
+                            st.session_state.draft_meta = job.meta["draft_meta"]
+                            st.session_state.draft_last_change = None
+                            st.session_state.draft_variants = []
+                            st.rerun()
+                        st.markdown(job.result)
+                    elif job.status == ERROR:
+                        st.error(job.error)
+                    elif job.finished:
+                        st.caption("Cancelled.")
+                    else:
+                        st.caption(f"Generating… {job.elapsed():.0f}s")
+                        st.markdown(job.partial)
+            if st.button("Discard variants"):
+                for job in jobs:
+                    get_job_queue().cancel(job)
+                st.session_state.draft_variants = []
+                st.rerun()
+
+        draft_variants_panel()
+
+    # --- Pending draft job: stream progress, allow cancel ---
+    if st.session_state.get("draft_job") is not None:
+
+        @st.fragment(run_every=1.0)
+        def draft_job_panel():
+            job = st.session_state.draft_job
+            if job is None:
+                return
+            if job.finished:
+                if job.status == DONE and job.meta.get("mode") == "generate":
+                    st.session_state.draft_text = job.result
+                    st.session_state.draft_meta = job.meta["draft_meta"]
+                    st.session_state.draft_last_change = None
+                elif job.status == DONE and job.result:
+                    st.session_state.draft_text = job.result["text"]
+                    st.session_state.draft_last_change = job.result
+                elif job.status == ERROR:
+                    st.session_state.draft_error = job.error
+                st.session_state.draft_job = None
+                st.rerun()
+            label = "Drafting..." if job.meta.get("mode") == "generate" else "Refining draft..."
+            st.info(f"{label} ({job.elapsed():.0f}s)")
+            if job.partial:
+                st.markdown(job.partial)
+            if st.button("Cancel", key=f"cancel_draft_{job.id}"):
+                get_job_queue().cancel(job)
+                st.session_state.draft_job = None
+                st.rerun()
+
+        draft_job_panel()
+
+    if st.session_state.get("draft_error"):
+        st.error(f"Drafting failed: {st.session_state.pop('draft_error')}")
 
     # --- Show current draft + refinement controls ---
-    if st.session_state.draft_text:
+    if st.session_state.draft_text and st.session_state.get("draft_job") is None:
         st.markdown("### ✍️ Current draft")
         st.markdown(st.session_state.draft_text)
 
+        last_change = st.session_state.get("draft_last_change")
+        if last_change:
+            if last_change["mode"] == "edits":
+                label = f"Last refinement: {last_change['n_edits']} targeted edit(s)"
+            else:
+                label = "Last refinement: full rewrite"
+            with st.expander(label):
+                st.code(last_change["diff"] or "(no changes)", language="diff")
+
         st.markdown("---")
         st.markdown("#### 🔧 Refine this draft")
 
@@ -367,12 +638,51 @@ Context to ground your draft (if provided):
             key="refinement_instr",
         )
 
+        refine_mode = st.radio(
+            "Refinement mode",
+            options=["Targeted edits (fast)", "Full rewrite"],
+            horizontal=True,
+            help="Targeted edits change only the affected sections and fall back to a full rewrite for sweeping changes.",
+        )
+
         if st.button("Apply refinement"):
             if not refinement_instr.strip():
                 st.warning("Please add some refinement instructions.")
             else:
-                with st.spinner("Refining draft..."):
-                    new_draft = call_drafting_model(refinement_instr, draft=st.session_state.draft_text)
-                    st.session_state.draft_text = new_draft
-                    st.success("Draft updated.")
-                    st.rerun()
\ No newline at end of file
+                st.session_state.draft_job = call_drafting_model(
+                    refinement_instr,
+                    draft=st.session_state.draft_text,
+                    meta={"mode": "refine"},
+                    targeted=refine_mode.startswith("Targeted"),
+                )
+                st.rerun()
+
+
+# -------------------------------------------------
+# SEARCH TAB
+# -------------------------------------------------
+with tabs[4]:
+    st.subheader("Search the Archive")
+
+    # The pipelines keep the index current (src/search.py); the page only reads it.
+    if not os.path.exists(search.SEARCH_DB_PATH):
+        st.info("The search index has not been built yet. Run `python -m src.search index` "
+                "or wait for the next pipeline run.")
+
+    query = st.text_input(
+        "Search reports and curated articles:",
+        placeholder='e.g. chevron licence, cartel soles, sanc*',
+        key="search_query",
+    )
+    scope = st.radio("In:", ["All", "Daily", "Weekly", "Articles"], horizontal=True, key="search_scope")
+
+    if query:
+        kind = {"All": None, "Daily": "daily", "Weekly": "weekly", "Articles": "article"}[scope]
+        t0 = time.perf_counter()
+        with profiling.run("streamlit-search"), profiling.stage("search"):
+            hits = search.search(query, kind=kind, limit=50)
+        st.caption(f"{len(hits)} result(s) in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        for h in hits:
+            source = f" — [source]({h['ref']})" if h["kind"] == "article" and h["ref"] else ""
+            st.markdown(f"**{h['kind'].title()} · {h['label']}** — {h['title']}{source}")
+            st.markdown("> " + h["snippet"].replace("\n", " "))
@@ -0,0 +1,69 @@
+"""Smoke tests for :mod:`src.answer_cache` (shared Interact answers)."""
+
+
+def test_similar_opening_question_hits(tmp_path):
+    """A reworded question reuses the answer; a different topic does not."""
+
+    from src import answer_cache
+
+    path = str(tmp_path / "answers.jsonl")
+    answer_cache.store("What changed this week with the US naval deployment?", "Ships moved.", "v1", path=path)
+    answer_cache.store("Who leads the opposition?", "Machado.", "v1", path=path)
+
+    hit = answer_cache.lookup("What has changed with the naval deployment this week?", "v1", path=path)
+    assert hit["answer"] == "Ships moved." and hit["score"] >= 0.8
+    assert answer_cache.lookup("How are oil exports to China doing?", "v1", path=path) is None
+    assert answer_cache.lookup("What changed this week with the US naval deployment?", "v1", task="chat_lookup",
+                               path=path) is None
+
+
+def test_new_context_version_invalidates(tmp_path):
+    """Answers from an older context never match, and are dropped once the new version stores one."""
+
+    from src import answer_cache
+
+    path = tmp_path / "answers.jsonl"
+    old, new = "3f2a9c0d1e4b5a6c", "9b8e7d6c5a4f3e2d"
+    answer_cache.store("Naval deployment status in the Caribbean?", "Old answer.", old, path=str(path))
+
+    assert answer_cache.lookup("Naval deployment status in the Caribbean?", new, path=str(path)) is None
+    answer_cache.store("Chevron licence renewal outlook?", "New answer.", new, path=str(path))
+    assert [e["version"] for e in answer_cache.entries(str(path))] == [new]
+
+
+def test_vague_questions_are_not_cached(tmp_path):
+    """Questions with fewer than two topical terms are neither stored nor matched."""
+
+    from src import answer_cache
+
+    path = str(tmp_path / "answers.jsonl")
+    assert answer_cache.normalize("What about now?") == set()
+    assert answer_cache.store("Why?", "Because.", "v1", path=path) is None
+    assert answer_cache.lookup("Why?", "v1", path=path) is None
+
+
+def test_concurrent_stores_respect_the_cap(tmp_path, monkeypatch):
+    """Sessions storing at once, past the cap, leave exactly the newest ``ANSWER_CACHE_MAX_ENTRIES`` answers."""
+
+    import threading, time
+    from src import answer_cache, storage
+
+    append = storage.append_jsonl
+
+    def slow_append(path, entries):
+        time.sleep(0.02)   # other sessions decide while this append is in flight
+        return append(path, entries)
+
+    monkeypatch.setattr(storage, "append_jsonl", slow_append)
+    monkeypatch.setattr(answer_cache, "ANSWER_CACHE_MAX_ENTRIES", 5)
+    path = str(tmp_path / "answers.jsonl")
+    writers = [threading.Thread(target=answer_cache.store, args=(f"Naval deployment question number {n}?", f"Answer {n}.", "v1"),
+                                kwargs={"path": path}) for n in range(20)]
+    for w in writers:
+        w.start()
+    for w in writers:
+        w.join()
+
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 5
+    assert len(answer_cache.entries(path)) == 5
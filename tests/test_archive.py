@@ -0,0 +1,91 @@
+"""Smoke tests for :mod:`src.archive` (monthly raw segments and retention)."""
+
+import json
+from datetime import date
+
+
+def _article(n, published, **extra):
+    return {"title": f"Venezuela story {n}", "description": "Maduro spoke in Caracas about PDVSA output.",
+            "content": "Full text " * 20, "url": f"https://news/{n}", "publishedAt": published, "lang": "en",
+            "image": f"https://img/{n}.jpg", **extra}
+
+
+def _raw(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    files = {
+        "news_2025-10-31": [_article(1, "2025-10-31T10:00:00Z"), _article(2, "2025-11-01T01:00:00Z")],
+        "news_2025-11-01": [_article(2, "2025-11-01T01:00:00Z"), _article(3, "2025-11-01T09:00:00Z")],
+        "news_week_2025-10-27_to_2025-11-02": [_article(1, "2025-10-31T10:00:00Z"), _article(3, "2025-11-01T09:00:00Z")],
+        "news_2025-12-30": [_article(4, "2025-12-30T09:00:00Z")],
+    }
+    for stem, articles in files.items():
+        (raw / f"{stem}.json").write_text(json.dumps(articles), encoding="utf-8")
+    return raw, files
+
+
+def test_compaction_is_transparent_to_readers(tmp_path):
+    """Old files move into de-duplicated monthly segments and read back unchanged; recent ones stay loose."""
+
+    from src import archive
+
+    raw, files = _raw(tmp_path)
+    summary = archive.compact(str(raw), today=date(2026, 1, 5), keep_days=14, full_days=365)
+
+    assert sorted(summary["files"]) == ["news_2025-10-31", "news_2025-11-01", "news_week_2025-10-27_to_2025-11-02"]
+    assert summary["segments"] == {"2025-10": {"articles": 1, "tier": "full"}, "2025-11": {"articles": 2, "tier": "full"}}
+    assert sorted(p.name for p in raw.glob("*.json")) == ["news_2025-12-30.json"]
+    for stem, articles in files.items():
+        assert archive.load(stem, str(raw)) == articles
+    assert archive.days(str(raw)) == [date(2025, 10, 31), date(2025, 11, 1), date(2025, 12, 30)]
+    assert archive.compact(str(raw), today=date(2026, 1, 5), keep_days=14, full_days=365)["files"] == []
+
+
+def test_old_months_keep_projected_fields_only(tmp_path):
+    """Past the full-text window, segments drop content and images but keep what the readers match on."""
+
+    from src import archive
+    from src.config import RAW_PROJECTED_FIELDS
+
+    raw, _ = _raw(tmp_path)
+    archive.compact(str(raw), today=date(2026, 1, 5), keep_days=14, full_days=365)
+    archive.compact(str(raw), today=date(2026, 6, 1), keep_days=14, full_days=170)
+
+    stats = archive.stats(str(raw))
+    assert stats["projected_segments"] == ["2025-10", "2025-11"] and stats["loose_files"] == 0
+    old = archive.load("news_2025-11-01", str(raw))
+    assert [a["url"] for a in old] == ["https://news/2", "https://news/3"]
+    assert set(old[0]) <= set(RAW_PROJECTED_FIELDS) and "content" not in old[0]
+    assert "content" in archive.load("news_2025-12-30", str(raw))[0]
+
+
+def test_pipelines_read_compacted_days(tmp_path):
+    """Batch backfills and replays find compacted days through the lookup API."""
+
+    from src import archive, batch, replay
+
+    raw, _ = _raw(tmp_path)
+    archive.compact(str(raw), today=date(2026, 1, 5), keep_days=14, full_days=365)
+
+    pending = batch.pending_dates(date(2025, 10, 30), date(2025, 11, 2), raw_dir=str(raw),
+                                  daily_dir=str(tmp_path / "daily"), batch_dir=str(tmp_path / "batch"))
+    assert pending == [date(2025, 10, 31), date(2025, 11, 1)]
+    assert replay.recorded_range(str(raw)) == (date(2025, 12, 30), date(2025, 12, 30))
+    assert [a["url"] for a in replay.load_archive(str(raw))["en"]] == [f"https://news/{n}" for n in (1, 2, 3, 4)]
+
+
+def test_the_copy_with_more_text_wins(tmp_path):
+    """De-duplication keeps the copy with the longest text, not the one with the most fields."""
+
+    from src import archive
+
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    excerpt = _article(1, "2025-10-31T10:00:00Z", source={"name": "Wire"}, author="Desk", lang_detected="en")
+    enriched = dict(_article(1, "2025-10-31T10:00:00Z"), full_text="Maduro spoke for two hours. " * 40)
+    enriched.pop("image")
+    (raw / "news_2025-10-31.json").write_text(json.dumps([enriched]), encoding="utf-8")
+    (raw / "news_2025-11-01.json").write_text(json.dumps([excerpt]), encoding="utf-8")
+    archive.compact(str(raw), today=date(2026, 1, 5), keep_days=14, full_days=365)
+
+    assert archive.load("news_2025-11-01", str(raw))[0]["full_text"] == enriched["full_text"]
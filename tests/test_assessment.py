@@ -0,0 +1,126 @@
+"""Smoke tests for :mod:`src.assessment` (incremental scenario assessment).
+
+Reasoning calls go to :class:`src.llm.StubProvider`, which answers for
+whichever scenarios appear in the prompt.
+"""
+
+import json
+import re
+
+import pytest
+
+SCENARIOS = [
+    {"id": "S-1", "title": "Coercive standoff", "narrative": "Sanctions and a naval deployment continue.",
+     "signals": ["sanctions", "naval deployment", "warship", "sanciones"], "confidence": 0.4},
+    {"id": "S-2", "title": "Accommodation", "narrative": "Negotiations lead to a deal on oil licenses.",
+     "signals": ["negotiation", "talks", "oil license", "negociaciones"], "confidence": 0.3},
+]
+
+
+def _a(aid, title, desc):
+    return {"id": aid, "publishedAt": "2025-11-10T12:00:00Z", "title": title, "description": desc, "content": "", "url": aid}
+
+
+NAVAL = [_a("n1", "New sanctions and warship deployment", "The US announced new sanctions as a warship deployment expanded.")]
+TALKS = [_a("t1", "Oil license talks resume", "Negotiation on an oil license resumed in Doha between both governments.")]
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    from src import llm
+
+    monkeypatch.chdir(tmp_path)
+
+    def responder(model, messages):
+        ids = re.findall(r"^### (S-\d)", messages[-1]["content"], flags=re.M)
+        return json.dumps([
+            {"id": i, "title": i, "plausibility": "up", "reasoning": f"New evidence for {i}.", "updated_confidence": 0.6}
+            for i in ids
+        ])
+
+    provider = llm.StubProvider(responder)
+    llm.set_provider(provider)
+    yield provider
+    llm.set_provider(None)
+
+
+def _run(articles, mode="incremental"):
+    from src import assessment
+
+    entries, pending = assessment.assess(articles, SCENARIOS, "", lambda items: "\n".join(a["title"] for a in items), mode=mode)
+    assessment.log_entries(entries, report_generated_on="2025-11-10")
+    assessment.commit_state(entries, pending)
+    return {e["id"]: e for e in entries}
+
+
+def test_articles_map_to_their_scenario():
+    """Local evidence mapping sends each article to the matching scenario."""
+
+    from src import assessment
+
+    mapped = assessment.map_evidence(NAVAL + TALKS, assessment.scenario_profiles(SCENARIOS))
+
+    assert [a["id"] for a in mapped["S-1"]] == ["n1"]
+    assert [a["id"] for a in mapped["S-2"]] == ["t1"]
+
+
+def test_only_scenarios_with_new_evidence_are_reassessed(stub):
+    """After a first assessment, new naval news re-runs only S-1."""
+
+    _run(NAVAL + TALKS)
+    second = _run(NAVAL + TALKS + [_a("n2", "More sanctions on oil tankers", "Washington added sanctions and another warship.")])
+
+    assert second["S-1"]["assessment"] == "reassessed" and second["S-1"]["evidence_count"] == 1
+    assert second["S-2"]["assessment"] == "carried_forward"
+    assert second["S-2"]["plausibility"] == "up"   # repeats the last assessment, not "steady"
+    assert second["S-2"]["carried_from"] == "2025-11-10"
+    assert "### S-2" not in stub.calls[-1]["messages"][-1]["content"]
+
+    with open("data/logs/scenarios_log.jsonl", encoding="utf-8") as f:
+        logged = [json.loads(line) for line in f]
+    assert [e["assessment"] for e in logged[-2:]] == ["reassessed", "carried_forward"]
+
+
+def test_no_new_evidence_makes_no_call_and_full_mode_reassesses_all(stub):
+    """Repeated input carries everything forward; full mode ignores the state."""
+
+    _run(NAVAL + TALKS)
+    calls = len(stub.calls)
+    repeat = _run(NAVAL + TALKS)
+    full = _run(NAVAL + TALKS, mode="full")
+
+    assert {e["assessment"] for e in repeat.values()} == {"carried_forward"}
+    assert len(stub.calls) == calls + 1
+    assert {e["assessment"] for e in full.values()} == {"reassessed"}
+
+
+def test_overlapping_runs_keep_each_others_evidence(stub):
+    """Two runs that assess from the same state both leave their evidence in it."""
+
+    from src import assessment
+
+    build = lambda items: "\n".join(a["title"] for a in items)
+    first, first_pending = assessment.assess(NAVAL, SCENARIOS, "", build)
+    second, second_pending = assessment.assess(TALKS, SCENARIOS, "", build)
+    assessment.commit_state(first, first_pending)
+    assessment.commit_state(second, second_pending)
+
+    state = assessment.load_state()["scenarios"]
+    assert state["S-1"]["evidence"] == ["n1"] and state["S-2"]["evidence"] == ["t1"]
+
+
+def test_daily_pulses_do_not_use_up_the_weekly_evidence(stub):
+    """Articles already seen by the pulses are still new evidence for the weekly run."""
+
+    from src import assessment
+
+    build = lambda items: "\n".join(a["title"] for a in items)
+    for articles in (NAVAL, TALKS):
+        entries, pending = assessment.assess(articles, SCENARIOS, "", build, mode="pulse")
+        assessment.commit_state(entries, pending)
+    weekly = _run(NAVAL + TALKS)
+
+    assert {e["assessment"] for e in weekly.values()} == {"reassessed"}
+    assert {e["evidence_count"] for e in weekly.values()} == {1}
+    state = assessment.load_state()
+    assert state["pulse"]["S-1"]["evidence"] == state["scenarios"]["S-1"]["evidence"] == ["n1"]
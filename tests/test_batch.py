@@ -0,0 +1,101 @@
+"""Smoke tests for :mod:`src.batch` against the local batch endpoint in :mod:`src.replay`."""
+
+import json
+from datetime import date
+
+import pytest
+
+
+def _article(title, published):
+    return {"title": title, "description": f"{title} in Venezuela, officials said on Monday.",
+            "url": f"https://news/{abs(hash(title))}", "publishedAt": published, "lang": "en",
+            "source": {"name": "Wire"}}
+
+
+@pytest.fixture
+def fake_batch(tmp_path, monkeypatch):
+    """A scratch tree with two recorded days, the fake endpoint and a real SDK client for it."""
+
+    from openai._client import OpenAI   # the real client; conftest stubs ``openai.OpenAI``
+
+    from src import llm, replay
+
+    monkeypatch.chdir(tmp_path)
+    raw = tmp_path / "data" / "raw"
+    raw.mkdir(parents=True)
+    for day, title in (("2025-11-10", "Maduro orders military drills"), ("2025-11-11", "Chevron licence renewed")):
+        (raw / f"news_{day}.json").write_text(json.dumps([_article(title, f"{day}T12:00:00Z")]), encoding="utf-8")
+
+    llm.set_provider(llm.StubProvider(lambda model, messages: replay.answer(messages)))
+    gnews, openai, env = replay.start_fakes(raw_dir=str(raw), batch_seconds=0.05)
+    yield openai, OpenAI(api_key="x", base_url=env["OPENAI_BASE_URL"], max_retries=0)
+    gnews.shutdown()
+    openai.shutdown()
+    llm.set_provider(None)
+
+
+def test_backfill_writes_briefs_and_skips_them_next_time(fake_batch, tmp_path):
+    """One batch covers both days; a second run finds nothing pending."""
+
+    from src import batch
+
+    server, client = fake_batch
+    manifest = batch.run_daily_batch(date(2025, 11, 10), date(2025, 11, 11), client=client, poll_s=0.02)
+
+    assert manifest["status"] == "applied" and manifest["applied"] == ["2025-11-10", "2025-11-11"]
+    assert manifest["fallback"] == [] and len(server.batches) == 1
+    brief = (tmp_path / "outputs" / "daily" / "venezuela_2025-11-10.md").read_text(encoding="utf-8")
+    assert "Key Developments Today" in brief
+    assert batch.run_daily_batch(date(2025, 11, 10), date(2025, 11, 11), client=client, poll_s=0.02) is None
+
+
+def test_fan_out_is_idempotent(fake_batch, tmp_path):
+    """Re-applying saved results rewrites nothing once every date is recorded."""
+
+    from src import batch
+
+    server, client = fake_batch
+    manifest = batch.run_daily_batch(date(2025, 11, 10), date(2025, 11, 10), client=client, poll_s=0.02)
+    path = tmp_path / "outputs" / "daily" / "venezuela_2025-11-10.md"
+    path.write_text("edited", encoding="utf-8")
+
+    assert batch.fan_out(manifest, batch.read_results(manifest)) == []
+    assert path.read_text(encoding="utf-8") == "edited"
+    assert batch.resume(client=client) == []
+
+
+def test_failed_lines_fall_back_to_interactive_calls(fake_batch, tmp_path):
+    """Lines the batch could not answer are regenerated through llm.complete."""
+
+    from src import batch, daily_pipeline, llm
+
+    server, client = fake_batch
+    server.faults.error_rate = 1.0
+    manifest = batch.run_daily_batch(date(2025, 11, 10), date(2025, 11, 11), client=client, poll_s=0.02)
+
+    assert manifest["fallback"] == ["2025-11-10", "2025-11-11"]
+    calls = [c for c in llm.get_provider().calls if c["messages"][0]["content"] == daily_pipeline.SUMMARY_SYSTEM]
+    assert len(calls) == 2
+    assert (tmp_path / "outputs" / "daily" / "venezuela_2025-11-11.md").exists()
+
+
+def test_batch_spend_counts_towards_the_day_budget(fake_batch, monkeypatch):
+    """Applied answers are logged with their discounted cost, and a batch that would break the day budget is not submitted."""
+
+    from src import batch, budget
+    from src.config import LLM_ROUTING_LOG
+
+    server, client = fake_batch
+    batch.run_daily_batch(date(2025, 11, 10), date(2025, 11, 10), client=client, poll_s=0.02)
+
+    with open(LLM_ROUTING_LOG, encoding="utf-8") as f:
+        entry = [json.loads(line) for line in f][-1]
+    full = budget.cost(entry["model"], entry["prompt_tokens"], entry["completion_tokens"])
+    assert entry["prompt_tokens"] > 0 and entry["cost_usd"] == round(full * batch.BATCH_DISCOUNT, 6)
+    assert budget.day_spent() >= entry["cost_usd"] > 0
+
+    requests = batch.build_requests([date(2025, 11, 11)])
+    monkeypatch.setattr(budget, "BUDGET_DAY_USD", budget.day_spent())
+    with pytest.raises(budget.BudgetExceededError):
+        batch.submit(requests, client)
+    assert len(server.batches) == 1
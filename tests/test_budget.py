@@ -0,0 +1,89 @@
+"""Smoke tests for :mod:`src.budget` (pre-flight sizing and budgets)."""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    from src import llm
+
+    monkeypatch.chdir(tmp_path)
+    provider = llm.StubProvider(lambda model, messages: "ok")
+    llm.set_provider(provider)
+    yield provider
+    llm.set_provider(None)
+
+
+def _budget_log():
+    from src.config import BUDGET_LOG
+
+    with open(BUDGET_LOG, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_plan_shrinks_context_then_drops_articles(stub, monkeypatch):
+    """An oversized prompt walks the degradation steps until one fits, and the choice is logged."""
+
+    from src import budget
+
+    articles = [f"article {i} " + "word " * 400 for i in range(10)]
+
+    def build(context, share):
+        text = budget.shrink("background\n" * 1000, context) + "\n".join(budget.keep(articles, share))
+        return [{"role": "user", "content": text}]
+
+    monkeypatch.setitem(budget.BUDGET_CALL_TOKENS, "daily_summary", 6_000)
+    messages, tier = budget.plan("daily_summary", build)
+
+    assert tier == "large"
+    assert "article 4" in messages[0]["content"] and "article 5" not in messages[0]["content"]
+    entry = _budget_log()[-1]
+    assert entry["event"] == "degraded" and entry["step"] == "drop articles"
+    assert [s["step"] for s in entry["skipped"]] == ["full", "shrink context"]
+
+
+
+def test_plan_skips_the_cheaper_tier_on_the_lowest_tier(stub, monkeypatch):
+    """A small-tier task that fits no step is refused without re-pricing the same call as a "cheaper tier"."""
+
+    from src import budget
+
+    monkeypatch.setitem(budget.BUDGET_CALL_TOKENS, "draft_edits", 100)
+    with pytest.raises(budget.BudgetExceededError):
+        budget.plan("draft_edits", lambda context, share: [{"role": "user", "content": "word " * 2000}])
+
+    entry = _budget_log()[-1]
+    assert entry["event"] == "refused"
+    assert [s["step"] for s in entry["skipped"]] == ["full", "shrink context", "drop articles"]
+
+def test_run_budget_refuses_further_calls(stub):
+    """Spend inside a run is accumulated; a call that would exceed the cap is refused before sending."""
+
+    from src import budget, llm
+
+    with budget.run("test", cap_usd=0.0005) as state:
+        llm.complete("chat_synopsis", [{"role": "user", "content": "x" * 400}])
+        assert state["calls"] == 1 and state["spent_usd"] > 0
+        with pytest.raises(budget.BudgetExceededError):
+            llm.complete("chat", [{"role": "user", "content": "x" * 400}])
+    assert len(stub.calls) == 1
+    assert _budget_log()[-2]["event"] == "refused"
+
+
+def test_day_budget_reads_the_routing_log_and_blocks_escalation(stub, monkeypatch):
+    """Today's logged cost counts against the day budget; an escalation that would break it is skipped."""
+
+    from src import budget, llm
+    from src.config import MODEL_TIERS
+
+    llm.complete("weekly_narrative", [{"role": "user", "content": "hello"}])
+    spent = budget.day_spent()
+    assert spent > 0
+
+    est_small = budget.estimate(MODEL_TIERS["small"], [{"role": "user", "content": "q"}])["usd"]
+    monkeypatch.setattr(budget, "BUDGET_DAY_USD", spent + est_small * 1.5)
+    stub.responder = lambda model, messages: "I don't know."
+    assert llm.complete("chat_lookup", [{"role": "user", "content": "q"}]) == "I don't know."
+    assert [c["model"] for c in stub.calls[1:]] == [MODEL_TIERS["small"]]
@@ -0,0 +1,51 @@
+"""Smoke tests for :mod:`src.compress` (extractive pre-compression)."""
+
+
+ARTICLE = {
+    "title": "Venezuela cancels gas deal with Trinidad after US warship visit",
+    "description": "Venezuela cancelled a gas deal with Trinidad after a US warship visit.",
+    "content": (
+        "Caracas called the presence of the destroyer a hostile provocation by Port of Spain. "
+        "Trinidad's prime minister said joint exercises with the U.S. Navy are routine and long planned. "
+        "Energy analysts expect the Dragon field project to stall for months... [2400 chars]"
+    ),
+}
+
+
+def test_split_sentences_strips_truncation_and_keeps_abbreviations():
+    """The GNews marker and cut-off fragment go; "U.S." does not end a sentence."""
+
+    from src import compress
+
+    sentences = compress.split_sentences("Talks stalled with the U.S. Treasury. ¿Habrá acuerdo? The deal was... [900 chars]")
+
+    assert sentences == ["Talks stalled with the U.S. Treasury.", "¿Habrá acuerdo?"]
+
+
+def test_compression_drops_title_repeats_and_keeps_facts():
+    """The description restating the title is dropped; new facts are kept."""
+
+    from src import compress
+
+    body = compress.compress_article(ARTICLE, max_sentences=2)
+
+    assert "cancelled a gas deal" not in body
+    assert "[2400 chars]" not in body
+    assert "provocation" in body or "exercises" in body
+    assert len(body) < len(ARTICLE["description"]) + len(ARTICLE["content"])
+
+
+def test_batch_matches_single_article_results():
+    """Batched TextRank gives the same output as compressing one by one."""
+
+    from src import compress
+
+    spanish = {
+        "title": "Maduro anuncia ejercicios militares",
+        "description": "El presidente anunció ejercicios militares en la costa. La oposición rechazó la medida.",
+        "content": "Los ejercicios durarán tres días en el estado Sucre. El ministro de Defensa pidió calma.",
+    }
+    batch = compress.compress_articles([ARTICLE, spanish, {"title": "Empty"}])
+
+    assert batch == [compress.compress_article(a) for a in (ARTICLE, spanish, {"title": "Empty"})]
+    assert batch[2] == ""
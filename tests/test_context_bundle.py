@@ -0,0 +1,88 @@
+"""Smoke tests for :mod:`src.context_bundle` (pre-assembled dashboard context)."""
+
+import json
+import os
+import time
+
+
+def _sources(root):
+    (root / "data" / "context").mkdir(parents=True)
+    (root / "outputs" / "weekly").mkdir(parents=True)
+    (root / "data" / "context" / "venezuela_context.md").write_text("Background on Venezuela.", encoding="utf-8")
+    (root / "data" / "context" / "venezuela_scenarios.json").write_text(
+        json.dumps([{"title": "Negotiated transition", "narrative": "Talks resume."}]), encoding="utf-8")
+    (root / "outputs" / "weekly" / "venezuela_week_2025-11-03_to_2025-11-09.md").write_text("Old week.", encoding="utf-8")
+    (root / "outputs" / "weekly" / "venezuela_week_2025-11-10_to_2025-11-16.md").write_text("New week.", encoding="utf-8")
+
+
+def test_publish_assembles_sections(tmp_path, monkeypatch):
+    """The bundle holds every section with token counts, the latest weekly report and a content version."""
+
+    from src import context_bundle
+
+    monkeypatch.chdir(tmp_path)
+    _sources(tmp_path)
+    bundle = context_bundle.publish()
+
+    assert [s["name"] for s in bundle["sections"]] == ["context", "scenarios", "weekly", "reasoning"]
+    assert "New week." in bundle["text"] and "Old week." not in bundle["text"]
+    assert "**Negotiated transition**: Talks resume." in bundle["text"]
+    assert bundle["tokens"] == sum(s["tokens"] for s in bundle["sections"]) > 0
+    assert context_bundle.build()["version"] == bundle["version"]
+
+
+def test_load_is_read_only_and_flags_a_stale_bundle(tmp_path, monkeypatch):
+    """Loading reuses the published file; an edited source marks it stale but only a publish replaces it."""
+
+    from src import context_bundle
+    from src.config import CONTEXT_BUNDLE_PATH
+
+    monkeypatch.chdir(tmp_path)
+    _sources(tmp_path)
+    first = context_bundle.publish()
+    assert context_bundle.load() == first and context_bundle.load() is context_bundle.load()
+
+    path = tmp_path / "data" / "context" / "venezuela_context.md"
+    path.write_text("Updated background.", encoding="utf-8")
+    later = time.time() + 5
+    os.utime(path, (later, later))
+    published = os.path.getmtime(CONTEXT_BUNDLE_PATH)
+    assert context_bundle.load()["version"] == first["version"] and context_bundle.stale(context_bundle.load())
+    assert os.path.getmtime(CONTEXT_BUNDLE_PATH) == published
+
+    second = context_bundle.publish()
+    assert context_bundle.load()["version"] == second["version"] != first["version"]
+    assert "Updated background." in second["text"] and not context_bundle.stale(second)
+
+
+def test_a_new_weekly_report_makes_the_bundle_stale(tmp_path, monkeypatch):
+    """Adding a newer weekly file is noticed through the weekly directory, not only the file the bundle used."""
+
+    from src import context_bundle
+
+    monkeypatch.chdir(tmp_path)
+    _sources(tmp_path)
+    bundle = context_bundle.publish()
+    weekly = tmp_path / "outputs" / "weekly"
+    (weekly / "venezuela_week_2025-11-17_to_2025-11-23.md").write_text("Newest week.", encoding="utf-8")
+    later = time.time() + 5
+    os.utime(weekly, (later, later))
+
+    assert context_bundle.stale_sources(bundle) == ["outputs/weekly"]
+
+
+def test_new_reasoning_changes_the_version(tmp_path, monkeypatch):
+    """Newly logged reasoning (as after a pulse) changes the version the dashboard sees."""
+
+    from src import assessment, context_bundle
+
+    monkeypatch.chdir(tmp_path)
+    _sources(tmp_path)
+    before = context_bundle.publish()["version"]
+    assessment.log_entries([{"id": "S1", "title": "Negotiated transition", "reasoning": "Talks stalled.",
+                             "plausibility": "down", "updated_confidence": 0.3, "assessment": "updated"}],
+                           report_generated_on="2025-11-17")
+    after = context_bundle.publish()
+
+    assert after["version"] != before and "Talks stalled." in after["text"]
+    assert context_bundle.load()["version"] == after["version"]
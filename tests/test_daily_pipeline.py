@@ -16,11 +16,12 @@ def test_import_daily_pipeline():
     importlib.reload(daily_pipeline)
 
 
-def test_clean_rank_filters_and_scores(tmp_path):
+def test_clean_rank_filters_and_scores(tmp_path, monkeypatch):
     """Only Venezuela-related items with keywords are kept and scored."""
 
     from src import daily_pipeline
 
+    monkeypatch.chdir(tmp_path)   # clean_rank writes the curated partition
     sample = [
         {
             "title": "Venezuela economic update",
@@ -36,23 +37,6 @@ def test_clean_rank_filters_and_scores(tmp_path):
     assert curated[0]["_score"] > 0
 
 
-def test_build_context_respects_character_cap():
-    """Context builder should stop adding pieces once the cap is reached."""
-
-    from src import daily_pipeline
-
-    items = [
-        {"title": "One", "url": "u1", "description": "short desc", "content": "brief"},
-        {"title": "Two", "url": "u2", "description": "another desc", "content": "more text"},
-    ]
-
-    # Cap that fits the first item but not the second
-    context_text = daily_pipeline.build_context(items, cap_chars=40)
-
-    assert "One" in context_text
-    assert "Two" not in context_text
-
-
 def test_determine_report_date_allows_override():
     """Report date helper should be reproducible with a supplied time."""
 
@@ -79,6 +63,18 @@ def test_time_window_for_date_spans_full_day():
     assert end_local.date() == report_date + daily_pipeline.timedelta(days=1)
 
 
+def test_time_window_follows_daylight_saving():
+    """The local day starts at 05:00 UTC in winter and 04:00 UTC in summer (America/New_York)."""
+
+    from src import daily_pipeline
+
+    winter, _ = daily_pipeline.time_window_for_date(daily_pipeline.datetime(2025, 1, 15).date())
+    summer, _ = daily_pipeline.time_window_for_date(daily_pipeline.datetime(2025, 7, 15).date())
+
+    assert winter.astimezone(daily_pipeline.timezone.utc).hour == 5
+    assert summer.astimezone(daily_pipeline.timezone.utc).hour == 4
+
+
 def test_latest_report_date_detects_most_recent(tmp_path):
     """Helper should parse the latest ISO date from report filenames."""
 
@@ -91,3 +87,42 @@ def test_latest_report_date_detects_most_recent(tmp_path):
     (daily_dir / "ignored.txt").write_text("skip", encoding="utf-8")
 
     assert daily_pipeline.latest_report_date(str(daily_dir)) == daily_pipeline.datetime(2024, 5, 3).date()
+
+
+def test_validate_daily_summary_requires_key_developments():
+    """Briefs without the Key Developments bullets are rejected for escalation."""
+
+    import pytest
+    from src import daily_pipeline
+
+    good = "Update text.\n\n**Key Developments Today**\n- one\n- two\n- three\n"
+    daily_pipeline.validate_daily_summary(good)
+
+    with pytest.raises(ValueError):
+        daily_pipeline.validate_daily_summary("Update text without the section.")
+
+
+def test_budget_rebuilds_do_not_rethread_the_day(tmp_path, monkeypatch):
+    """Facts and threads are prepared once per brief, however many budget steps rebuild the prompt."""
+
+    import json
+    from src import budget, daily_pipeline, llm, threads
+
+    monkeypatch.chdir(tmp_path)
+    stub = llm.StubProvider(lambda model, messages: "Update.\n\n**Key Developments Today**\n- one\n- two\n- three\n")
+    llm.set_provider(stub)
+    calls = []
+    real_update = threads.update_index
+    monkeypatch.setattr(threads, "update_index", lambda *a, **k: calls.append(a) or real_update(*a, **k))
+    monkeypatch.setitem(budget.BUDGET_CALL_TOKENS, "daily_summary", 2_000)
+    curated = [{"title": f"Venezuela story {n}", "url": f"https://news/{n}", "publishedAt": "2025-11-01T10:00:00Z",
+                "description": " ".join(f"topic{n}term{k}" for k in range(60)) + "."}   # one thread per story
+               for n in range(12)]
+    try:
+        daily_pipeline.summarize(curated, "2025-11-01")
+    finally:
+        llm.set_provider(None)
+
+    assert len(calls) == 1
+    with open(budget.BUDGET_LOG, encoding="utf-8") as f:
+        assert json.loads(f.readlines()[-1])["skipped"]   # the prompt was built more than once
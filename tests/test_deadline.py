@@ -0,0 +1,104 @@
+"""Smoke tests for :mod:`src.deadline` (stage budgets and degraded plans)."""
+
+import json
+from datetime import date
+
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    from src import llm
+
+    monkeypatch.chdir(tmp_path)
+    provider = llm.StubProvider(lambda model, messages: "ok")
+    llm.set_provider(provider)
+    yield provider
+    llm.set_provider(None)
+
+
+def test_plans_follow_the_pressure_on_the_critical_path(stub):
+    """Stages run in full while on schedule and degrade once the time left falls behind the work ahead."""
+
+    from src import deadline
+    from src.config import DEADLINE_LOG
+
+    with deadline.stage("fetch") as plan:
+        assert plan == {"label": "full"} and deadline.timeout(30) == 30
+    assert deadline.choose("summarize", 0.1, task="draft")["label"] == "faster tier"
+    assert deadline.choose("summarize", 0.1, task="draft_edits")["label"] == "fewer articles"
+
+    clock = FakeClock()
+    with deadline.run("daily", 100, plan=["fetch", "rank", "summarize", "save"], clock=clock):
+        with deadline.stage("fetch", date(2025, 11, 1)) as plan:   # 100s for 50s of typical work
+            assert plan["label"] == "full"
+            assert deadline.timeout(60) == pytest.approx(30)
+            clock.now += 70
+        with deadline.stage("rank", date(2025, 11, 1)):
+            clock.now += 15
+        with deadline.stage("summarize", date(2025, 11, 1)) as plan:   # 15s for 33s
+            assert plan["label"] == "fewer articles" and plan["budget_step"] == "drop articles"
+            deadline.degrade("kept small-tier output", reason="validation failed")
+        meta = deadline.report(date(2025, 11, 1))
+
+    assert meta["on_time"] and meta["ahead"] == ["save"]
+    assert [s["plan"] for s in meta["stages"]] == ["full", "full", "fewer articles"]
+    assert [d["what"] for d in meta["degradations"]] == ["fewer articles", "kept small-tier output"]
+    with open(DEADLINE_LOG, encoding="utf-8") as f:
+        assert json.loads(f.readline())["degraded"] == 1
+
+
+def test_daily_run_ships_from_cache_under_a_tight_deadline(stub, tmp_path, monkeypatch):
+    """With no time left the brief is built from cached raw data, and the trade-offs land in its sidecar."""
+
+    from src import daily_pipeline, deadline
+
+    raw = tmp_path / "data" / "raw"
+    raw.mkdir(parents=True)
+    articles = [{"title": f"Venezuela story {n}", "url": f"https://news/{n}", "publishedAt": "2025-11-01T10:00:00Z",
+                 "description": "Maduro met PDVSA officials in Caracas to discuss oil output and sanctions."}
+                for n in range(4)]
+    (raw / "news_2025-11-01.json").write_text(json.dumps(articles), encoding="utf-8")
+    monkeypatch.setattr(daily_pipeline.SESSION, "get", lambda *a, **k: pytest.fail("fetched despite the cache"))
+    stub.responder = lambda model, messages: "Update.\n\n**Key Developments Today**\n- one\n- two\n- three\n"
+
+    generated = daily_pipeline.run_daily(last_saved=date(2025, 10, 31), expected_report=date(2025, 11, 1), due=1)
+
+    assert generated == [date(2025, 11, 1)]
+    meta = deadline.load_meta("outputs/daily/venezuela_2025-11-01.md")
+    assert meta["degraded"] and (meta["articles"], meta["curated"]) == (4, 4)
+    assert [(d["stage"], d["what"]) for d in meta["degradations"]] == [
+        ("fetch", "cached raw data"), ("summarize", "faster tier")]
+    assert stub.calls[-1]["timeout"] == daily_pipeline.deadline.DEADLINE_MIN_TIMEOUT_S
+
+
+def test_model_calls_skip_escalation_and_retries_past_the_stage_budget(stub):
+    """A rejected answer is kept rather than escalated, and a failed call is not retried, once the stage is out of time."""
+
+    from src import deadline, llm
+    from src.config import MODEL_TIERS
+
+    clock = FakeClock()
+    stub.responder = lambda model, messages: "I don't know."
+    with deadline.run("pulse", 100, plan=["summarize"], clock=clock):
+        with deadline.stage("summarize", "k"):
+            clock.now += 200
+            assert llm.complete("chat_lookup", [{"role": "user", "content": "Who leads PDVSA?"}]) == "I don't know."
+
+            def fail(model, messages):
+                raise TimeoutError("slow")
+            stub.responder = fail
+            with pytest.raises(llm.LLMError):
+                llm.complete("chat_lookup", [{"role": "user", "content": "Who leads PDVSA?"}])
+        meta = deadline.report("k")
+
+    assert [c["model"] for c in stub.calls] == [MODEL_TIERS["small"], MODEL_TIERS["small"]]
+    assert [d["what"] for d in meta["degradations"]] == ["kept small-tier output", f"no retry of {MODEL_TIERS['small']}"]
@@ -0,0 +1,82 @@
+"""Smoke tests for :mod:`src.drafting` (targeted draft refinement)."""
+
+import pytest
+
+DRAFT = """# Venezuela - Recent Developments
+
+1. Political situation
+The opposition remains fragmented.
+
+- Point one
+- Point two
+- Point three"""
+
+
+def test_split_and_join_round_trip():
+    """Headings, numbered items and bullets become separate blocks."""
+
+    from src import drafting
+
+    blocks = drafting.split_blocks(DRAFT)
+
+    assert blocks[0].startswith("# Venezuela")
+    assert blocks[1] == "1. Political situation\nThe opposition remains fragmented."
+    assert blocks[-1] == "- Point three"
+    assert drafting.split_blocks(drafting.join_blocks(blocks)) == blocks
+
+
+def test_apply_edits_replace_insert_delete():
+    """Edits target blocks by their 1-based number."""
+
+    from src import drafting
+
+    blocks = drafting.split_blocks(DRAFT)
+    edits = [
+        {"op": "replace", "target": 3, "text": "- Point one (revised)"},
+        {"op": "insert_after", "target": 5, "text": "- Point four"},
+        {"op": "delete", "target": 4},
+        {"op": "insert_after", "target": 0, "text": "DRAFT"},
+    ]
+    out = drafting.apply_edits(blocks, edits)
+
+    assert out[0] == "DRAFT"
+    assert "- Point two" not in out
+    assert out[-2:] == ["- Point three", "- Point four"]
+    assert "- Point one (revised)" in drafting.draft_diff(DRAFT, drafting.join_blocks(out))
+
+
+def test_invalid_edits_raise_for_fallback():
+    """Bad targets or malformed JSON surface as ``ValueError``."""
+
+    from src import drafting
+
+    blocks = drafting.split_blocks(DRAFT)
+    with pytest.raises(ValueError):
+        drafting.apply_edits(blocks, [{"op": "replace", "target": 99, "text": "x"}])
+    with pytest.raises(ValueError):
+        drafting.parse_edit_response("not json")
+    assert drafting.parse_edit_response('{"mode": "rewrite"}') == ("rewrite", None)
+
+
+def test_edit_messages_number_the_draft():
+    """The prompt shows numbered blocks and keeps context in the system prefix."""
+
+    from src import drafting
+
+    msgs = drafting.edit_messages("SYS", "background note", DRAFT, "shorten", "Meeting", "CTX")
+
+    assert msgs[0]["content"].startswith("SYS") and "CTX" in msgs[0]["content"]
+    assert "[3] - Point one" in msgs[1]["content"]
+
+
+def test_variant_messages_do_not_mutate_the_shared_prompt():
+    """Each variant gets its own copy of the shared drafting prompt."""
+
+    from src import drafting
+
+    base = [{"role": "system", "content": "SYS"}, {"role": "user", "content": "Draft it."}]
+    risk = drafting.variant_messages(base, drafting.DRAFT_VARIANTS[2])
+
+    assert base[-1]["content"] == "Draft it."
+    assert risk[-1]["content"].startswith("Draft it.")
+    assert "risks" in risk[-1]["content"]
@@ -0,0 +1,65 @@
+"""Smoke tests for :mod:`src.enrich` (full text of top-ranked articles)."""
+
+import json
+
+
+def test_main_text_drops_site_chrome():
+    """Navigation, scripts and newsletter boxes are left out; the article paragraphs are kept in order."""
+
+    from src import replay
+    from src.enrich import extract_main_text
+
+    article = {"title": "PDVSA output", "url": "https://news.example/a",
+               "description": "Maduro met PDVSA officials in Caracas to discuss oil output and sanctions relief.",
+               "content": "Oil exports fell in October as tankers waited off Jose ... [1200 chars]"}
+    text = extract_main_text(replay.article_page(article))
+
+    assert text.startswith(article["description"])
+    assert "Oil exports fell in October as tankers waited off Jose" in text and "[1200 chars]" not in text
+    for junk in ("Subscribe now", "window.ads", "Sign up for our daily briefing", "All rights reserved"):
+        assert junk not in text
+
+
+def test_enrich_fetches_top_articles_politely_and_caches_them(tmp_path, monkeypatch):
+    """Only the top N are fetched, at most ``per_domain`` at a time per site, and a second run is served from the cache."""
+
+    from src import enrich, replay
+
+    monkeypatch.chdir(tmp_path)
+    raw = tmp_path / "data" / "raw"
+    raw.mkdir(parents=True)
+    articles = [{"title": f"Story {n}", "url": f"https://site{n % 2}.example/news/{n}",
+                 "publishedAt": "2025-11-01T10:00:00Z",
+                 "description": f"Story {n}: Maduro met PDVSA officials in Caracas to discuss oil output.",
+                 "content": "Oil exports fell in October ... [900 chars]"} for n in range(8)]
+    (raw / "news_2025-11-01.json").write_text(json.dumps(articles), encoding="utf-8")
+    server, env = replay.start_publisher(replay.Faults(latency=0.05), raw_dir=str(raw))
+    monkeypatch.setattr(enrich, "ENRICH_BASE_URL", env["ENRICH_BASE_URL"])
+    politeness = enrich.Politeness(per_domain=2, interval=0.0)
+    try:
+        ranked = [dict(a) for a in articles]
+        first = enrich.enrich(ranked, top_n=6, workers=6, politeness=politeness)
+        again = [dict(a) for a in articles]
+        second = enrich.enrich(again, top_n=6, workers=6, politeness=politeness)
+    finally:
+        server.shutdown()
+
+    assert (first["fetched"], first["ok"]) == (6, 6) and (second["fetched"], second["ok"]) == (0, 6)
+    assert all("full_text" in a for a in ranked[:6]) and not any("full_text" in a for a in ranked[6:])
+    assert server.faults.summary()["status"] == {"200": 8}   # six pages and two robots.txt
+    assert max(server.max_in_flight.values()) <= 2
+    assert enrich.stats()["status"] == {"ok": 6}
+
+
+def test_briefs_and_facts_read_the_full_text():
+    """Compression and fact extraction use the fetched text instead of the truncated GNews excerpt."""
+
+    from src import compress, facts
+
+    full = " ".join(f"PDVSA exports to India rose for the {n}th week as Chevron tankers loaded at Jose." for n in range(12))
+    article = {"title": "PDVSA exports", "url": "https://news/1", "publishedAt": "2025-11-01T10:00:00Z",
+               "description": "Exports rose.", "content": "Exports rose again ... [2400 chars]", "full_text": full}
+
+    sentences = compress.article_sentences(article)
+    assert len(sentences) > 3 and all("[2400 chars]" not in s for s in sentences)
+    assert "Chevron tankers" in facts.extraction_prompt([article])
@@ -0,0 +1,98 @@
+"""Smoke tests for :mod:`src.facts` (per-article fact records).
+
+Extraction runs against :class:`src.llm.StubProvider` with a scripted
+JSON answer, inside a temporary working directory.
+"""
+
+import json
+import re
+
+import pytest
+
+ARTICLES = [
+    {"id": "a1", "title": "US deploys carrier group", "description": "d1", "content": "c1", "url": "u1",
+     "publishedAt": "2025-11-10T10:00:00Z", "source": {"name": "Reuters"}},
+    {"id": "a2", "title": "Maduro addresses the nation", "description": "d2", "content": "c2", "url": "u2",
+     "publishedAt": "2025-11-11T10:00:00Z", "source": {"name": "AP"}},
+]
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    from src import llm
+
+    monkeypatch.chdir(tmp_path)
+
+    def responder(model, messages):
+        n = len(re.findall(r"^\[\d+\] Title:", messages[-1]["content"], flags=re.M))
+        return json.dumps({"records": [
+            {"article": i, "actors": ["US Navy"], "event_type": "deployment", "location": "Caribbean",
+             "date": "2025-11-10", "key_claim": f"Claim {i}."}
+            for i in range(1, n + 1)
+        ]})
+
+    provider = llm.StubProvider(responder)
+    llm.set_provider(provider)
+    yield provider
+    llm.set_provider(None)
+
+
+def test_facts_are_extracted_once_and_cached(stub):
+    """A second call for the same articles makes no model calls."""
+
+    from src import facts
+
+    first = facts.facts_for(ARTICLES)
+    calls_after_first = len([c for c in stub.calls])
+    second = facts.facts_for(ARTICLES)
+
+    assert set(first) == {"a1", "a2"}
+    assert first["a2"]["source"] == "AP"
+    assert second == first
+    assert len(stub.calls) == calls_after_first == 1
+
+
+def test_incomplete_extraction_falls_back_to_raw_text(stub):
+    """Articles without a record keep their raw piece in the context."""
+
+    from src import facts, threads
+
+    stub.responder = lambda model, messages: '{"records": []}'
+    records = facts.facts_for(ARTICLES)
+    assignments, index = threads.update_index(ARTICLES, "2025-11-10")
+    ctx = threads.thread_context(ARTICLES, assignments, index, "2025-11-10", records,
+                                 lambda it: f"RAW {it['title']}\n", cap_chars=1000)
+
+    assert records == {}
+    assert "RAW US deploys carrier group" in ctx
+
+
+@pytest.mark.parametrize("failure", ["budget", "transport"])
+def test_failed_extraction_calls_fall_back_to_raw_text(stub, monkeypatch, failure):
+    """An over-budget batch or one whose call keeps failing is skipped rather than aborting the run."""
+
+    from src import budget, facts, llm
+
+    if failure == "budget":
+        monkeypatch.setitem(budget.BUDGET_CALL_TOKENS, "fact_extraction", 10)
+    else:
+        def fail(model, messages):
+            raise TimeoutError("upstream timed out")
+        stub.responder = fail
+        llm._gateway = llm.Gateway(stub, max_retries=1, backoff_base=0.0, sleep=lambda s: None)
+
+    assert facts.facts_for(ARTICLES) == {}
+
+
+def test_fact_context_is_compact():
+    """A record line is much shorter than the raw article piece."""
+
+    from src import facts
+
+    rec = {"date": "2025-11-10", "event_type": "deployment", "location": "Caribbean",
+           "actors": ["US Navy"], "key_claim": "The US deployed a carrier group.", "source": "Reuters"}
+    line = facts.format_record(rec)
+
+    assert line.startswith("- [2025-11-10] deployment")
+    assert "Reuters" in line
+    assert facts.article_id({"url": "https://x"}) == facts.article_id({"url": "https://x"})
@@ -0,0 +1,161 @@
+"""Smoke tests for :mod:`src.jobs`.
+
+Jobs here are tiny local callables; no OpenAI calls are made.
+"""
+
+import threading
+import types
+
+import pytest
+
+
+def _wait(job, timeout=5):
+    import time
+
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_submit_returns_handle_with_result():
+    """A finished job exposes its return value and ``done`` status."""
+
+    from src import jobs
+
+    queue = jobs.JobQueue(max_workers=2, per_user_limit=2)
+    job = _wait(queue.submit("alice", "chat", lambda job, x: x * 2, 21))
+
+    assert job.status == jobs.DONE
+    assert job.result == 42
+
+
+def test_per_user_limit_and_cancellation():
+    """A user cannot exceed their limit; cancelling frees the slot."""
+
+    from src import jobs
+
+    release = threading.Event()
+
+    def slow(job):
+        release.wait(5)
+        return "late"
+
+    queue = jobs.JobQueue(max_workers=2, per_user_limit=1)
+    first = queue.submit("bob", "draft", slow)
+
+    with pytest.raises(jobs.JobLimitError):
+        queue.submit("bob", "draft", slow)
+    # Other users are unaffected
+    other = queue.submit("carol", "draft", lambda job: "ok")
+
+    queue.cancel(first)
+    release.set()
+
+    assert _wait(first).status == jobs.CANCELLED
+    assert _wait(other).result == "ok"
+    assert queue.active("bob") == []
+
+
+def test_errors_are_captured_on_the_handle():
+    """Exceptions in the worker become an ``error`` status, not a crash."""
+
+    from src import jobs
+
+    def boom(job):
+        raise ValueError("bad prompt")
+
+    job = _wait(jobs.JobQueue(max_workers=1).submit("dave", "chat", boom))
+
+    assert job.status == jobs.ERROR
+    assert "bad prompt" in job.error
+
+
+def test_stream_chat_completion_publishes_partial_text():
+    """Streaming deltas are accumulated into ``job.partial``."""
+
+    from src import jobs
+
+    def chunk(text):
+        delta = types.SimpleNamespace(content=text)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)])
+
+    class Completions:
+        @staticmethod
+        def create(stream=False, **kwargs):
+            assert stream is True
+            return iter([chunk("Hello"), chunk(", "), chunk("world")])
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=Completions()))
+    job = jobs.JobHandle("erin", "chat")
+
+    assert jobs.stream_chat_completion(job, client, model="gpt-4o", messages=[]) == "Hello, world"
+    assert job.partial == "Hello, world"
+
+
+
+def test_stream_chat_completion_reports_finish_reason_and_usage():
+    """The last chunk's finish_reason and the trailing usage chunk are handed back through ``meta``."""
+
+    from src import jobs
+
+    def chunk(text, finish_reason=None):
+        choice = types.SimpleNamespace(delta=types.SimpleNamespace(content=text), finish_reason=finish_reason)
+        return types.SimpleNamespace(choices=[choice], usage=None)
+
+    usage = types.SimpleNamespace(prompt_tokens=12, completion_tokens=3)
+    chunks = [chunk("Cut"), chunk(" short", "length"), types.SimpleNamespace(choices=[], usage=usage)]
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(
+        completions=types.SimpleNamespace(create=lambda stream=False, **kwargs: iter(chunks))))
+    meta = {}
+
+    assert jobs.stream_chat_completion(jobs.JobHandle("erin", "chat"), client, meta=meta, messages=[]) == "Cut short"
+    assert meta == {"finish_reason": "length", "usage": {"prompt_tokens": 12, "completion_tokens": 3}}
+
+def test_grouped_jobs_share_one_limit_slot():
+    """Variants submitted under one group count once towards the limit."""
+
+    from src import jobs
+
+    release = threading.Event()
+    queue = jobs.JobQueue(max_workers=4, per_user_limit=1)
+    handles = [queue.submit("frank", "draft", lambda job: release.wait(5), group="g1") for _ in range(3)]
+
+    with pytest.raises(jobs.JobLimitError):
+        queue.submit("frank", "draft", lambda job: None)
+
+    release.set()
+    assert all(_wait(h).status == jobs.DONE for h in handles)
+
+
+def test_listed_jobs_always_have_their_future():
+    """A job visible through ``active()`` can already be cancelled, even while the pool is still queuing it."""
+
+    import time
+
+    from src import jobs
+
+    queue = jobs.JobQueue(max_workers=1, per_user_limit=2)
+    real_submit = queue._executor.submit
+
+    def slow_submit(*args, **kwargs):
+        time.sleep(0.2)
+        return real_submit(*args, **kwargs)
+
+    queue._executor.submit = slow_submit
+    release, seen = threading.Event(), []
+
+    def poll():
+        while not release.is_set():
+            seen.extend((j, j._future) for j in queue.active("dana"))
+            time.sleep(0.01)
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    job = queue.submit("dana", "chat", lambda job: release.wait(5) and "ok")
+    time.sleep(0.05)
+    release.set()
+    poller.join()
+
+    assert seen and all(future is not None for _, future in seen)
+    assert _wait(job).result == "ok"
@@ -0,0 +1,146 @@
+"""Smoke tests for :mod:`src.llm` (tiered routing).
+
+All calls go through :class:`src.llm.StubProvider`; nothing leaves the
+machine.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    from src import llm
+
+    monkeypatch.chdir(tmp_path)
+    provider = llm.StubProvider()
+    llm.set_provider(provider)
+    yield provider
+    llm.set_provider(None)
+
+
+def _log(tmp_path):
+    from src.config import LLM_ROUTING_LOG
+
+    with open(tmp_path / LLM_ROUTING_LOG, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_task_starts_on_its_configured_tier(stub, tmp_path):
+    """A cheap-tier task that passes its checks never touches the large model."""
+
+    from src import llm
+    from src.config import MODEL_TIERS
+
+    text = llm.complete("chat_synopsis", [{"role": "user", "content": "hello"}])
+
+    assert text.startswith(f"[{MODEL_TIERS['small']}]")
+    assert [c["model"] for c in stub.calls] == [MODEL_TIERS["small"]]
+    assert _log(tmp_path)[0]["outcome"] == "ok"
+
+
+def test_failed_validation_escalates_and_is_logged(stub, tmp_path):
+    """A rejected cheap output is retried once on the large model."""
+
+    from src import llm
+    from src.config import MODEL_TIERS
+
+    def validate(text):
+        if MODEL_TIERS["small"] in text:
+            raise llm.LLMValidationError("too shallow")
+
+    text = llm.complete("draft_edits", [{"role": "user", "content": "x"}], validate=validate)
+
+    assert text.startswith(f"[{MODEL_TIERS['large']}]")
+    log = _log(tmp_path)
+    assert [e["outcome"] for e in log] == ["escalated", "ok"]
+    assert "too shallow" in log[0]["reason"]
+
+
+def test_unsure_lookup_answers_escalate(stub):
+    """Chat lookups answered with "I don't know" go to the large model."""
+
+    from src import llm
+    from src.config import MODEL_TIERS
+
+    stub.responder = lambda model, messages: "I don't know." if model == MODEL_TIERS["small"] else "On 3 November."
+
+    assert llm.classify_chat("When did the naval deployment start?") == "chat_lookup"
+    assert llm.classify_chat("How should we think about the risks of escalation over the next month?") == "chat"
+    assert llm.complete("chat_lookup", [{"role": "user", "content": "When?"}]) == "On 3 November."
+
+
+def test_top_tier_failure_returns_last_output(stub, tmp_path):
+    """On the largest tier the output is returned so callers handle errors."""
+
+    from src import llm
+
+    text = llm.complete("weekly_reasoning", [{"role": "user", "content": "x"}], validate=lambda t: False)
+
+    assert text
+    assert _log(tmp_path)[-1]["outcome"] == "failed"
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+def test_gateway_retries_rate_limited_calls(stub, tmp_path):
+    """A 429 is retried with backoff and the retry count is logged."""
+
+    from src import llm
+
+    failures = [_RateLimited("slow down")]
+
+    def responder(model, messages):
+        if failures:
+            raise failures.pop()
+        return "fine"
+
+    stub.responder = responder
+    delays = []
+    gateway = llm.Gateway(stub, backoff_base=0.01, sleep=delays.append)
+    llm._gateway = gateway
+
+    assert llm.complete("weekly_narrative", [{"role": "user", "content": "x"}]) == "fine"
+    assert len(delays) == 1 and gateway.stats["retries"] == 1
+    assert _log(tmp_path)[0]["retries"] == 1
+
+    stub.responder = lambda model, messages: (_ for _ in ()).throw(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        llm.complete("weekly_narrative", [{"role": "user", "content": "x"}])
+
+
+def test_gateway_throttles_to_requests_per_minute(stub):
+    """Calls beyond the model's RPM wait for the window to slide."""
+
+    from src import llm
+
+    now = [0.0]
+    waits = []
+
+    def sleep(s):
+        waits.append(s)
+        now[0] += s
+
+    gateway = llm.Gateway(stub, limits={"m": {"rpm": 2, "tpm": 10_000}}, sleep=sleep, clock=lambda: now[0])
+    for _ in range(3):
+        resp = gateway.chat("m", [{"role": "user", "content": "hi"}], 0.0)
+
+    assert waits == [60.0]
+    assert resp.throttled_s == 60.0 and gateway.stats["calls"] == 3
+
+
+def test_acomplete_shares_the_gateway(stub):
+    """The async entry point returns the same text as complete()."""
+
+    import asyncio
+
+    from src import llm
+
+    async def run():
+        return await asyncio.gather(*(llm.acomplete("chat", [{"role": "user", "content": str(i)}]) for i in range(3)))
+
+    assert len(asyncio.run(run())) == 3
+    assert len(stub.calls) == 3
@@ -0,0 +1,65 @@
+"""Smoke tests for :mod:`src.memory`.
+
+The summarizer is a local function so no model is called.
+"""
+
+
+def _turns(n, size=200, first=0):
+    roles = ["user", "assistant"]
+    return [{"role": roles[i % 2], "content": f"turn {i} " + "x" * size} for i in range(first, first + n)]
+
+
+def test_window_respects_token_budget_and_keeps_latest():
+    """Only the newest turns that fit the budget stay verbatim."""
+
+    from src.memory import ConversationMemory
+
+    memory = ConversationMemory(window_tokens=200)
+    messages = _turns(10)
+    start = memory.window_start(messages)
+
+    assert 0 < start < len(messages) - 1
+    # A single oversized message is still kept
+    assert memory.window_start([{"role": "user", "content": "y" * 10_000}]) == 0
+
+
+def test_compact_summarizes_each_evicted_turn_once():
+    """Evicted turns are folded into the synopsis exactly once."""
+
+    from src.memory import ConversationMemory
+
+    calls = []
+
+    def summarize(system, prompt, max_tokens):
+        calls.append(prompt)
+        return f"synopsis v{len(calls)}"
+
+    memory = ConversationMemory(window_tokens=200)
+    messages = _turns(10)
+
+    assert memory.compact(messages, summarize) is True
+    assert memory.synopsis == "synopsis v1"
+    # Nothing new was evicted, so no second call
+    assert memory.compact(messages, summarize) is False
+    assert len(calls) == 1
+    # Later turns only send the newly evicted messages
+    messages += _turns(4, first=10)
+    memory.compact(messages, summarize)
+    assert "turn 0 " not in calls[-1]
+
+
+def test_build_messages_puts_stable_prefix_first():
+    """System instructions + context lead; recent turns close the prompt."""
+
+    from src.memory import ConversationMemory
+
+    memory = ConversationMemory(window_tokens=200)
+    memory.synopsis = "Earlier we discussed sanctions."
+    messages = _turns(6)
+    memory.summarized_upto = memory.window_start(messages)
+
+    built = memory.build_messages("You are an analyst.", "CTX", messages)
+
+    assert built[0]["role"] == "system" and built[0]["content"].endswith("CTX")
+    assert "sanctions" in built[1]["content"]
+    assert built[-1] == messages[-1]
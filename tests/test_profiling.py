@@ -0,0 +1,98 @@
+"""Smoke tests for :mod:`src.profiling` (opt-in stage profiles and run diffs)."""
+
+import json, os
+from datetime import date
+
+
+def _work(n):
+    return sorted(str(i) * 3 for i in range(n))
+
+
+def test_disabled_profiling_is_a_no_op(tmp_path, monkeypatch):
+    """Without PROFILE the hooks run the code and write nothing."""
+
+    from src import profiling
+
+    monkeypatch.setattr(profiling, "_enabled", False)
+    with profiling.run("daily", profile_dir=str(tmp_path)) as run_id, profiling.stage("rank"):
+        result = _work(100)
+    assert run_id is None and len(result) == 100
+    assert profiling.profiled("x")(_work)(5) == _work(5)
+    assert os.listdir(tmp_path) == []
+
+
+def test_enabled_run_writes_stage_profiles(tmp_path, monkeypatch):
+    """Each stage leaves a cProfile dump, a memory snapshot and a summary entry."""
+
+    from src import profiling
+
+    monkeypatch.setattr(profiling, "_enabled", True)
+    with profiling.run("daily", profile_dir=str(tmp_path)) as run_id:
+        with profiling.stage("rank", key=date(2025, 11, 1)):
+            _work(20000)
+        with profiling.stage("save"):
+            with profiling.stage("inner"):   # timed, but profiled with the outer stage
+                _work(10)
+
+    path, summary = profiling.load_run(run_id, str(tmp_path))
+    assert [(s["stage"], s["key"]) for s in summary["stages"]] == [("rank", "2025-11-01"), ("inner", None), ("save", None)]
+    assert sorted(os.listdir(path)) == ["01_rank_2025-11-01.prof", "01_rank_2025-11-01.snapshot",
+                                        "02_save.prof", "02_save.snapshot", "03_inner.snapshot", "summary.json"]
+    rank = summary["stages"][0]
+    assert rank["wall_s"] > 0 and rank["mem_peak_kb"] >= 0
+    assert any(f["function"] == "test_profiling.py:_work" for f in rank["top_functions"])
+    assert profiling.list_runs(str(tmp_path)) == [run_id]
+
+
+def test_diff_lines_up_stages_and_functions(tmp_path, monkeypatch):
+    """Two runs of the same job compare stage by stage, whatever their dates."""
+
+    from src import profiling
+
+    monkeypatch.setattr(profiling, "_enabled", True)
+    run_ids = []
+    for n, day in ((1000, date(2025, 11, 1)), (50000, date(2025, 11, 2))):
+        with profiling.run("daily", profile_dir=str(tmp_path)) as run_id, profiling.stage("rank", key=day):
+            _work(n)
+        run_ids.append(run_id)
+
+    d = profiling.diff(*run_ids, profile_dir=str(tmp_path))
+    assert run_ids[0] != run_ids[1]
+    assert [s["stage"] for s in d["stages"]] == ["rank"]
+    assert d["stages"][0]["a"]["n"] == d["stages"][0]["b"]["n"] == 1
+    work = next(f for f in d["functions"] if f["function"] == "test_profiling.py:_work")
+    assert work["cumtime_b"] >= 0
+    json.dumps(d)
+
+
+def test_overlapping_runs_keep_memory_tracing(tmp_path, monkeypatch):
+    """A run that finishes while another is mid-stage leaves tracemalloc on for it."""
+
+    import threading, tracemalloc
+    from src import profiling
+
+    monkeypatch.setattr(profiling, "_enabled", True)
+    monkeypatch.setattr(profiling, "PROFILE_MEMORY", True)
+    in_stage, first_done, errors, run_ids = threading.Event(), threading.Event(), [], []
+
+    def second():
+        try:
+            with profiling.run("dashboard", profile_dir=str(tmp_path)) as run_id, profiling.stage("draft"):
+                run_ids.append(run_id)
+                in_stage.set()
+                first_done.wait(5)
+                _work(100)
+        except Exception as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=second)
+    with profiling.run("daily", profile_dir=str(tmp_path)), profiling.stage("rank"):
+        worker.start()
+        in_stage.wait(5)
+        _work(100)
+    first_done.set()
+    worker.join()
+
+    assert errors == [] and not tracemalloc.is_tracing()
+    _, summary = profiling.load_run(run_ids[0], str(tmp_path))
+    assert "mem_peak_kb" in summary["stages"][0]
@@ -0,0 +1,148 @@
+"""Smoke tests for :mod:`src.relevance`.
+
+A tiny synthetic corpus is enough to check that the hashed TF-IDF model
+trains, scores batches, and compares itself against the keyword rules.
+"""
+
+import json
+
+import numpy as np
+
+
+def _article(title, desc, url):
+    return {"title": title, "description": desc, "content": "", "url": url}
+
+
+POS = [
+    _article("Venezuela: Maduro responds to US naval deployment", "Caracas denounced the deployment of warships near its coast.", "p1"),
+    _article("Venezuela y EE.UU.: tensión por despliegue naval", "El gobierno de Nicolás Maduro rechazó el despliegue en el Caribe.", "p2"),
+    _article("PDVSA exports fall under new sanctions", "Venezuela's state oil company PDVSA saw exports drop this month.", "p3"),
+    _article("Opposition leader Machado calls for transition", "María Corina Machado urged Venezuelans to prepare for a transition.", "p4"),
+]
+NEG = [
+    _article("APEC summit digest", "Leaders discussed AI rules, trade and, briefly, Venezuela among many topics.", "n1"),
+    _article("Football results roundup", "Scores from the weekend's matches across South America and Europe.", "n2"),
+    _article("Global markets update", "Stocks rose in Asia as investors weighed central bank signals.", "n3"),
+    _article("Weather outlook", "Storms are expected across the Atlantic later this week.", "n4"),
+]
+
+
+def test_rule_score_matches_legacy_rules():
+    """The extracted keyword rules behave like the old ``clean_rank`` filter."""
+
+    from src import relevance
+
+    assert relevance.rule_score(POS[0], relevance.RULE_KEYWORDS) > 0
+    assert relevance.rule_score(NEG[1], relevance.RULE_KEYWORDS) is None
+    assert relevance.rule_score({"title": "Venezuela", "description": "short"}, ["venezuela"]) is None
+
+
+def test_train_and_score_batch_separates_classes():
+    """A trained model scores relevant items above irrelevant ones."""
+
+    from src import relevance
+
+    model = relevance.train(POS + NEG, [1] * len(POS) + [0] * len(NEG), n_features=2 ** 12, epochs=200)
+    probs = model.score(POS + NEG)
+
+    assert probs.shape == (8,)
+    assert probs[: len(POS)].min() > probs[len(POS):].max()
+    kept = relevance.filter_rank([dict(a) for a in POS + NEG], model)
+    assert {a["url"] for a in kept} == {a["url"] for a in POS}
+
+
+def test_accent_folding_shares_spanish_tokens():
+    """Accented and unaccented spellings hash to the same features."""
+
+    from src import relevance
+
+    assert relevance.fold("Nicolás Maduro, Petróleo") == "nicolas maduro, petroleo"
+
+
+def test_model_round_trips_through_disk(tmp_path):
+    """Saved models load back with identical scores."""
+
+    from src import relevance
+
+    model = relevance.train(POS + NEG, [1] * 4 + [0] * 4, n_features=2 ** 12, epochs=50)
+    path = str(tmp_path / "rel.npz")
+    model.save(path)
+    loaded = relevance.load_model(path)
+
+    assert (loaded.score(POS) == model.score(POS)).all()
+    assert relevance.load_model(str(tmp_path / "missing.npz")) is None
+
+
+def test_build_dataset_only_trusts_analyst_labels_as_gold(tmp_path, monkeypatch):
+    """Curated membership gives weak labels; analyst labels override them and are the only gold."""
+
+    from src import relevance
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "raw").mkdir()
+    (tmp_path / "curated").mkdir()
+    (tmp_path / "data" / "labels").mkdir(parents=True)
+    (tmp_path / "raw" / "news_2025-11-01.json").write_text(json.dumps(POS[:2] + NEG[:1]), encoding="utf-8")
+    (tmp_path / "curated" / "venezuela_latest.json").write_text(json.dumps(POS[:2] + NEG[:1]), encoding="utf-8")
+    (tmp_path / relevance.LABELS_PATH).write_text(json.dumps({"url": "n1", "relevant": False}) + "\n", encoding="utf-8")
+
+    articles, labels, gold = relevance.build_dataset(str(tmp_path / "raw"), str(tmp_path / "curated"))
+
+    assert list(labels) == [1, 1, 0]
+    assert list(gold) == [False, False, True]
+    assert relevance.precision_recall([1, 1, 1], labels)["precision"] == round(2 / 3, 3)
+
+
+
+def test_provisional_labels_are_not_the_reported_metric(tmp_path, monkeypatch):
+    """Seeded labels marked provisional still count as gold for training but not as analyst-judged rows."""
+
+    from src import relevance
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "raw").mkdir()
+    (tmp_path / "data" / "labels").mkdir(parents=True)
+    (tmp_path / "raw" / "news_2025-11-01.json").write_text(json.dumps(POS[:2] + NEG[:1]), encoding="utf-8")
+    (tmp_path / relevance.LABELS_PATH).write_text(
+        json.dumps({"url": POS[0]["url"], "relevant": True}) + "\n"
+        + json.dumps({"url": NEG[0]["url"], "relevant": False, "provisional": True}) + "\n", encoding="utf-8")
+
+    articles, labels, gold = relevance.build_dataset(str(tmp_path / "raw"), str(tmp_path / "curated"))
+
+    assert list(gold) == [True, False, True]
+    assert list(relevance.judged_mask(articles, gold)) == [True, False, False]
+
+ROUNDUPS = [
+    _article("5 things to know for Nov. 12: Shutdown, Air travel, Venezuela, Northern Lights",
+             "CNN's 5 Things brings you the news you need to know: the shutdown vote, flight cuts and Venezuela.", "r1"),
+    _article("5 things to know for Nov. 17: Epstein files, Immigration blitz, Venezuela, Ukraine",
+             "The US stopped minting pennies; Epstein files vote; an immigration blitz; Venezuela; and Ukraine talks.", "r2"),
+    _article("Morning update: budget housing pledges and more top headlines",
+             "Also in today's edition: the budget, the military buildup near Venezuela and AI-written resumes.", "r3"),
+]
+FOCUSED = [
+    _article("Maduro orders military mobilisation as US carrier nears Venezuela",
+             "Venezuela's defence minister said troops in Caracas were placed on alert as PDVSA terminals were guarded.", "f1"),
+    _article("Venezuela: Chevron licence talks stall over PDVSA debts",
+             "Chevron and PDVSA failed to agree on payment terms for Venezuelan crude exports under the licence.", "f2"),
+]
+
+
+def test_analyst_labels_teach_the_model_to_drop_roundups():
+    """A news roundup that mentions Venezuela once passes the rules but not a model trained on analyst labels."""
+
+    from src import relevance
+
+    articles = POS + NEG + ROUNDUPS + FOCUSED
+    weak = [1] * len(POS) + [0] * len(NEG) + [1] * len(ROUNDUPS) + [1] * len(FOCUSED)   # what the rules say
+    gold = np.array([False] * (len(POS) + len(NEG)) + [True] * (len(ROUNDUPS) + len(FOCUSED)))
+    labels = np.array(weak[: len(POS) + len(NEG)] + [0] * len(ROUNDUPS) + [1] * len(FOCUSED))
+    model = relevance.train(articles, labels, n_features=2 ** 12, epochs=300, weights=relevance.gold_weights(gold))
+
+    unseen_roundup = _article("5 things to know for Nov. 25: Indictments dismissed, Ukraine, Venezuela, Volcano",
+                              "Trump pardons the Thanksgiving turkeys; indictments dismissed; Ukraine; Venezuela; a volcano.", "r4")
+    unseen_story = _article("Venezuela's Maduro says PDVSA exports continue despite US naval pressure",
+                            "Maduro told supporters in Caracas that oil shipments would not stop under the US sanctions.", "f3")
+    assert relevance.rule_score(unseen_roundup, relevance.RULE_KEYWORDS) is not None
+    kept = relevance.filter_rank([unseen_roundup, unseen_story], model)
+    assert [a["url"] for a in kept] == ["f3"]
@@ -0,0 +1,44 @@
+"""Smoke tests for :mod:`src.render` (pre-rendered report pages)."""
+
+import os
+
+
+def test_rendering_escapes_html_and_unsafe_links():
+    """Raw HTML is escaped and javascript: links are not turned into anchors."""
+
+    from src import render
+
+    page = render.render_markdown("**Key** <script>alert(1)</script> [x](javascript:alert(1)) [ok](https://un.org)")
+
+    assert "<strong>Key</strong>" in page
+    assert "<script>" not in page and "&lt;script&gt;" in page
+    assert 'href="javascript' not in page and 'href="https://un.org"' in page
+
+
+def test_page_written_next_to_markdown_and_loaded(tmp_path):
+    """``write_html`` stores the page beside the report; ``load_page`` reads it."""
+
+    from src import render
+
+    md = tmp_path / "venezuela_2025-11-10.md"
+    md.write_text("- one\n- two\n", encoding="utf-8")
+    out = render.write_html(str(md))
+
+    assert out == str(tmp_path / "venezuela_2025-11-10.html")
+    assert render.load_page(str(md)).count("<li>") == 2
+
+
+def test_archive_months_paginates_newest_first(tmp_path):
+    """Reports are grouped by month, newest month and date first."""
+
+    from src import render
+
+    for d in ("2025-10-30", "2025-11-01", "2025-11-02"):
+        (tmp_path / f"venezuela_{d}.md").write_text("x", encoding="utf-8")
+    (tmp_path / "venezuela_2025-11-02.html").write_text("x", encoding="utf-8")
+
+    months = render.archive_months(str(tmp_path), "venezuela_")
+
+    assert list(months) == ["2025-11", "2025-10"]
+    assert months["2025-11"] == ["2025-11-02", "2025-11-01"]
+    assert not os.path.exists(tmp_path / "venezuela_2025-10-30.html")
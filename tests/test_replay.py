@@ -0,0 +1,87 @@
+"""Smoke tests for :mod:`src.replay` (local GNews/OpenAI stand-ins)."""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    articles = [
+        {"title": "Maduro speaks in Caracas", "description": "Venezuela's president addressed supporters.",
+         "url": "https://a/1", "publishedAt": "2025-11-10T12:00:00Z", "lang": "en"},
+        {"title": "Chevron licence renewed", "description": "The licence covers Venezuela operations.",
+         "url": "https://a/2", "publishedAt": "2025-11-11T09:00:00Z", "lang": "en"},
+        {"title": "Sanciones a PDVSA", "url": "https://a/3", "publishedAt": "2025-11-10T15:00:00Z", "lang": "es"},
+    ]
+    (raw / "news_2025-11-10.json").write_text(json.dumps(articles), encoding="utf-8")
+    return raw
+
+
+def test_fake_gnews_filters_window_and_limits_rate(raw_dir):
+    """Articles are served by language and window; requests beyond the RPM get 429."""
+
+    import requests
+
+    from src import replay
+
+    gnews, openai, env = replay.start_fakes(replay.Faults(rpm=2), raw_dir=str(raw_dir))
+    try:
+        url = f"{env['GNEWS_BASE_URL']}/search"
+        params = {"apikey": "k", "lang": "en", "from": "2025-11-10T00:00:00Z", "to": "2025-11-10T23:59:59Z"}
+        first = requests.get(url, params=params, timeout=5)
+        assert [a["title"] for a in first.json()["articles"]] == ["Maduro speaks in Caracas"]
+        assert requests.get(url, params={**params, "lang": "es"}, timeout=5).json()["totalArticles"] == 1
+        limited = requests.get(url, params=params, timeout=5)
+        assert limited.status_code == 429 and int(limited.headers["Retry-After"]) >= 1
+    finally:
+        gnews.shutdown()
+        openai.shutdown()
+
+
+def test_fake_openai_answers_pipeline_prompts(raw_dir):
+    """The OpenAI SDK talks to the fake; fact prompts get valid records and faults surface as 5xx."""
+
+    import openai as sdk
+    from openai._client import OpenAI   # the real client; conftest stubs ``openai.OpenAI``
+
+    from src import facts, replay
+
+    gnews, fake, env = replay.start_fakes(openai_faults=replay.Faults(), raw_dir=str(raw_dir))
+    try:
+        client = OpenAI(api_key="x", base_url=env["OPENAI_BASE_URL"], max_retries=0)
+        batch = [{"title": "Maduro speaks", "publishedAt": "2025-11-10T12:00:00Z"}, {"title": "Chevron licence"}]
+        resp = client.chat.completions.create(model="gpt-4o-mini", messages=[
+            {"role": "system", "content": facts.EXTRACTION_SYSTEM},
+            {"role": "user", "content": facts.extraction_prompt(batch)},
+        ])
+        assert set(facts.parse_records(resp.choices[0].message.content, 2)) == {1, 2}
+        assert resp.usage.prompt_tokens > 0
+        stream = client.chat.completions.create(model="gpt-4o", stream=True, messages=[{"role": "user", "content": "hi"}])
+        assert "".join(c.choices[0].delta.content or "" for c in stream if c.choices) == replay.answer([{"content": "hi"}])
+
+        fake.faults.error_rate = 1.0
+        with pytest.raises(sdk.APIStatusError) as err:
+            client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+        assert err.value.status_code >= 500
+    finally:
+        gnews.shutdown()
+        fake.shutdown()
+
+
+def test_daily_replay_runs_the_real_pipeline(raw_dir, tmp_path):
+    """A one-day replay writes the brief in the scratch directory and reports on it."""
+
+    from datetime import date
+
+    from src import replay
+
+    report = replay.run("daily", date(2025, 11, 10), date(2025, 11, 10), workdir=str(tmp_path / "work"),
+                        raw_dir=str(raw_dir))
+
+    assert report["exit_code"] == 0, open(report["log"], encoding="utf-8").read()[-2000:]
+    assert report["reports"] == 1 and report["articles_served"] == 2
+    assert report["llm_calls"] >= 2 and report["gnews"]["status"] == {"200": 2}
+    assert (tmp_path / "work" / "outputs" / "daily" / "venezuela_2025-11-10.md").exists()
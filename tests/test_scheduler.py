@@ -0,0 +1,74 @@
+"""Smoke tests for :mod:`src.scheduler`.
+
+The scheduler is driven with a fake clock and tiny in-memory jobs so
+no pipeline or network work happens.
+"""
+
+import json
+import urllib.request
+
+
+def test_next_daily_run_rolls_to_tomorrow_after_cutoff():
+    """Once today's run time has passed, the next run is tomorrow."""
+
+    from src import scheduler
+
+    before = scheduler.datetime(2025, 11, 3, 5, 0, tzinfo=scheduler.LOCAL_ZONE)
+    after = scheduler.datetime(2025, 11, 3, 6, 30, tzinfo=scheduler.LOCAL_ZONE)
+
+    assert scheduler.next_daily_run(before, "06:00").date() == before.date()
+    assert scheduler.next_daily_run(after, "06:00").date() == after.date() + scheduler.timedelta(days=1)
+
+
+def test_next_weekly_run_lands_on_requested_weekday():
+    """Weekly runs are placed on the configured weekday and time."""
+
+    from src import scheduler
+
+    wednesday = scheduler.datetime(2025, 11, 5, 12, 0, tzinfo=scheduler.LOCAL_ZONE)
+    nxt = scheduler.next_weekly_run(wednesday, ("MON", "07:00"))
+
+    assert nxt.weekday() == 0
+    assert (nxt.hour, nxt.minute) == (7, 0)
+    assert nxt > wednesday
+
+
+def test_run_pending_runs_due_jobs_and_records_failures():
+    """Due jobs run once, failures are recorded and do not stop the loop."""
+
+    from src import scheduler
+
+    now = [scheduler.datetime(2025, 11, 3, 6, 0, tzinfo=scheduler.LOCAL_ZONE)]
+    calls = []
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    jobs = [
+        scheduler.Job("ok", lambda: calls.append("ok"), lambda t: t),
+        scheduler.Job("boom", boom, lambda t: t),
+    ]
+    sched = scheduler.Scheduler(jobs, clock=lambda: now[0])
+    now[0] += scheduler.timedelta(seconds=1)
+
+    assert sched.run_pending() == ["ok", "boom"]
+    status = {j["name"]: j for j in sched.status()["jobs"]}
+    assert calls == ["ok"]
+    assert status["ok"]["last_status"] == "ok"
+    assert status["boom"]["failures"] == 1
+    assert "upstream down" in status["boom"]["last_error"]
+
+
+def test_status_server_reports_health():
+    """The health endpoint should answer with JSON."""
+
+    from src import scheduler
+
+    sched = scheduler.Scheduler([scheduler.Job("noop", lambda: None, scheduler.next_daily_run)])
+    server = scheduler.start_status_server(sched, port=0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health") as resp:
+            assert json.loads(resp.read())["status"] == "ok"
+    finally:
+        server.shutdown()
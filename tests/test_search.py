@@ -0,0 +1,56 @@
+"""Smoke tests for :mod:`src.search` (FTS5 archive index)."""
+
+import os
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_reports_and_articles_are_searchable_with_highlights(tmp_path):
+    """Stemmed, accent-insensitive matches come back highlighted."""
+
+    from src import search
+
+    db = str(tmp_path / "search.db")
+    daily = str(tmp_path / "outputs/daily/venezuela_2025-11-10.md")
+    weekly = str(tmp_path / "outputs/weekly/venezuela_week_2025-11-03_to_2025-11-09.md")
+    _write(daily, "The US renewed Chevron's licence to operate in Venezuela.")
+    _write(weekly, "## Factual Summary\nNuevas sanciones contra PDVSA.")
+
+    conn = search.connect(db)
+    assert search.add_reports([daily, weekly], conn) == 2
+    search.add_articles([{"id": "a1", "title": "Chevron licenses under review", "description": "Officials weigh oil licences.",
+                          "url": "https://example.com/a1", "publishedAt": "2025-11-11T09:00:00Z"}], conn)
+    conn.close()
+
+    hits = search.search("chevron licences", path=db)
+    assert {(h["kind"], h["label"]) for h in hits} == {("daily", "2025-11-10"), ("article", "2025-11-11")}
+    assert any("**Chevron**" in h["snippet"] or "**Chevron**" in h["title"] for h in hits)
+    assert search.search("sancion", kind="weekly", path=db)[0]["label"] == "2025-11-03_to_2025-11-09"
+
+
+def test_index_is_incremental_and_drops_removed_reports(tmp_path, monkeypatch):
+    """Unchanged files are skipped; deleted reports leave the index."""
+
+    from src import search
+
+    monkeypatch.chdir(tmp_path)
+    _write("outputs/daily/venezuela_2025-11-10.md", "Maduro addressed the nation.")
+    _write("outputs/daily/venezuela_2025-11-11.md", "Maduro spoke again.")
+
+    assert search.update() == (2, 0)
+    assert search.update() == (0, 0)
+    os.remove("outputs/daily/venezuela_2025-11-10.md")
+    search.update()
+    assert [h["label"] for h in search.search("maduro")] == ["2025-11-11"]
+
+
+def test_free_text_query_is_escaped():
+    """Quotes and operators in user input cannot break the FTS syntax."""
+
+    from src import search
+
+    assert search.to_match('cartel "de los" soles OR sanc*') == '"cartel" "de" "los" "soles" "OR" "sanc"*'
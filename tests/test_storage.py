@@ -0,0 +1,64 @@
+"""Smoke tests for :mod:`src.storage` (atomic writes, locked logs, partitions)."""
+
+import json
+import threading
+
+import pytest
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    """A writer that fails midway leaves the previous content and no temp file behind."""
+
+    from src import storage
+
+    path = tmp_path / "out" / "report.md"
+    storage.atomic_write_text(str(path), "old")
+    with pytest.raises(RuntimeError):
+        with storage.replacing(str(path)) as tmp:
+            open(tmp, "w", encoding="utf-8").write("half")
+            raise RuntimeError("crash")
+
+    assert path.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in path.parent.iterdir()] == ["report.md"]
+
+
+def test_concurrent_appends_do_not_interleave(tmp_path):
+    """Many threads appending multi-line batches produce only whole, parseable lines."""
+
+    from src import storage
+
+    path = str(tmp_path / "logs" / "scenarios_log.jsonl")
+    payload = "x" * 5000
+
+    def writer(n):
+        for i in range(20):
+            storage.append_jsonl(path, [{"writer": n, "i": i, "line": k, "pad": payload} for k in range(3)])
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 8 * 20 * 3
+    for a, b, c in zip(entries[::3], entries[1::3], entries[2::3]):
+        assert a["writer"] == b["writer"] == c["writer"] and [a["line"], b["line"], c["line"]] == [0, 1, 2]
+
+
+def test_daily_partitions_and_pulse_lookup(tmp_path, monkeypatch):
+    """clean_rank writes one partition per date; the pulse reads the requested day or the newest."""
+
+    from src import daily_pipeline, storage
+
+    monkeypatch.chdir(tmp_path)
+    article = {"title": "Venezuela update", "description": "Maduro and PDVSA officials met in Caracas on Monday."}
+    daily_pipeline.clean_rank([dict(article, title="Venezuela first")], "2025-11-10")
+    daily_pipeline.clean_rank([dict(article, title="Venezuela second")], "2025-11-11")
+
+    assert sorted(p.name for p in (tmp_path / "data" / "curated" / "daily").iterdir()) == [
+        "2025-11-10.json", "2025-11-11.json"]
+    assert storage.load_curated("daily", "2025-11-10")[0]["title"] == "Venezuela first"
+    assert storage.load_curated("daily")[0]["title"] == "Venezuela second"
+    assert storage.load_curated("weekly") is None
@@ -38,6 +38,16 @@ class _DummyStreamlit:
 
         return decorator
 
+    def cache_resource(self, fn=None, **kwargs):
+        if fn is not None:
+            return fn
+        return lambda f: f
+
+    def fragment(self, fn=None, **kwargs):
+        if fn is not None:
+            return fn
+        return lambda f: f
+
     # Layout / widgets -----------------------------------------------
     def tabs(self, labels):
         return [_DummyContext() for _ in labels]
@@ -48,8 +58,14 @@ class _DummyStreamlit:
     def spinner(self, *args, **kwargs):
         return _DummyContext()
 
+    def expander(self, *args, **kwargs):
+        return _DummyContext()
+
+    def container(self, *args, **kwargs):
+        return _DummyContext()
+
     def columns(self, cols):
-        return [self] * len(cols)
+        return [self] * (cols if isinstance(cols, int) else len(cols))
 
     def button(self, *args, **kwargs):
         return False
@@ -74,6 +90,9 @@ class _DummyStreamlit:
     def checkbox(self, *args, **kwargs):
         return kwargs.get("value", False)
 
+    def slider(self, *args, **kwargs):
+        return kwargs.get("value", kwargs.get("min_value"))
+
     def chat_input(self, *args, **kwargs):
         return None
 
@@ -89,14 +108,18 @@ def _install_streamlit_stub():
     sys.modules["streamlit"] = _DummyStreamlit()
 
 
-def test_streamlit_app_imports_with_stub():
-    """The Streamlit app should import cleanly when the UI is stubbed."""
+def test_streamlit_app_imports_with_stub(tmp_path, monkeypatch):
+    """The Streamlit app should import cleanly when the UI is stubbed, without building anything on disk."""
 
     _install_streamlit_stub()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "logs").mkdir(parents=True)
+    (tmp_path / "data" / "logs" / "scenarios_log.jsonl").write_text("", encoding="utf-8")
 
     import streamlit_app
 
     importlib.reload(streamlit_app)
+    assert not (tmp_path / "data" / "series").exists() and not (tmp_path / "data" / "index").exists()
 
 
 def test_load_recent_reasoning_handles_missing_file(tmp_path, monkeypatch):
@@ -108,3 +131,20 @@ def test_load_recent_reasoning_handles_missing_file(tmp_path, monkeypatch):
     import streamlit_app
 
     assert "No reasoning logs" in streamlit_app.load_recent_reasoning()
+
+
+def test_targeted_edits_shrink_an_oversized_context(tmp_path, monkeypatch):
+    """A refine whose brainstorm context is over the call budget is planned with a shorter context, not refused."""
+
+    _install_streamlit_stub()
+    monkeypatch.chdir(tmp_path)
+
+    import streamlit_app
+    from src import budget
+
+    monkeypatch.setitem(budget.BUDGET_CALL_TOKENS, "draft_edits", 5_000)
+    context = "\n".join(f"Line {n}: Maduro met PDVSA officials in Caracas to review oil output." for n in range(300))
+    messages, tier = streamlit_app.plan_edits("SYS", "background note", "Intro.\n\nBody.", "shorten", "Meeting", context)
+
+    assert messages is not None and tier == "small"
+    assert "Line 0:" in messages[0]["content"] and "Line 299:" not in messages[0]["content"]
@@ -0,0 +1,85 @@
+"""Smoke tests for :mod:`src.threads` (story threads across days)."""
+
+
+def _a(aid, day, title, desc):
+    return {"id": aid, "publishedAt": f"{day}T12:00:00Z", "title": title, "description": desc, "content": "", "url": aid}
+
+
+DAY1 = [
+    _a("a1", "2025-11-10", "US carrier group arrives in the Caribbean near Venezuela",
+       "The USS Gerald Ford carrier strike group arrived in the Caribbean as the US military buildup near Venezuela grows."),
+    _a("a2", "2025-11-10", "Spanish police arrest Tren de Aragua suspects",
+       "Police in Spain arrested 13 suspected members of the Tren de Aragua gang in Barcelona and Madrid."),
+]
+DAY2 = [
+    _a("b1", "2025-11-11", "Carrier strike group USS Gerald Ford operates in the Caribbean",
+       "The Gerald Ford carrier strike group began operations in the Caribbean, expanding the US military buildup near Venezuela."),
+    _a("b2", "2025-11-11", "Venezuela opposition leader Machado wins award",
+       "María Corina Machado received an international award for her campaign for democratic elections."),
+]
+
+
+def test_articles_join_continuing_threads_across_days(tmp_path):
+    """A follow-up story joins its thread; unrelated stories open new ones."""
+
+    from src import threads
+
+    first, _ = threads.update_index(DAY1, "2025-11-10", threads_dir=str(tmp_path))
+    second, index = threads.update_index(DAY2, "2025-11-11", threads_dir=str(tmp_path))
+
+    assert second["b1"] == first["a1"]
+    assert second["b2"] not in first.values()
+    carrier = index["threads"][first["a1"]]
+    assert (carrier["first_seen"], carrier["last_seen"], carrier["article_count"]) == ("2025-11-10", "2025-11-11", 2)
+
+
+def test_known_articles_are_not_counted_twice(tmp_path):
+    """Re-running on the same articles (e.g. the weekly job) keeps the counts."""
+
+    from src import threads
+
+    threads.update_index(DAY1, "2025-11-10", threads_dir=str(tmp_path))
+    again, index = threads.update_index(DAY1, "2025-11-10", threads_dir=str(tmp_path))
+
+    assert set(again) == {"a1", "a2"}
+    assert sum(t["article_count"] for t in index["threads"].values()) == 2
+    assert index["n_docs"] == 2
+
+
+def test_thread_context_separates_new_and_continuing(tmp_path):
+    """Day-two context lists the carrier thread as continuing."""
+
+    from src import threads
+
+    threads.update_index(DAY1, "2025-11-10", threads_dir=str(tmp_path))
+    assignments, index = threads.update_index(DAY2, "2025-11-11", threads_dir=str(tmp_path))
+    ctx = threads.thread_context(DAY2, assignments, index, "2025-11-11", {}, lambda it: f"- {it['title']}\n", 5000)
+
+    new, continuing = ctx.split("## CONTINUING STORYLINES")
+    assert "Machado" in new
+    assert "Gerald Ford" in continuing and "ongoing since 2025-11-10" in continuing
+
+
+def test_concurrent_updates_keep_every_assignment(tmp_path, monkeypatch):
+    """Two runs threading different articles at the same time both end up in the index."""
+
+    import threading, time
+    from src import threads
+
+    load = threads.load_index
+
+    def slow_load(threads_dir):
+        loaded = load(threads_dir)
+        time.sleep(0.2)   # both writers would read the same index without the lock
+        return loaded
+
+    monkeypatch.setattr(threads, "load_index", slow_load)
+    writers = [threading.Thread(target=threads.update_index, args=(batch, day), kwargs={"threads_dir": str(tmp_path)})
+               for batch, day in ((DAY1, "2025-11-10"), (DAY2, "2025-11-11"))]
+    for w in writers:
+        w.start()
+    for w in writers:
+        w.join()
+
+    index, _ = load(str(tmp_path))
+    assert set(index["articles"]) == {"a1", "a2", "b1", "b2"} and index["n_docs"] == 4
@@ -0,0 +1,46 @@
+"""Smoke tests for :mod:`src.timeseries` (scenario confidence series)."""
+
+import json
+
+import numpy as np
+
+
+def _e(sid, week, conf, plaus="steady", **extra):
+    return {"id": sid, "title": sid, "week_start": week, "updated_confidence": conf, "plausibility": plaus, **extra}
+
+
+def test_append_regrids_new_weeks_and_scenarios(tmp_path):
+    """Appending adds columns/rows in week order and keeps earlier cells."""
+
+    from src import timeseries
+
+    path, log = str(tmp_path / "s.npz"), str(tmp_path / "log.jsonl")
+    with open(log, "w", encoding="utf-8") as f:
+        f.write(json.dumps(_e("A", "2025-11-10", 0.5)) + "\n")
+        f.write(json.dumps({"id": "A", "pulse_date": "2025-11-12", "updated_confidence": 0.9}) + "\n")
+
+    timeseries.append([], path=path, log_path=log)          # bootstraps from the log
+    series = timeseries.append([_e("A", "2025-11-03", 0.4), _e("B", "2025-11-10", 0.2, "up")], path=path)
+
+    assert list(series["ids"]) == ["A", "B"]
+    assert [str(w) for w in series["weeks"]] == ["2025-11-03", "2025-11-10"]
+    np.testing.assert_allclose(series["confidence"][0], [0.4, 0.5])
+    assert np.isnan(series["confidence"][1, 0]) and series["plausibility"][1, 1] == 1
+    assert timeseries.load(path)["confidence"].shape == (2, 2)
+
+
+def test_week_over_week_deltas_skip_gaps():
+    """Deltas forward-fill missing weeks before differencing."""
+
+    from src import timeseries
+
+    series = timeseries._add(timeseries.empty(), [
+        _e("A", "2025-11-03", 0.6), _e("A", "2025-11-17", 0.7, assessment="carried_forward"),
+        _e("B", "2025-11-10", 0.3), _e("B", "2025-11-17", 0.1, "down"),
+    ])
+    delta = timeseries.week_over_week(series)
+    rows = {r["id"]: r for r in timeseries.latest(series)}
+
+    np.testing.assert_allclose(delta[0], [np.nan, 0.0, 0.1], atol=1e-6)
+    assert round(rows["B"]["delta"], 2) == -0.2 and rows["B"]["plausibility"] == -1
+    assert rows["A"]["carried"] is True
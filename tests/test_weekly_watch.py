@@ -5,6 +5,8 @@ with tiny, artificial inputs.
 """
 
 import importlib
+import json
+
 import pytest
 
 
@@ -16,11 +18,12 @@ def test_import_weekly_watch():
     importlib.reload(weekly_watch)
 
 
-def test_clean_rank_filters_relevant_items(tmp_path):
+def test_clean_rank_filters_relevant_items(tmp_path, monkeypatch):
     """Only Venezuela-related articles with keywords should remain."""
 
     from src import weekly_watch
 
+    monkeypatch.chdir(tmp_path)   # clean_rank writes the curated partition
     sample = [
         {
             "title": "Venezuela politics",
@@ -40,22 +43,6 @@ def test_clean_rank_filters_relevant_items(tmp_path):
     assert curated[0]["_score"] > 0
 
 
-def test_build_context_truncates_when_cap_reached():
-    """Context builder should stop once it would exceed the cap."""
-
-    from src import weekly_watch
-
-    items = [
-        {"title": "One", "url": "u1", "description": "short desc", "content": "brief"},
-        {"title": "Two", "url": "u2", "description": "another desc", "content": "more text"},
-    ]
-
-    context_text = weekly_watch.build_context(items, cap_chars=40)
-
-    assert "One" in context_text
-    assert "Two" not in context_text
-
-
 def test_load_scenarios_missing_file_raises(tmp_path, monkeypatch):
     """Without the context file, a clear error should surface."""
 
@@ -76,3 +63,19 @@ def test_load_context_handles_absent_file(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
 
     assert weekly_watch.load_context() == ""
+
+
+def test_parse_reasoning_accepts_fenced_json_and_rejects_gaps():
+    """Reasoning output may be fenced; missing fields or non-object entries raise ``ValueError``."""
+
+    from src import weekly_watch
+
+    entry = {"id": "VEN-01", "title": "T", "plausibility": "up", "reasoning": "r", "updated_confidence": 0.5}
+    fenced = "```json\n" + json.dumps([entry]) + "\n```"
+
+    assert weekly_watch.parse_reasoning(fenced)[0]["id"] == "VEN-01"
+    with pytest.raises(ValueError):
+        weekly_watch.parse_reasoning('[{"id": "VEN-01"}]')
+    for malformed in ('["id title plausibility reasoning updated_confidence"]', "[1]"):
+        with pytest.raises(ValueError):
+            weekly_watch.parse_reasoning(malformed)